@@ -184,14 +184,14 @@ export const Matches = () => {
         amount,
         status: "started",
         timestamp: new Date(),
-        sessionId: session.session_id,
-        liveViewUrl: session.live_view_url,
+        sessionId: session.session_id ?? undefined,
+        liveViewUrl: session.live_view_url ?? undefined,
         pdfLink: session.pdf_link,
       });
       addSuccessMessage({ id: matchId, grantTitle: matchTitle });
 
       if (typeof window !== "undefined") {
-        window.open(session.live_view_url, "_blank", "noopener,noreferrer");
+        window.open(session.live_view_url ?? session.pdf_link, "_blank", "noopener,noreferrer");
       }
     } catch (error) {
       console.error("Failed to launch Browserbase session", error);
@@ -2,11 +2,14 @@ import { API_BASE_URL } from '../config/env';
 
 export interface GrantPdfLinkRequest {
   grant_url: string;
+  // Ask for a Browserbase session of our own on the grant page (the server default).
+  live_view?: boolean;
 }
 
 export interface GrantPdfLinkResponse {
-  session_id: string;
-  live_view_url: string;
+  // Null when live_view was false.
+  session_id: string | null;
+  live_view_url: string | null;
   pdf_link: string;
 }
 
@@ -17,7 +20,7 @@ export async function fetchGrantPdfLink(grantUrl: string): Promise<GrantPdfLinkR
     headers: {
       'Content-Type': 'application/json',
     },
-    body: JSON.stringify({ grant_url: grantUrl } satisfies GrantPdfLinkRequest),
+    body: JSON.stringify({ grant_url: grantUrl, live_view: true } satisfies GrantPdfLinkRequest),
   });
 
   if (!response.ok) {
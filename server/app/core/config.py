@@ -13,6 +13,31 @@ server_dir = Path(__file__).parent.parent.parent
 env_path = server_dir / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# Resource types PDF discovery never needs: it only reads anchors and clicks one.
+# Blocked by file extension (see page_profile.RESOURCE_TYPE_EXTENSIONS).
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+# Analytics, tag managers, ad networks and embeds that grant pages load alongside their content.
+DEFAULT_BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "newrelic.com",
+    "nr-data.net",
+    "siteimprove.com",
+    "siteimproveanalytics.com",
+    "addthis.com",
+    "twitter.com",
+    "linkedin.com",
+    "youtube.com",
+    "vimeo.com",
+]
+
 
 class Settings(BaseModel):
     mode: Literal["mock", "live"] = Field(default="mock")
@@ -20,10 +45,51 @@ class Settings(BaseModel):
     perplexity_model: str = Field(default="sonar-small-online")
     perplexity_base_url: HttpUrl = Field(default="https://api.perplexity.ai")
     http_timeout_seconds: int = Field(default=20)
+    http_max_connections_per_client: int = Field(default=20)
+    http_max_keepalive_connections: int = Field(default=10)
+    http_keepalive_expiry_seconds: float = Field(default=30.0)
+    http2_enabled: bool = Field(default=True)
     browserbase_api_key: Optional[str] = None
     browserbase_project_id: Optional[str] = None
     browserbase_region: Optional[str] = None
+    # Warm keep-alive sessions: spares kept beyond those in use, capped at the max size.
+    browserbase_pool_min_size: int = Field(default=1)
+    browserbase_pool_max_size: int = Field(default=4)
+    browserbase_pool_idle_seconds: float = Field(default=300.0)
+    browserbase_pool_health_check_seconds: float = Field(default=30.0)
+    # Resolve PDF links from the page's plain HTML before falling back to a browser.
+    pdf_link_static_enabled: bool = Field(default=True)
+    # Resolved PDF links, revalidated against their grant page; empty disables the cache.
+    pdf_link_cache_path: Optional[str] = Field(default=str(server_dir / ".cache" / "pdf_links.sqlite3"))
+    # Browser lookups: abort these requests and stop waiting at this load state.
+    pdf_link_block_requests: bool = Field(default=True)
+    pdf_link_blocked_resource_types: list[str] = Field(default_factory=lambda: list(DEFAULT_BLOCKED_RESOURCE_TYPES))
+    pdf_link_blocked_hosts: list[str] = Field(default_factory=lambda: list(DEFAULT_BLOCKED_HOSTS))
+    pdf_link_wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = Field(
+        default="domcontentloaded"
+    )
     gemini_api_key: Optional[str] = None
+    search_cache_max_entries: int = Field(default=256)
+    search_cache_ttl_seconds: int = Field(default=900)
+    # "sector": sector-tag substring scoring; "bm25": BM25F over the whole organization profile.
+    search_ranker: Literal["sector", "bm25"] = Field(default="sector")
+    # Keep one grant per near-duplicate (MinHash) cluster; turn off when distinct programs share text.
+    search_collapse_near_duplicates: bool = Field(default=True)
+    perplexity_cache_path: Optional[str] = Field(
+        default=str(server_dir / ".cache" / "perplexity_responses.sqlite3")
+    )
+    perplexity_cache_fresh_seconds: int = Field(default=86_400)
+    perplexity_cache_stale_seconds: int = Field(default=604_800)
+    mock_catalog_path: Optional[str] = None
+    mock_catalog_reload_seconds: float = Field(default=2.0)
+    # Catalog reloads are compiled here by a worker process; empty builds them in the server process.
+    catalog_build_path: Optional[str] = Field(default=str(server_dir / ".cache" / "catalog_builds"))
+    # Live mode: 0 disables the background crawler and every search calls Perplexity.
+    crawl_interval_seconds: float = Field(default=0.0)
+    crawl_catalog_path: str = Field(default=str(server_dir / ".cache" / "crawled_grants.json"))
+    crawl_state_path: str = Field(default=str(server_dir / ".cache" / "crawl_state.sqlite3"))
+    # Extra crawl queries (e.g. other provinces' program pages), run without a domain filter.
+    crawl_seed_queries: list[str] = Field(default_factory=list)
 
     @classmethod
     def load(cls) -> "Settings":
@@ -34,10 +100,50 @@ class Settings(BaseModel):
             perplexity_model=os.getenv("PERPLEXITY_MODEL", "sonar-small-online"),
             perplexity_base_url=os.getenv("PERPLEXITY_BASE_URL", "https://api.perplexity.ai"),
             http_timeout_seconds=os.getenv("HTTP_TIMEOUT_SECONDS", "20"),
+            http_max_connections_per_client=os.getenv("HTTP_MAX_CONNECTIONS_PER_CLIENT", "20"),
+            http_max_keepalive_connections=os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"),
+            http_keepalive_expiry_seconds=os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"),
+            http2_enabled=os.getenv("HTTP2_ENABLED", "true").strip().lower() in ("1", "true", "yes"),
             browserbase_api_key=os.getenv("BROWSERBASE_API_KEY"),
             browserbase_project_id=os.getenv("BROWSERBASE_PROJECT_ID"),
             browserbase_region=os.getenv("BROWSERBASE_REGION"),
+            browserbase_pool_min_size=os.getenv("BROWSERBASE_POOL_MIN_SIZE", "1"),
+            browserbase_pool_max_size=os.getenv("BROWSERBASE_POOL_MAX_SIZE", "4"),
+            browserbase_pool_idle_seconds=os.getenv("BROWSERBASE_POOL_IDLE_SECONDS", "300"),
+            browserbase_pool_health_check_seconds=os.getenv("BROWSERBASE_POOL_HEALTH_CHECK_SECONDS", "30"),
+            pdf_link_static_enabled=os.getenv("PDF_LINK_STATIC_ENABLED", "true").strip().lower()
+            in ("1", "true", "yes"),
+            pdf_link_cache_path=os.getenv("PDF_LINK_CACHE_PATH", str(server_dir / ".cache" / "pdf_links.sqlite3")),
+            pdf_link_block_requests=os.getenv("PDF_LINK_BLOCK_REQUESTS", "true").strip().lower()
+            in ("1", "true", "yes"),
+            pdf_link_blocked_resource_types=_csv_env("PDF_LINK_BLOCKED_RESOURCE_TYPES", DEFAULT_BLOCKED_RESOURCE_TYPES),
+            pdf_link_blocked_hosts=_csv_env("PDF_LINK_BLOCKED_HOSTS", DEFAULT_BLOCKED_HOSTS),
+            pdf_link_wait_until=(os.getenv("PDF_LINK_WAIT_UNTIL", "domcontentloaded") or "domcontentloaded")
+            .strip()
+            .lower(),
             gemini_api_key=os.getenv("GEMINI_API_KEY"),
+            search_cache_max_entries=os.getenv("SEARCH_CACHE_MAX_ENTRIES", "256"),
+            search_cache_ttl_seconds=os.getenv("SEARCH_CACHE_TTL_SECONDS", "900"),
+            search_ranker=(os.getenv("SEARCH_RANKER", "sector") or "sector").strip().lower(),
+            search_collapse_near_duplicates=os.getenv("SEARCH_COLLAPSE_NEAR_DUPLICATES", "true").strip().lower()
+            in ("1", "true", "yes"),
+            perplexity_cache_path=os.getenv(
+                "PERPLEXITY_CACHE_PATH", str(server_dir / ".cache" / "perplexity_responses.sqlite3")
+            ),
+            perplexity_cache_fresh_seconds=os.getenv("PERPLEXITY_CACHE_FRESH_SECONDS", "86400"),
+            perplexity_cache_stale_seconds=os.getenv("PERPLEXITY_CACHE_STALE_SECONDS", "604800"),
+            mock_catalog_path=os.getenv("MOCK_CATALOG_PATH") or None,
+            mock_catalog_reload_seconds=os.getenv("MOCK_CATALOG_RELOAD_SECONDS", "2"),
+            catalog_build_path=os.getenv("CATALOG_BUILD_PATH", str(server_dir / ".cache" / "catalog_builds")),
+            crawl_interval_seconds=os.getenv("CRAWL_INTERVAL_SECONDS", "0"),
+            crawl_catalog_path=os.getenv(
+                "CRAWL_CATALOG_PATH", str(server_dir / ".cache" / "crawled_grants.json")
+            ),
+            crawl_state_path=os.getenv("CRAWL_STATE_PATH", str(server_dir / ".cache" / "crawl_state.sqlite3")),
+            # Semicolon-separated, since queries routinely contain commas.
+            crawl_seed_queries=[
+                query.strip() for query in os.getenv("CRAWL_SEED_QUERIES", "").split(";") if query.strip()
+            ],
         )
 
     @property
@@ -45,6 +151,14 @@ class Settings(BaseModel):
         return self.mode == "mock"
 
 
+def _csv_env(name: str, default: list[str]) -> list[str]:
+    """Comma-separated list from the environment; unset keeps ``default``, empty means none."""
+    value = os.getenv(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings.load()
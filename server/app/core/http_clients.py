@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, Set, Tuple
+
+import httpx
+
+from app.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+# Strong references to stale-client closes so they are not garbage collected mid-flight.
+_closing_tasks: Set[asyncio.Task[None]] = set()
+
+
+class HttpClientRegistry:
+    """
+    Application-scoped pool of shared ``httpx.AsyncClient`` instances.
+
+    Each named client (one per upstream, e.g. "perplexity" or "downloads")
+    keeps its own keep-alive pool, and the configured limits apply to that
+    pool as a whole: a client such as "pages" that reaches many hosts shares
+    one connection cap across all of them.
+    Clients are created on first use and closed by the FastAPI lifespan
+    handler. A client is bound to the event loop that created it; callers on
+    a different loop (e.g. in tests) get a fresh client for that loop, and
+    the client it replaces is closed so its pool does not leak.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        """Borrow the shared client for ``name``; callers must not close it."""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(name)
+        if entry is not None:
+            client_loop, client = entry
+            if client_loop is loop and not client.is_closed:
+                return client
+            self._discard(name, client_loop, client)
+
+        client = self._create_client()
+        self._clients[name] = (loop, client)
+        return client
+
+    async def aclose(self) -> None:
+        """Close every client created on the current event loop."""
+        loop = asyncio.get_running_loop()
+        for name, (client_loop, client) in list(self._clients.items()):
+            if client_loop is not loop:
+                continue
+            try:
+                await client.aclose()
+            except Exception:
+                logger.debug("Failed to close HTTP client %s cleanly.", name, exc_info=True)
+            del self._clients[name]
+
+    def _discard(self, name: str, client_loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+        """Close a client replaced by one for another loop, on its own loop when it still runs."""
+        if client.is_closed:
+            return
+        if client_loop.is_running() and not client_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_quietly(name, client), client_loop)
+            return
+        # Its loop is gone: release the pool from the current loop instead.
+        task = asyncio.get_running_loop().create_task(_close_quietly(name, client))
+        _closing_tasks.add(task)
+        task.add_done_callback(_closing_tasks.discard)
+
+    def _create_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.settings.http_max_connections_per_client,
+            max_keepalive_connections=self.settings.http_max_keepalive_connections,
+            keepalive_expiry=self.settings.http_keepalive_expiry_seconds,
+        )
+        return httpx.AsyncClient(
+            timeout=self.settings.http_timeout_seconds,
+            limits=limits,
+            http2=self.settings.http2_enabled and _http2_available(),
+        )
+
+
+async def _close_quietly(name: str, client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception:
+        logger.debug("Failed to close stale HTTP client %s cleanly.", name, exc_info=True)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=1)
+def get_http_clients() -> HttpClientRegistry:
+    """Return the process-wide registry, creating it on first use."""
+    return HttpClientRegistry(settings)
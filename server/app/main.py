@@ -1,21 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from pathlib import Path
 
+from app.core.config import settings
+from app.core.http_clients import get_http_clients
 from app.routers.grants import router as grants_router
 from app.routers.auth import router as auth_router
 from app.routers.nonprofits import router as nonprofits_router
+from app.services.browserbase_service import get_browserbase_pool
+from app.services.grant_crawler import GrantCrawler
+from app.services.grant_finder_service import get_catalog_loader
+from app.services.playwright_driver import get_playwright_driver
 
 # Load .env file from server directory (parent of app directory)
 server_dir = Path(__file__).parent.parent
 env_path = server_dir / '.env'
 load_dotenv(dotenv_path=env_path)
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Own application-scoped resources such as the pooled HTTP clients."""
+    get_http_clients()
+    background_tasks: list[asyncio.Task[None]] = []
+    if settings.is_mock_mode:
+        # Index the catalog before serving so the first search is not a cold start.
+        loader = get_catalog_loader(settings.mock_catalog_path)
+        await asyncio.to_thread(loader.current)
+        if settings.mock_catalog_reload_seconds > 0:
+            background_tasks.append(asyncio.create_task(loader.watch(settings.mock_catalog_reload_seconds)))
+    elif settings.crawl_interval_seconds > 0:
+        if Path(settings.crawl_catalog_path).exists():
+            await asyncio.to_thread(get_catalog_loader(settings.crawl_catalog_path).current)
+        background_tasks.append(asyncio.create_task(GrantCrawler(settings).run(settings.crawl_interval_seconds)))
+    if settings.browserbase_api_key:
+        # Spawn the Playwright driver once rather than per PDF-link request.
+        await get_playwright_driver().start()
+        # Warm PDF-link sessions in the background and keep them healthy and trimmed.
+        background_tasks.append(
+            asyncio.create_task(get_browserbase_pool().run(settings.browserbase_pool_health_check_seconds))
+        )
+    yield
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    if settings.browserbase_api_key:
+        # Keep-alive sessions bill until released.
+        await get_browserbase_pool().aclose()
+        await get_playwright_driver().aclose()
+    await get_http_clients().aclose()
+
+
 app = FastAPI(
     title="AI-Powered Grant Assistant",
     description="Backend API for helping nonprofits access government funding.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
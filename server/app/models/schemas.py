@@ -63,3 +63,7 @@ class GrantsSearchResponse(BaseModel):
     generated_at: datetime
 
 
+class GrantsSearchFrame(GrantsSearchResponse):
+    """One line of the streaming search response; the last frame has type "final"."""
+
+    type: Literal["provisional", "final"]
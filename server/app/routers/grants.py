@@ -1,36 +1,50 @@
 from __future__ import annotations
 
 from datetime import datetime
+import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 import httpx
 from pydantic import BaseModel, Field, HttpUrl
 
 from app.core.config import settings
-from app.models.schemas import GrantsSearchRequest, GrantsSearchResponse
-from app.services.browserbase_service import (
-    BrowserbaseConfigurationError,
-    PdfLinkNotFoundError,
-    get_pdf_link_from_grant_page,
+from app.models.schemas import GrantsSearchFrame, GrantsSearchRequest, GrantsSearchResponse
+from app.services.browserbase_service import BrowserbaseConfigurationError, PdfLinkNotFoundError
+from app.services.caching.singleflight import SingleFlight
+from app.services.draft_service import (
+    DraftGenerationError,
+    DraftGenerationResult,
+    generate_draft_from_pdf,
 )
-from app.services.draft_service import DraftGenerationError, generate_draft_from_pdf
-from app.services.grant_finder_service import GrantFinderService
+from app.services.grant_finder_service import GrantFinderService, search_flights
+from app.services.page_profile import navigation_stats
+from app.services.pdf_link_service import resolve_pdf_link, static_path_stats
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Identical concurrent lookups share one Browserbase session or Gemini call; Live View requests never do.
+pdf_link_flights: SingleFlight[Dict[str, Optional[str]]] = SingleFlight()
+draft_flights: SingleFlight[DraftGenerationResult] = SingleFlight()
+
 
 class GrantPdfRequest(BaseModel):
     grant_url: HttpUrl
+    live_view: bool = Field(
+        default=True,
+        description="Open the grant page in a Browserbase session of the caller's own and return its Live View.",
+    )
 
 
 class GrantPdfResponse(BaseModel):
-    session_id: str
-    live_view_url: HttpUrl
+    # Both None when live_view is false: the lookup ran on a pooled session, or on no browser at all.
+    session_id: Optional[str] = None
+    live_view_url: Optional[HttpUrl] = None
     pdf_link: HttpUrl
 
 
@@ -52,8 +66,12 @@ class GrantDraftResponse(BaseModel):
 
 @router.post("/pdf-link", response_model=GrantPdfResponse, tags=["grants"])
 async def fetch_grant_pdf_link(payload: GrantPdfRequest) -> GrantPdfResponse:
+    grant_url = str(payload.grant_url)
     try:
-        result = await get_pdf_link_from_grant_page(str(payload.grant_url))
+        if payload.live_view:
+            result = await resolve_pdf_link(grant_url, live_view=True)
+        else:
+            result = await pdf_link_flights.do(grant_url, lambda: resolve_pdf_link(grant_url))
     except PdfLinkNotFoundError as exc:
         raise HTTPException(status_code=404, detail="PDF link not found") from exc
     except BrowserbaseConfigurationError as exc:
@@ -67,7 +85,11 @@ async def fetch_grant_pdf_link(payload: GrantPdfRequest) -> GrantPdfResponse:
 @router.post("/draft", response_model=GrantDraftResponse, tags=["grants"])
 async def generate_grant_draft(payload: GrantDraftRequest) -> GrantDraftResponse:
     try:
-        draft_result = await generate_draft_from_pdf(str(payload.pdf_link), payload.organization_summary)
+        pdf_link = str(payload.pdf_link)
+        draft_result = await draft_flights.do(
+            (pdf_link, payload.organization_summary),
+            lambda: generate_draft_from_pdf(pdf_link, payload.organization_summary),
+        )
     except DraftGenerationError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     except httpx.HTTPError as exc:
@@ -85,26 +107,18 @@ async def generate_grant_draft(payload: GrantDraftRequest) -> GrantDraftResponse
 
 
 @router.post("/search", response_model=GrantsSearchResponse, tags=["grants"])
-async def search_grants(payload: GrantsSearchRequest) -> GrantsSearchResponse:
+async def search_grants(payload: GrantsSearchRequest, response: Response) -> GrantsSearchResponse:
     service = GrantFinderService(settings)
     try:
         grants = await service.find_grants(payload.organization, payload.filters)
-    except NotImplementedError as exc:
-        raise HTTPException(status_code=501, detail=str(exc)) from exc
-    except ValueError as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
-    except httpx.HTTPStatusError as exc:
-        detail = {
-            "message": "Perplexity API returned an error.",
-            "status_code": exc.response.status_code,
-            "response_text": exc.response.text,
-        }
-        raise HTTPException(status_code=502, detail=detail) from exc
-    except httpx.RequestError as exc:
-        raise HTTPException(
-            status_code=502,
-            detail=f"Error contacting Perplexity API: {exc}",
-        ) from exc
+    except Exception as exc:
+        error = _search_http_error(exc)
+        if error is None:
+            raise
+        raise error from exc
+
+    if service.last_cache_status:
+        response.headers["X-Grants-Cache"] = service.last_cache_status
 
     return GrantsSearchResponse(
         mode=settings.mode,
@@ -113,3 +127,83 @@ async def search_grants(payload: GrantsSearchRequest) -> GrantsSearchResponse:
         generated_at=datetime.utcnow(),
     )
 
+
+@router.post("/search/stream", tags=["grants"])
+async def stream_search_grants(payload: GrantsSearchRequest) -> StreamingResponse:
+    """
+    Stream search results as newline-delimited JSON ``GrantsSearchFrame`` objects.
+
+    Provisional frames arrive as each source batch completes; the last line is
+    the final frame. Errors before the first frame map to the same status codes
+    as ``/search``; later ones end the stream with an ``{"type": "error"}`` line.
+    """
+    service = GrantFinderService(settings)
+    frames = service.stream_grants(payload.organization, payload.filters)
+    try:
+        first = await anext(frames)
+    except Exception as exc:
+        error = _search_http_error(exc)
+        if error is None:
+            raise
+        raise error from exc
+
+    headers = {"X-Grants-Cache": service.last_cache_status} if service.last_cache_status else None
+    return StreamingResponse(
+        _ndjson_frames(first, frames),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+
+async def _ndjson_frames(
+    first: GrantsSearchFrame, frames: AsyncIterator[GrantsSearchFrame]
+) -> AsyncIterator[str]:
+    yield first.model_dump_json() + "\n"
+    try:
+        async for frame in frames:
+            yield frame.model_dump_json() + "\n"
+    except Exception as exc:
+        logger.exception("Grant search stream failed")
+        error = _search_http_error(exc)
+        detail = error.detail if error is not None else "Grant search failed."
+        yield json.dumps({"type": "error", "detail": detail}) + "\n"
+    finally:
+        await frames.aclose()
+
+
+def _search_http_error(exc: Exception) -> Optional[HTTPException]:
+    """Translate a grant search failure into the HTTP error returned to clients."""
+    if isinstance(exc, NotImplementedError):
+        return HTTPException(status_code=501, detail=str(exc))
+    if isinstance(exc, ValueError):
+        return HTTPException(status_code=500, detail=str(exc))
+    if isinstance(exc, httpx.HTTPStatusError):
+        detail = {
+            "message": "Perplexity API returned an error.",
+            "status_code": exc.response.status_code,
+            "response_text": exc.response.text,
+        }
+        return HTTPException(status_code=502, detail=detail)
+    if isinstance(exc, httpx.RequestError):
+        return HTTPException(status_code=502, detail=f"Error contacting Perplexity API: {exc}")
+    return None
+
+
+@router.get("/metrics", tags=["grants"])
+async def grant_metrics() -> Dict[str, Any]:
+    """Expose request coalescing counters and PDF-link static pass and browser lookup stats."""
+    metrics: Dict[str, Any] = {
+        name: {
+            "coalesced_total": flights.coalesced,
+            "in_flight": flights.in_flight,
+            "waiting": flights.waiting,
+        }
+        for name, flights in (
+            ("search", search_flights),
+            ("pdf_link", pdf_link_flights),
+            ("draft", draft_flights),
+        )
+    }
+    metrics["pdf_link_static"] = static_path_stats.snapshot()
+    metrics["pdf_link_browser"] = navigation_stats.snapshot()
+    return metrics
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Deque, Optional
+
+from app.core.config import Settings
+
+if TYPE_CHECKING:
+    from app.services.browserbase_service import BrowserbaseSession
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _PooledSession:
+    session: "BrowserbaseSession"
+    idle_since: float
+    checked_at: float
+    # Set when a lease ended in an error; the session is checked before its next lease.
+    suspect: bool = False
+
+
+class BrowserbaseSessionPool:
+    """
+    Warm pool of keep-alive Browserbase sessions shared across requests.
+
+    ``lease()`` hands out an idle session (most recently used first) or
+    creates one while the pool is below ``max_size``; otherwise it waits for a
+    session to be returned. The pool aims to hold ``min_size`` spare sessions
+    on top of those leased or awaited, so its size follows the queue depth and
+    a steady stream of requests never waits on session creation. Sessions
+    idle for longer than ``idle_seconds`` are released once the pool is above
+    that target, sessions not checked for ``health_check_seconds`` are
+    checked before being leased, and ``aclose()`` releases every session.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        create: Callable[[], Awaitable["BrowserbaseSession"]],
+        release: Callable[["BrowserbaseSession"], Awaitable[None]],
+        check: Callable[["BrowserbaseSession"], Awaitable[bool]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_size = max(0, settings.browserbase_pool_min_size)
+        self.max_size = max(1, self.min_size, settings.browserbase_pool_max_size)
+        self.idle_seconds = settings.browserbase_pool_idle_seconds
+        self.health_check_seconds = settings.browserbase_pool_health_check_seconds
+        self._create = create
+        self._release = release
+        self._check = check
+        self._clock = clock
+        self._idle: Deque[_PooledSession] = deque()
+        self._leased = 0
+        self._creating = 0
+        self._waiting = 0
+        self._changed = asyncio.Condition()
+        self._refill_task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+        # Lifetime counters.
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+
+    @property
+    def size(self) -> int:
+        """Sessions held by the pool: idle, leased and being created."""
+        return len(self._idle) + self._leased + self._creating
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    @property
+    def target(self) -> int:
+        """Pool size to keep warm: ``min_size`` spares beyond the leased and awaited sessions."""
+        return min(self.max_size, self._leased + self._waiting + self.min_size)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["BrowserbaseSession"]:
+        """Borrow a session for the duration of the block; it returns to the pool afterwards."""
+        if self._closed:
+            raise RuntimeError("Browserbase session pool is closed.")
+        entry = await self._acquire()
+        failed = False
+        try:
+            yield entry.session
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            await self._return(entry, failed)
+
+    async def maintain(self) -> None:
+        """Release idle sessions above the target, check stale ones and top the pool back up."""
+        now = self._clock()
+        expired = []
+        async with self._changed:
+            for entry in list(self._idle):
+                if self.size <= self.target:
+                    break
+                if now - entry.idle_since >= self.idle_seconds:
+                    self._idle.remove(entry)
+                    expired.append(entry)
+        stale = [entry for entry in self._idle if entry.suspect or self._is_stale(entry, now)]
+
+        for entry in expired:
+            await self._discard(entry)
+        for entry in stale:
+            # The entry may be leased while its check runs; only drop it if it is still idle.
+            if not await self._is_healthy(entry) and entry in self._idle:
+                self._idle.remove(entry)
+                await self._discard(entry)
+        self._schedule_refill()
+        if self._refill_task is not None:
+            await asyncio.shield(self._refill_task)
+
+    async def run(self, interval_seconds: float) -> None:
+        """Warm the pool, then maintain it every ``interval_seconds`` until cancelled."""
+        while True:
+            try:
+                await self.maintain()
+            except Exception:
+                logger.exception("Browserbase pool maintenance failed.")
+            await asyncio.sleep(interval_seconds)
+
+    async def aclose(self) -> None:
+        """Release every idle session; leased sessions are released when returned."""
+        self._closed = True
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._refill_task
+            self._refill_task = None
+        idle, self._idle = list(self._idle), deque()
+        await asyncio.gather(*(self._discard(entry) for entry in idle))
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _acquire(self) -> _PooledSession:
+        self._waiting += 1
+        try:
+            while True:
+                async with self._changed:
+                    while not self._idle and self.size >= self.max_size and not self._closed:
+                        await self._changed.wait()
+                    if self._closed:
+                        raise RuntimeError("Browserbase session pool is closed.")
+                    entry = self._idle.pop() if self._idle else None
+                    if entry is None:
+                        self._creating += 1
+                    else:
+                        self._leased += 1
+
+                if entry is None:
+                    try:
+                        session = await self._create()
+                    except BaseException:
+                        self._creating -= 1
+                        await self._notify()
+                        raise
+                    self._creating -= 1
+                    self._leased += 1
+                    self.created += 1
+                    now = self._clock()
+                    return _PooledSession(session, idle_since=now, checked_at=now)
+
+                if await self._is_healthy(entry):
+                    self.reused += 1
+                    return entry
+                self._leased -= 1
+                await self._discard(entry)
+        finally:
+            self._waiting -= 1
+            self._schedule_refill()
+
+    async def _return(self, entry: _PooledSession, failed: bool) -> None:
+        self._leased -= 1
+        if self._closed:
+            await self._discard(entry)
+            return
+        entry.idle_since = self._clock()
+        entry.suspect = entry.suspect or failed
+        async with self._changed:
+            self._idle.append(entry)
+            self._changed.notify()
+
+    async def _is_healthy(self, entry: _PooledSession) -> bool:
+        now = self._clock()
+        if not entry.suspect and not self._is_stale(entry, now):
+            return True
+        try:
+            healthy = await self._check(entry.session)
+        except Exception:
+            logger.debug("Health check failed for Browserbase session %s.", entry.session.id, exc_info=True)
+            healthy = False
+        entry.checked_at = now
+        entry.suspect = False
+        return healthy
+
+    def _is_stale(self, entry: _PooledSession, now: float) -> bool:
+        return now - entry.checked_at >= self.health_check_seconds
+
+    async def _discard(self, entry: _PooledSession) -> None:
+        try:
+            await self._release(entry.session)
+            self.released += 1
+        except Exception:
+            logger.debug("Failed to release Browserbase session %s.", entry.session.id, exc_info=True)
+        await self._notify()
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _schedule_refill(self) -> None:
+        if self._closed or self.size >= self.target:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        while not self._closed and self.size < self.target:
+            self._creating += 1
+            try:
+                session = await self._create()
+            except Exception as exc:
+                self._creating -= 1
+                logger.warning("Failed to warm a Browserbase session: %s", exc)
+                return
+            self._creating -= 1
+            self.created += 1
+            now = self._clock()
+            entry = _PooledSession(session, idle_since=now, checked_at=now)
+            if self._closed:
+                await self._discard(entry)
+                return
+            self._idle.append(entry)
+            await self._notify()
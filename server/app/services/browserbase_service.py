@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 import re
-from typing import Any, Dict
+import time
+from typing import Any, AsyncIterator, Dict, Optional
 from urllib.parse import urljoin
 
 from browserbase import Browserbase
@@ -14,10 +17,13 @@ from playwright.async_api import (
     Locator,
     Page,
     TimeoutError as PlaywrightTimeout,
-    async_playwright,
 )
 
 from app.core.config import settings
+from app.services.browserbase_pool import BrowserbaseSessionPool
+from app.services.page_profile import PageProfile, PageTraffic, navigation_stats
+from app.services.parsing.pdf_links import PDF_HREF_HINT, PDF_LINK_NAME
+from app.services.playwright_driver import get_playwright_driver
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +43,13 @@ class BrowserbaseSession:
     id: str
     connect_url: str
     live_view_url: str
+    project_id: Optional[str] = None
+
+
+@lru_cache(maxsize=4)
+def _browserbase_client(api_key: str) -> Browserbase:
+    """Return a shared SDK client; building one per call re-creates its HTTP client."""
+    return Browserbase(api_key=api_key)
 
 
 async def create_session() -> BrowserbaseSession:
@@ -54,7 +67,7 @@ async def create_session() -> BrowserbaseSession:
     if not api_key:
         raise BrowserbaseConfigurationError("BROWSERBASE_API_KEY is not configured.")
 
-    bb = Browserbase(api_key=api_key)
+    bb = _browserbase_client(api_key)
 
     def _create_session() -> Any:
         session_kwargs: Dict[str, Any] = {"keep_alive": True}
@@ -80,16 +93,47 @@ async def create_session() -> BrowserbaseSession:
         id=session_id,
         connect_url=connect_url,
         live_view_url=live_view_url,
+        project_id=getattr(session, "project_id", None) or settings.browserbase_project_id,
+    )
+
+
+async def release_session(session: BrowserbaseSession) -> None:
+    """Ask Browserbase to end a keep-alive session."""
+    await get_playwright_driver().disconnect(session.id)
+    api_key = settings.browserbase_api_key
+    project_id = session.project_id or settings.browserbase_project_id
+    if not api_key or not project_id:
+        raise BrowserbaseConfigurationError("Browserbase credentials are required to release a session.")
+    await asyncio.to_thread(
+        _browserbase_client(api_key).sessions.update,
+        session.id,
+        project_id=project_id,
+        status="REQUEST_RELEASE",
     )
 
 
+async def session_is_running(session: BrowserbaseSession) -> bool:
+    """Return True while Browserbase still reports the session as running."""
+    api_key = settings.browserbase_api_key
+    if not api_key:
+        raise BrowserbaseConfigurationError("BROWSERBASE_API_KEY is not configured.")
+    details = await asyncio.to_thread(_browserbase_client(api_key).sessions.retrieve, session.id)
+    return getattr(details, "status", None) == "RUNNING"
+
+
+@lru_cache(maxsize=1)
+def get_browserbase_pool() -> BrowserbaseSessionPool:
+    """Return the process-wide session pool, creating it on first use."""
+    return BrowserbaseSessionPool(settings, create_session, release_session, session_is_running)
+
+
 async def _locate_pdf_link(page: Page) -> Locator:
     """Return a locator that targets the CFEP PDF link."""
-    link_by_role = page.get_by_role("link", name=re.compile("CFEP Small Sample Application", re.IGNORECASE))
+    link_by_role = page.get_by_role("link", name=PDF_LINK_NAME)
     if await link_by_role.count() > 0:
         return link_by_role.first
 
-    primary = page.get_by_text("CFEP Small Sample Application", exact=False)
+    primary = page.get_by_text(PDF_LINK_NAME)
     if await primary.count() > 0:
         return primary.first
 
@@ -115,9 +159,10 @@ async def _derive_pdf_url(page: Page, grant_url: str, locator: Locator) -> str:
 
     anchors = await page.eval_on_selector_all(
         "a[href]",
-        """elements => elements
+        """(elements, hint) => elements
             .map(element => element.getAttribute('href'))
-            .filter(href => href && /cfep|sample|community/i.test(href))""",
+            .filter(href => href && new RegExp(hint, 'i').test(href))""",
+        PDF_HREF_HINT.pattern,
     )
 
     for anchor in anchors or []:
@@ -184,6 +229,15 @@ async def _click_and_capture_pdf_url(
         return fallback_pdf_url
 
 
+async def _wait_for_pdf_link(page: Page, timeout_ms: float) -> None:
+    """Wait until a PDF link candidate is in the DOM, for at most ``timeout_ms``."""
+    candidate = page.locator("a[href$='.pdf']").or_(page.get_by_text(PDF_LINK_NAME)).first
+    try:
+        await candidate.wait_for(state="attached", timeout=timeout_ms)
+    except PlaywrightTimeout:
+        logger.debug("No PDF link candidate after %.0f ms; continuing.", timeout_ms)
+
+
 async def _ensure_step_four_expanded(page: Page) -> None:
     """Ensure the Step 4 accordion section is expanded so the PDF link is visible."""
     try:
@@ -199,54 +253,139 @@ async def _ensure_step_four_expanded(page: Page) -> None:
         logger.debug("Unable to expand Step 4 accordion.", exc_info=True)
 
 
-async def get_pdf_link_from_grant_page(grant_url: str) -> Dict[str, str]:
+async def get_pdf_link_from_grant_page(grant_url: str, live_view: bool = False) -> Dict[str, Optional[str]]:
     """
-    Launch a Browserbase session, load the grant page, and extract the PDF link.
+    Load the grant page in a Browserbase session and extract the PDF link.
+
+    Without ``live_view`` the lookup leases a warm session from the pool; the
+    session goes on to serve other lookups, so its id and Live View URL are
+    not returned. With ``live_view`` the user gets a session of their own,
+    left open on the grant page so its Live View shows it.
 
     Args:
         grant_url: Fully qualified URL to the Government of Alberta grant page.
+        live_view: Whether the caller will watch the session.
 
     Returns:
-        dict: Session metadata and the resolved PDF URL.
+        dict: Session metadata (None unless ``live_view``) and the resolved PDF URL.
 
     Raises:
         PdfLinkNotFoundError: When no matching PDF link is found.
         BrowserbaseConfigurationError: When Browserbase credentials are missing.
     """
+    if live_view:
+        async with _dedicated_session() as session:
+            pdf_link = await _find_pdf_link(session, grant_url, keep_pages=True)
+        return {"session_id": session.id, "live_view_url": session.live_view_url, "pdf_link": pdf_link}
+
+    async with get_browserbase_pool().lease() as session:
+        pdf_link = await _find_pdf_link(session, grant_url)
+    return {"session_id": None, "live_view_url": None, "pdf_link": pdf_link}
+
+
+async def open_live_view(grant_url: str, pdf_link: str) -> Dict[str, Optional[str]]:
+    """
+    Open the grant page in a session of the user's own when its PDF link is already known.
+
+    Only navigates; none of the lookup's locator work runs.
+    """
+    async with _dedicated_session() as session:
+        browser = await get_playwright_driver().connect(session.id, session.connect_url)
+        try:
+            context = browser.contexts[0]
+        except IndexError as exc:
+            raise RuntimeError("No contexts available in the Browserbase session.") from exc
+        page = context.pages[0] if context.pages else await context.new_page()
+        await page.goto(grant_url, wait_until="load")
+    return {"session_id": session.id, "live_view_url": session.live_view_url, "pdf_link": pdf_link}
+
+
+@asynccontextmanager
+async def _dedicated_session() -> AsyncIterator[BrowserbaseSession]:
+    """
+    Create a session outside the pool for a user to watch.
+
+    On success only the CDP connection is dropped and the session keeps
+    running for its Live View; if the block fails the session is released.
+    """
     session = await create_session()
+    try:
+        yield session
+    except BaseException:
+        try:
+            await release_session(session)
+        except Exception:
+            logger.debug("Failed to release Browserbase session %s.", session.id, exc_info=True)
+        raise
+    await get_playwright_driver().disconnect(session.id)
+
+
+async def _find_pdf_link(session: BrowserbaseSession, grant_url: str, keep_pages: bool = False) -> str:
+    """
+    Find the PDF link on the grant page, in a session already leased or created.
 
-    async with async_playwright() as playwright:
-        browser = await playwright.chromium.connect_over_cdp(session.connect_url)
+    With ``keep_pages`` the session is the user's own: the page loads in its
+    first tab with nothing blocked and is left open for the Live View.
+    Otherwise it loads in a fresh tab, profiled, and every tab it opened is
+    closed afterwards.
+    """
+    driver = get_playwright_driver()
+    # Shared with every other request leased this session; only the page is per request.
+    browser = await driver.connect(session.id, session.connect_url)
+    profile = (
+        PageProfile(frozenset(), (), settings.pdf_link_wait_until)
+        if keep_pages
+        else PageProfile.from_settings(settings)
+    )
+    traffic = PageTraffic(profile)
+    locator_seconds: Optional[float] = None
+    context: Optional[BrowserContext] = None
+    existing: list[Page] = []
+    try:
         try:
-            try:
-                context = browser.contexts[0]
-            except IndexError as exc:
-                raise RuntimeError("No contexts available in the Browserbase session.") from exc
+            context = browser.contexts[0]
+        except IndexError as exc:
+            raise RuntimeError("No contexts available in the Browserbase session.") from exc
 
+        if keep_pages:
             page = context.pages[0] if context.pages else await context.new_page()
-
-            await page.goto(grant_url, wait_until="networkidle")
-            await page.evaluate("window.scrollBy(0, document.body.scrollHeight / 2)")
-            await page.wait_for_timeout(1_000)
-            await _ensure_step_four_expanded(page)
-
-            locator = await _locate_pdf_link(page)
-            pdf_link = await _derive_pdf_url(page, grant_url, locator)
-            pdf_link = await _click_and_capture_pdf_url(context, page, locator, pdf_link)
-
-            return {
-                "session_id": session.id,
-                "live_view_url": session.live_view_url,
-                "pdf_link": pdf_link,
-            }
-        except PdfLinkNotFoundError:
-            logger.warning("Failed to locate CFEP PDF link for url=%s", grant_url)
-            raise
-        except (PlaywrightTimeout, PlaywrightError) as exc:
-            logger.error("Playwright error while scraping grant page: %s", exc)
-            raise
-        finally:
-            try:
-                await browser.close()
-            except Exception:
-                logger.debug("Failed to close Playwright browser cleanly.", exc_info=True)
+        else:
+            # A fresh tab per request, since the session outlives it and serves later requests.
+            existing = list(context.pages)
+            page = await context.new_page()
+        await traffic.attach(page)
+
+        started = time.perf_counter()
+        await page.goto(grant_url, wait_until=profile.wait_until)
+        await page.evaluate("window.scrollBy(0, document.body.scrollHeight / 2)")
+        # Before network idle, script may still be inserting the link; wait for it a little longer.
+        await _wait_for_pdf_link(page, 1_000 if profile.wait_until == "networkidle" else 3_000)
+        await _ensure_step_four_expanded(page)
+
+        locator = await _locate_pdf_link(page)
+        locator_seconds = time.perf_counter() - started
+        pdf_link = await _derive_pdf_url(page, grant_url, locator)
+        return await _click_and_capture_pdf_url(context, page, locator, pdf_link)
+    except PdfLinkNotFoundError:
+        logger.warning("Failed to locate CFEP PDF link for url=%s", grant_url)
+        raise
+    except (PlaywrightTimeout, PlaywrightError) as exc:
+        logger.error("Playwright error while scraping grant page: %s", exc)
+        raise
+    finally:
+        try:
+            # Close the tabs a pooled lookup opened (including any PDF tab) but keep the session
+            # alive; nobody watches them, and the next lease starts clean.
+            for opened in list(context.pages if context is not None and not keep_pages else []):
+                if opened not in existing:
+                    await opened.close()
+        except Exception:
+            logger.debug("Failed to close request pages cleanly.", exc_info=True)
+        navigation_stats.record(traffic.bytes_transferred, traffic.requests_blocked, locator_seconds)
+        logger.info(
+            "PDF lookup for %s: %d bytes, %d requests blocked, locator after %s.",
+            grant_url,
+            traffic.bytes_transferred,
+            traffic.requests_blocked,
+            f"{locator_seconds * 1000:.0f} ms" if locator_seconds is not None else "never",
+        )
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from app.services.parsing.urls import canonical_url
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdf_links (
+    grant_url TEXT PRIMARY KEY,
+    pdf_link TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    resolved_at REAL NOT NULL
+)
+"""
+
+
+@dataclass(slots=True)
+class ResolvedPdfLink:
+    pdf_link: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    # SHA-256 of the page body, for servers that send neither validator.
+    content_hash: Optional[str]
+    resolved_at: float
+
+
+class PdfLinkStore:
+    """
+    On-disk map from grant page URL to its resolved PDF link.
+
+    Each entry keeps the validators of the page it was resolved from, so a
+    later lookup can confirm with a conditional request that the page is
+    unchanged instead of resolving the link again. Entries never expire on
+    their own; they are replaced when the page changes. URLs are keyed in
+    canonical form, and the SQLite file survives restarts and is shared by
+    workers.
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+
+    def get(self, grant_url: str) -> Optional[ResolvedPdfLink]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT pdf_link, etag, last_modified, content_hash, resolved_at FROM pdf_links WHERE grant_url = ?",
+                (canonical_url(grant_url),),
+            ).fetchone()
+        return ResolvedPdfLink(*row) if row is not None else None
+
+    def put(
+        self,
+        grant_url: str,
+        pdf_link: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> ResolvedPdfLink:
+        """Store or replace the link resolved for ``grant_url`` along with its page validators."""
+        entry = ResolvedPdfLink(pdf_link, etag, last_modified, content_hash, self._clock())
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO pdf_links "
+                "(grant_url, pdf_link, etag, last_modified, content_hash, resolved_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (canonical_url(grant_url), pdf_link, etag, last_modified, content_hash, entry.resolved_at),
+            )
+        return entry
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=5)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+@lru_cache(maxsize=None)
+def get_pdf_link_store(path: str) -> PdfLinkStore:
+    """Process-wide store for a given database path."""
+    return PdfLinkStore(Path(path))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL
+)
+"""
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    body: Dict[str, Any]
+    age_seconds: float
+    fresh: bool
+
+
+class ResponseStore:
+    """
+    Content-addressed, on-disk store of JSON API responses.
+
+    Responses are zlib-compressed and keyed by a hash of the exact request
+    payload, in a SQLite database so they survive restarts and can be shared
+    by several workers. Entries younger than ``fresh_seconds`` are served as
+    is; entries up to ``stale_seconds`` old are still served but flagged as
+    stale so the caller can refresh them in the background.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fresh_seconds: float,
+        stale_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = max(stale_seconds, fresh_seconds)
+        self._clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+
+    @staticmethod
+    def key_for(payload: Dict[str, Any]) -> str:
+        """Hash a request payload into a stable cache key."""
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the stored response, or None when missing or older than ``stale_seconds``."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        body, stored_at = row
+        age = self._clock() - stored_at
+        if age > self.stale_seconds:
+            return None
+        return CachedResponse(
+            body=json.loads(zlib.decompress(body)),
+            age_seconds=age,
+            fresh=age <= self.fresh_seconds,
+        )
+
+    def put(self, key: str, body: Dict[str, Any]) -> None:
+        """Store or replace the response for ``key``."""
+        blob = zlib.compress(json.dumps(body, separators=(",", ":")).encode("utf-8"))
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, body, stored_at) VALUES (?, ?, ?)",
+                (key, blob, self._clock()),
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per call keeps the store usable from worker threads.
+        connection = sqlite3.connect(self.path, timeout=5)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+@lru_cache(maxsize=None)
+def get_response_store(path: str, fresh_seconds: int, stale_seconds: int) -> ResponseStore:
+    """Process-wide store for a given database path."""
+    return ResponseStore(Path(path), fresh_seconds=fresh_seconds, stale_seconds=stale_seconds)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import bisect
+import string
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.models.schemas import Grant
+from app.services.catalog.columns import StringTable, pack_strings
+
+K1 = 1.2
+B = 0.75
+# BM25F field weights: a term in the title counts three times one in the summary.
+FIELD_WEIGHTS: Dict[str, float] = {"title": 3.0, "program": 2.0, "summary": 1.0, "eligibility": 1.0}
+
+# Query term weights by where the term came from in the organization profile.
+SECTOR_TAG_WEIGHT = 1.0
+NAICS_WEIGHT = 0.5
+NAME_WEIGHT = 0.3
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in inc into is it its ltd of on or our the this to with".split()
+)
+_PUNCTUATION = str.maketrans({char: " " for char in string.punctuation})
+
+# NAICS 2-digit sectors mapped to words grant pages use for them.
+NAICS_SECTOR_TERMS: Dict[str, str] = {
+    "11": "agriculture farming forestry fishing",
+    "21": "mining energy",
+    "22": "utilities energy water",
+    "23": "construction infrastructure",
+    "31": "manufacturing",
+    "32": "manufacturing",
+    "33": "manufacturing",
+    "41": "wholesale trade",
+    "42": "wholesale trade",
+    "44": "retail business",
+    "45": "retail business",
+    "48": "transportation",
+    "49": "transportation",
+    "51": "information media culture",
+    "52": "finance",
+    "53": "housing",
+    "54": "research technology",
+    "56": "employment environment",
+    "61": "education learning schools",
+    "62": "health social services",
+    "71": "arts culture recreation sport heritage",
+    "72": "tourism food",
+    "81": "community social civic nonprofit",
+    "91": "public municipal",
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased words of ``text`` without punctuation or stopwords."""
+    if not text:
+        return []
+    return [token for token in text.lower().translate(_PUNCTUATION).split() if token not in STOPWORDS]
+
+
+def build_query(
+    sector_tags: Iterable[str] = (),
+    naics_code: Optional[str] = None,
+    names: Iterable[Optional[str]] = (),
+) -> Dict[str, float]:
+    """
+    Weighted query terms for an organization profile.
+
+    Sector tags weigh most, then the words of the NAICS sector, then the
+    organization's names. Repeated terms add up.
+    """
+    query: Counter[str] = Counter()
+    for tag in sector_tags:
+        for token in tokenize(tag):
+            query[token] += SECTOR_TAG_WEIGHT
+    sector = (naics_code or "").strip()[:2]
+    for token in tokenize(NAICS_SECTOR_TERMS.get(sector)):
+        query[token] += NAICS_WEIGHT
+    for name in names:
+        for token in tokenize(name):
+            query[token] += NAME_WEIGHT
+    return dict(query)
+
+
+class BM25Index:
+    """
+    BM25F inverted index over a grant's title, program, summary and eligibility.
+
+    Term frequencies are length-normalized per field, weighted by
+    ``FIELD_WEIGHTS`` and saturated once at build time, so each posting stores
+    its final impact (IDF included). A query only gathers the postings of its
+    own terms and sums their impacts per grant; grants sharing no term with
+    the query are never touched. The vocabulary is sorted, so a compiled
+    snapshot can look terms up by binary search without building a dict.
+    """
+
+    def __init__(self, grants: Sequence[Grant]):
+        self.size = len(grants)
+        vocabulary: Dict[str, int] = {}
+        token_terms: List[np.ndarray] = []
+        token_grants: List[np.ndarray] = []
+        token_weights: List[np.ndarray] = []
+        for name, weight in FIELD_WEIGHTS.items():
+            # Stopwords count towards field length here and are dropped from the postings below.
+            tokens = [(getattr(grant, name) or "").lower().translate(_PUNCTUATION).split() for grant in grants]
+            lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+            average = float(lengths.mean()) if lengths.size and lengths.any() else 1.0
+            # Every occurrence carries its field's weight and length normalization.
+            norms = weight / (1 - B + B * lengths / average)
+            token_terms.append(
+                np.asarray(
+                    [vocabulary.setdefault(token, len(vocabulary)) for field in tokens for token in field],
+                    dtype=np.int64,
+                )
+            )
+            token_grants.append(np.repeat(np.arange(len(tokens), dtype=np.int64), lengths))
+            token_weights.append(np.repeat(norms, lengths))
+        for stopword in STOPWORDS:
+            vocabulary.pop(stopword, None)
+
+        # Renumber terms in sorted order so lookups can binary-search the vocabulary;
+        # stopwords (no longer in the vocabulary) map to -1 and are dropped.
+        terms = sorted(vocabulary)
+        rank = np.full(len(vocabulary) + len(STOPWORDS), -1, dtype=np.int64)
+        rank[np.asarray([vocabulary[term] for term in terms], dtype=np.int64)] = np.arange(len(terms))
+        term_ids = rank[np.concatenate(token_terms)]
+        kept = term_ids >= 0
+        term_ids = term_ids[kept]
+        grant_ids = np.concatenate(token_grants)[kept]
+        weights = np.concatenate(token_weights)[kept]
+
+        # One posting per (term, grant): sum the weighted frequencies of its occurrences.
+        keys, inverse = np.unique(term_ids * max(self.size, 1) + grant_ids, return_inverse=True)
+        frequencies = np.bincount(inverse.reshape(-1), weights=weights, minlength=keys.size)
+        posting_terms = keys // max(self.size, 1)
+        document_frequency = np.bincount(posting_terms, minlength=len(terms))
+        idf = np.log(1 + (self.size - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        self._terms: Sequence[str] = terms
+        self._indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(document_frequency, out=self._indptr[1:])
+        self._grant_ids = keys % max(self.size, 1)
+        self._impacts = (idf[posting_terms] * frequencies * (K1 + 1) / (frequencies + K1)).astype(np.float32)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        terms_blob, terms_offsets = pack_strings(self._terms)
+        return {
+            "size": np.asarray([self.size], dtype=np.int64),
+            "terms_blob": terms_blob,
+            "terms_offsets": terms_offsets,
+            "indptr": self._indptr,
+            "grant_ids": self._grant_ids,
+            "impacts": self._impacts,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> "BM25Index":
+        index = cls.__new__(cls)
+        index.size = int(arrays["size"][0])
+        index._terms = StringTable(arrays["terms_blob"], arrays["terms_offsets"])
+        index._indptr = arrays["indptr"]
+        index._grant_ids = arrays["grant_ids"]
+        index._impacts = arrays["impacts"]
+        return index
+
+    def score(self, query: Mapping[str, float], candidate_ids: np.ndarray) -> np.ndarray:
+        """Return the BM25F score of each of ``candidate_ids`` (0 when no query term matches)."""
+        scores = np.zeros(candidate_ids.size, dtype=np.float64)
+        ids_parts: List[np.ndarray] = []
+        impact_parts: List[np.ndarray] = []
+        for term, weight in query.items():
+            position = bisect.bisect_left(self._terms, term)
+            if position == len(self._terms) or self._terms[position] != term:
+                continue
+            start, end = self._indptr[position], self._indptr[position + 1]
+            ids_parts.append(self._grant_ids[start:end])
+            impact_parts.append(self._impacts[start:end] * weight)
+        if not ids_parts or candidate_ids.size == 0:
+            return scores
+
+        matched, inverse = np.unique(np.concatenate(ids_parts), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(impact_parts))
+        # Map matched grants onto candidate positions without a dense per-catalog array.
+        order = np.argsort(candidate_ids, kind="stable")
+        sorted_candidates = candidate_ids[order]
+        positions = np.searchsorted(sorted_candidates, matched)
+        inside = positions < sorted_candidates.size
+        inside[inside] = sorted_candidates[positions[inside]] == matched[inside]
+        scores[order[positions[inside]]] = totals[inside]
+        return scores
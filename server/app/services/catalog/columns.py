@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence, Tuple, overload
+
+import numpy as np
+
+
+def pack_strings(strings: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode strings as one UTF-8 byte blob plus an offsets array.
+
+    String ``i`` occupies ``blob[offsets[i]:offsets[i + 1]]``; both arrays are
+    plain NumPy columns, so they can be saved and memory-mapped as is.
+    """
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def pack_postings(postings: Iterable[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode lists of ids as CSR ``(indptr, ids)`` arrays."""
+    arrays = [np.asarray(ids, dtype=np.int64) for ids in postings]
+    indptr = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids in arrays], out=indptr[1:])
+    ids = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+    return indptr, ids
+
+
+class StringTable(Sequence[str]):
+    """Read-only view over strings packed by ``pack_strings``; decodes on access."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):  # type: ignore[no-untyped-def]
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.blob[start:end].tobytes().decode("utf-8")
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+import numpy as np
+
+from app.models.schemas import Grant, GrantFilters
+from app.services.catalog.bm25 import BM25Index
+from app.services.catalog.columns import StringTable, pack_postings, pack_strings
+from app.services.catalog.minhash import near_duplicate_clusters
+from app.services.catalog.provinces import (
+    ALL_PROVINCES,
+    NO_PROVINCES,
+    PROVINCES,
+    host_mask,
+    province_bit,
+    region_mask,
+)
+from app.services.catalog.ranking import top_k
+from app.services.catalog.scoring import RelevanceScorer
+
+
+class GrantCatalog:
+    """
+    Immutable, pre-indexed collection of grants.
+
+    Every index is built once at construction so that filtering a search
+    intersects postings lists instead of re-evaluating each grant. Grants are
+    addressed by their position in ``grants``; returning ids in ascending
+    order preserves the source ordering used as the relevance tie-breaker.
+
+    Near-duplicate grants (e.g. mirrored listings of one program) share a
+    cluster label computed once with MinHash/LSH, so searches can collapse
+    them by label lookup instead of comparing results pairwise.
+
+    The indexes are plain NumPy columns, so ``to_arrays``/``from_arrays`` can
+    round-trip a catalog through a memory-mapped snapshot (see
+    ``catalog.snapshot``) without rebuilding anything.
+    """
+
+    def __init__(self, grants: Iterable[Grant]):
+        self.grants: Sequence[Grant] = tuple(grants)
+
+        # Province bitmask per grant, resolved once from its region and host.
+        masks: List[int] = []
+        # Region labels that name no known province still match by exact text.
+        region_postings: Dict[str, List[int]] = defaultdict(list)
+
+        # Deadline and funding columns, sorted for range lookups.
+        undated: List[int] = []
+        unpriced: List[int] = []
+        dated: List[tuple[int, int]] = []
+        priced: List[tuple[int, int]] = []
+
+        # Tag postings keep one entry per tag occurrence so counts match the scorer.
+        self._tag_postings: Dict[str, List[int]] = defaultdict(list)
+
+        for grant_id, grant in enumerate(self.grants):
+            mask = region_mask(grant.region)
+            if mask == NO_PROVINCES:
+                region_postings[(grant.region or "").strip().lower()].append(grant_id)
+            if mask != ALL_PROVINCES:
+                mask |= host_mask(grant.link)
+            masks.append(mask)
+
+            if grant.deadline is None:
+                undated.append(grant_id)
+            else:
+                dated.append((grant.deadline.toordinal(), grant_id))
+
+            ceiling = _funding_ceiling(grant)
+            if ceiling is None:
+                unpriced.append(grant_id)
+            else:
+                priced.append((ceiling, grant_id))
+
+            for tag in grant.tags or []:
+                self._tag_postings[tag.lower()].append(grant_id)
+
+        dated.sort()
+        priced.sort()
+        self._undated = np.asarray(undated, dtype=np.int64)
+        self._unpriced = np.asarray(unpriced, dtype=np.int64)
+        self._deadline_values = np.asarray([value for value, _ in dated], dtype=np.int64)
+        self._deadline_ids = np.asarray([grant_id for _, grant_id in dated], dtype=np.int64)
+        self._amount_values = np.asarray([value for value, _ in priced], dtype=np.int64)
+        self._amount_ids = np.asarray([grant_id for _, grant_id in priced], dtype=np.int64)
+
+        self.province_masks = np.asarray(masks, dtype=np.uint16)
+        self._national_ids = np.flatnonzero(self.province_masks == ALL_PROVINCES)
+        self._province_postings = [
+            np.flatnonzero(self.province_masks & (1 << index)) for index in range(len(PROVINCES))
+        ]
+        self._region_postings = {
+            label: np.asarray(ids, dtype=np.int64) for label, ids in region_postings.items()
+        }
+        self._tag_postings = dict(self._tag_postings)
+        self.scorer = RelevanceScorer(self.grants, self._tag_postings)
+        self.bm25 = BM25Index(self.grants)
+        self.clusters = near_duplicate_clusters(self.grants)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Index columns (everything but the grants themselves) keyed by name."""
+        region_blob, region_offsets = pack_strings(self._region_postings)
+        region_indptr, region_ids = pack_postings(self._region_postings.values())
+        province_indptr, province_ids = pack_postings(self._province_postings)
+        arrays = {
+            "province_masks": self.province_masks,
+            "national_ids": self._national_ids,
+            "province_indptr": province_indptr,
+            "province_ids": province_ids,
+            "region_blob": region_blob,
+            "region_offsets": region_offsets,
+            "region_indptr": region_indptr,
+            "region_ids": region_ids,
+            "undated": self._undated,
+            "unpriced": self._unpriced,
+            "deadline_values": self._deadline_values,
+            "deadline_ids": self._deadline_ids,
+            "amount_values": self._amount_values,
+            "amount_ids": self._amount_ids,
+            "clusters": self.clusters,
+        }
+        arrays.update({f"scorer_{name}": array for name, array in self.scorer.to_arrays().items()})
+        arrays.update({f"bm25_{name}": array for name, array in self.bm25.to_arrays().items()})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, grants: Sequence[Grant], arrays: Mapping[str, np.ndarray]) -> "GrantCatalog":
+        """
+        Reassemble a catalog from ``to_arrays`` output.
+
+        ``grants`` may be any sequence, e.g. one that builds Grant models on
+        access, and the arrays are used as given, so memory-mapped columns
+        stay shared instead of being copied into each process.
+        """
+        catalog = cls.__new__(cls)
+        catalog.grants = grants
+        catalog.province_masks = arrays["province_masks"]
+        catalog._national_ids = arrays["national_ids"]
+        province_indptr = arrays["province_indptr"]
+        catalog._province_postings = [
+            arrays["province_ids"][province_indptr[index] : province_indptr[index + 1]]
+            for index in range(len(PROVINCES))
+        ]
+        region_indptr = arrays["region_indptr"]
+        catalog._region_postings = {
+            label: arrays["region_ids"][region_indptr[index] : region_indptr[index + 1]]
+            for index, label in enumerate(StringTable(arrays["region_blob"], arrays["region_offsets"]))
+        }
+        catalog._undated = arrays["undated"]
+        catalog._unpriced = arrays["unpriced"]
+        catalog._deadline_values = arrays["deadline_values"]
+        catalog._deadline_ids = arrays["deadline_ids"]
+        catalog._amount_values = arrays["amount_values"]
+        catalog._amount_ids = arrays["amount_ids"]
+        catalog.clusters = arrays["clusters"]
+        # Only needed to build a scorer; the compiled scorer state replaces it.
+        catalog._tag_postings = {}
+        catalog.scorer = RelevanceScorer.from_arrays(
+            {name[len("scorer_"):]: array for name, array in arrays.items() if name.startswith("scorer_")}
+        )
+        catalog.bm25 = BM25Index.from_arrays(
+            {name[len("bm25_"):]: array for name, array in arrays.items() if name.startswith("bm25_")}
+        )
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.grants)
+
+    def filter_ids(self, filters: Optional[GrantFilters]) -> List[int]:
+        """
+        Return the ids of grants satisfying ``filters`` in catalog order.
+
+        Grants without a region (or marked National) match every province, a
+        province filter matches any province set in a grant's mask, undated
+        grants pass deadline filters, and grants without amounts pass
+        minimum-amount filters.
+        """
+        # One boolean mask per filter over the id space, ANDed in place: the postings
+        # (memory-mapped in a compiled snapshot) are only used as index arrays.
+        matched: Optional[np.ndarray] = None
+        if filters:
+            masks = []
+            if filters.province:
+                masks.append(self._mask_for_province(filters.province))
+            if filters.deadline_before:
+                masks.append(self._mask_before_deadline(filters.deadline_before))
+            if filters.min_amount is not None:
+                masks.append(self._mask_meeting_min_amount(filters.min_amount))
+            for mask in masks:
+                matched = mask if matched is None else np.logical_and(matched, mask, out=matched)
+
+        if matched is None:
+            return list(range(len(self.grants)))
+        return np.flatnonzero(matched).tolist()
+
+    def filter(self, filters: Optional[GrantFilters]) -> List[Grant]:
+        """Return the grants satisfying ``filters`` in catalog order."""
+        return self.materialize(self.filter_ids(filters))
+
+    def materialize(self, grant_ids: Sequence[int]) -> List[Grant]:
+        """Map grant ids back to Grant models."""
+        return [self.grants[grant_id] for grant_id in grant_ids]
+
+    def sort_by_relevance(
+        self,
+        grant_ids: Sequence[int],
+        sector_tags: Sequence[str],
+        limit: Optional[int] = None,
+        distinct: bool = False,
+    ) -> List[int]:
+        """
+        Order ``grant_ids`` by sector relevance, best matches first.
+
+        Weights: 3 per (sector tag, grant tag) containment pair, 2 per sector tag
+        found in the title or program, and 1 per sector tag found in the summary.
+        Ties keep their incoming order. When ``limit`` is given only the best
+        ``limit`` ids are returned, selected without sorting every candidate.
+        With ``distinct`` only the best grant of each near-duplicate cluster is
+        kept; the top-k selection widens until ``limit`` distinct ids are found.
+        """
+        if not sector_tags or not grant_ids:
+            ids_in_order = list(grant_ids)
+            return self.collapse_near_duplicates(ids_in_order, limit) if distinct else ids_in_order[:limit]
+
+        ids = np.asarray(grant_ids, dtype=np.int64)
+        return self._rank(ids, self.scorer.score(sector_tags)[ids], limit, distinct)
+
+    def sort_by_bm25(
+        self,
+        grant_ids: Sequence[int],
+        query: Mapping[str, float],
+        limit: Optional[int] = None,
+        distinct: bool = False,
+    ) -> List[int]:
+        """
+        Order ``grant_ids`` by BM25F score against weighted ``query`` terms.
+
+        Same contract as ``sort_by_relevance``: ties and unmatched grants keep
+        their incoming order, ``limit`` selects without a full sort, and
+        ``distinct`` keeps one grant per near-duplicate cluster.
+        """
+        if not query or not grant_ids:
+            ids_in_order = list(grant_ids)
+            return self.collapse_near_duplicates(ids_in_order, limit) if distinct else ids_in_order[:limit]
+
+        ids = np.asarray(grant_ids, dtype=np.int64)
+        return self._rank(ids, self.bm25.score(query, ids), limit, distinct)
+
+    def _rank(self, ids: np.ndarray, scores: np.ndarray, limit: Optional[int], distinct: bool) -> List[int]:
+        """Order ``ids`` by descending ``scores`` for the sort_* methods."""
+        if limit is None:
+            # Stable sort on negated scores keeps ties in their incoming order.
+            ranked = ids[np.argsort(-scores, kind="stable")].tolist()
+            return self.collapse_near_duplicates(ranked) if distinct else ranked
+        if not distinct:
+            return top_k(ids, scores, limit)
+
+        # top_k(k) is a prefix of top_k(2k), so widening never reorders results.
+        k = limit
+        while True:
+            ranked = top_k(ids, scores, k)
+            kept = self.collapse_near_duplicates(ranked, limit)
+            if len(kept) >= limit or k >= len(ids):
+                return kept
+            k *= 2
+
+    def collapse_near_duplicates(self, grant_ids: Sequence[int], limit: Optional[int] = None) -> List[int]:
+        """Keep the first id of each near-duplicate cluster, stopping after ``limit`` ids."""
+        kept: List[int] = []
+        seen: Set[int] = set()
+        for grant_id in grant_ids:
+            if limit is not None and len(kept) >= limit:
+                break
+            label = int(self.clusters[grant_id])
+            if label not in seen:
+                seen.add(label)
+                kept.append(grant_id)
+        return kept
+
+    def _mask_for_province(self, province: str) -> np.ndarray:
+        matched = np.zeros(len(self.grants), dtype=bool)
+        bit = province_bit(province)
+        matched[self._province_postings[bit.bit_length() - 1] if bit else self._national_ids] = True
+        region_ids = self._region_postings.get(province.strip().lower())
+        if region_ids is not None:
+            matched[region_ids] = True
+        return matched
+
+    def _mask_before_deadline(self, deadline_before: date) -> np.ndarray:
+        cutoff = int(np.searchsorted(self._deadline_values, deadline_before.toordinal(), side="left"))
+        matched = np.zeros(len(self.grants), dtype=bool)
+        matched[self._undated] = True
+        matched[self._deadline_ids[:cutoff]] = True
+        return matched
+
+    def _mask_meeting_min_amount(self, min_amount: int) -> np.ndarray:
+        start = int(np.searchsorted(self._amount_values, min_amount, side="left"))
+        matched = np.zeros(len(self.grants), dtype=bool)
+        matched[self._unpriced] = True
+        matched[self._amount_ids[start:]] = True
+        return matched
+
+
+def _funding_ceiling(grant: Grant) -> Optional[int]:
+    """Largest advertised amount, or None when the grant lists no amounts."""
+    available_amounts = [amt for amt in (grant.amount_max, grant.amount_min) if isinstance(amt, int)]
+    if not available_amounts:
+        return None
+    return max(available_amounts)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional
+
+from pydantic import ValidationError
+
+from app.models.schemas import Grant
+from app.services.catalog.index import GrantCatalog
+from app.services.catalog.snapshot import MANIFEST_NAME, open_snapshot, write_snapshot
+from app.services.parsing.dedup import dedupe_grants
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogSnapshot:
+    """One immutable version of the catalog file and the index built from it."""
+
+    catalog: GrantCatalog
+    # sha256 of the source JSON; also used to version search cache keys.
+    version: str
+    mtime_ns: int
+    size: int
+    # Validated grants keyed by the digest of their source record; empty for process-built versions.
+    records: Dict[str, Grant] = field(repr=False)
+    # Digests of every source record, used to report reload diffs.
+    record_keys: FrozenSet[str] = field(default=frozenset(), repr=False)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogDiff:
+    """Record counts of a reload."""
+
+    added: int
+    removed: int
+    unchanged: int
+
+
+class CatalogLoader:
+    """
+    Keep an indexed ``GrantCatalog`` in sync with a JSON file on disk.
+
+    ``path`` may also be a compiled snapshot directory (see
+    ``catalog.snapshot``); its manifest is watched instead and a new version
+    is memory-mapped rather than parsed.
+
+    ``current()`` returns the latest snapshot without touching the file, so
+    searches never wait on a reload. ``refresh()`` stats the file and only
+    reads it when the mtime or size moved, and only rebuilds when the content
+    hash changed. Records linking to the same canonical URL are merged.
+
+    The first version is built in this process, reusing nothing. When
+    ``build_directory`` is set, later versions are compiled into it as a
+    snapshot by a worker process and memory-mapped once written, so
+    building the postings, BM25 statistics and MinHash clusters never holds
+    this process's GIL while searches run. Without it, each new version is
+    built here, and only added or edited records are validated again. The
+    new snapshot replaces the old one with a single reference assignment,
+    so in-flight searches finish against the version they started with.
+    """
+
+    def __init__(self, path: Path, build_directory: Optional[Path] = None):
+        self.path = path
+        self.build_directory = build_directory
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> CatalogSnapshot:
+        """Return the active snapshot, loading the file on first use."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh()
+            snapshot = self._snapshot
+            assert snapshot is not None
+        return snapshot
+
+    def refresh(self) -> Optional[CatalogDiff]:
+        """
+        Reload the file if it changed since the active snapshot.
+
+        Returns:
+            The applied diff, or None when the catalog was already current.
+
+        Raises:
+            FileNotFoundError: If no snapshot exists yet and the file is missing.
+            ValueError: If the first load finds invalid JSON or grant records.
+        """
+        with self._lock:
+            previous = self._snapshot
+            compiled = self.path.is_dir()
+            watched = self.path / MANIFEST_NAME if compiled else self.path
+            try:
+                stat = watched.stat()
+            except FileNotFoundError:
+                if previous is None:
+                    raise FileNotFoundError(
+                        f"Could not find mock grants data at {self.path}. "
+                        "Add the sample file or switch to live mode."
+                    ) from None
+                logger.warning("Catalog file %s disappeared; keeping the current snapshot.", self.path)
+                return None
+
+            if previous is not None and (stat.st_mtime_ns, stat.st_size) == (previous.mtime_ns, previous.size):
+                return None
+
+            content = watched.read_bytes()
+            version = _manifest_version(content) if compiled else hashlib.sha256(content).hexdigest()
+            if previous is not None and version == previous.version:
+                # Touched but not edited: remember the new mtime and keep the index.
+                self._snapshot = CatalogSnapshot(
+                    catalog=previous.catalog,
+                    version=version,
+                    mtime_ns=stat.st_mtime_ns,
+                    size=stat.st_size,
+                    records=previous.records,
+                    record_keys=previous.record_keys,
+                )
+                return None
+
+            started = time.perf_counter()
+            try:
+                if compiled:
+                    snapshot, diff = self._open_compiled(stat.st_mtime_ns, stat.st_size, previous)
+                elif previous is not None and self.build_directory is not None:
+                    snapshot, diff = self._build_in_worker(content, version, stat.st_mtime_ns, stat.st_size, previous)
+                else:
+                    snapshot, diff = self._build(content, version, stat.st_mtime_ns, stat.st_size, previous)
+            except (OSError, ValueError, BrokenProcessPool):
+                if previous is None:
+                    raise
+                logger.exception("Ignoring invalid catalog update in %s.", self.path)
+                return None
+
+            self._snapshot = snapshot
+            logger.info(
+                "Loaded grant catalog %s in %.2f s: %d added, %d removed, %d unchanged.",
+                snapshot.version[:12],
+                time.perf_counter() - started,
+                diff.added,
+                diff.removed,
+                diff.unchanged,
+            )
+            return diff
+
+    async def watch(self, interval_seconds: float) -> None:
+        """Poll the file every ``interval_seconds``; reloads run off the event loop."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception("Failed to refresh grant catalog from %s.", self.path)
+
+    def _open_compiled(
+        self, mtime_ns: int, size: int, previous: Optional[CatalogSnapshot]
+    ) -> tuple[CatalogSnapshot, CatalogDiff]:
+        catalog, version = open_snapshot(self.path)
+        snapshot = CatalogSnapshot(catalog=catalog, version=version, mtime_ns=mtime_ns, size=size, records={})
+        removed = len(previous.catalog) if previous is not None else 0
+        return snapshot, CatalogDiff(added=len(catalog), removed=removed, unchanged=0)
+
+    def _build_in_worker(
+        self, content: bytes, version: str, mtime_ns: int, size: int, previous: CatalogSnapshot
+    ) -> tuple[CatalogSnapshot, CatalogDiff]:
+        assert self.build_directory is not None
+        # Spawned rather than forked: this process runs the event loop and other threads.
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            keys = executor.submit(_compile_catalog, content, self.build_directory, version).result()
+        catalog, _ = open_snapshot(self.build_directory)
+        _prune_versions(self.build_directory, keep={version, previous.version})
+
+        snapshot = CatalogSnapshot(
+            catalog=catalog, version=version, mtime_ns=mtime_ns, size=size, records={}, record_keys=keys
+        )
+        known = previous.record_keys
+        return snapshot, CatalogDiff(
+            added=len(keys - known), removed=len(known - keys), unchanged=len(keys & known)
+        )
+
+    @staticmethod
+    def _build(
+        content: bytes,
+        version: str,
+        mtime_ns: int,
+        size: int,
+        previous: Optional[CatalogSnapshot],
+    ) -> tuple[CatalogSnapshot, CatalogDiff]:
+        raw_items = json.loads(content)
+        if not isinstance(raw_items, list):
+            raise ValueError("Catalog file must contain a JSON array of grants.")
+
+        known = previous.records if previous is not None else {}
+        records: Dict[str, Grant] = {}
+        grants = []
+        added = unchanged = 0
+        for item in raw_items:
+            key = _record_key(item)
+            grant = records.get(key) or known.get(key)
+            if grant is None:
+                # pydantic.ValidationError subclasses ValueError.
+                grant = Grant.model_validate(item)
+                added += 1
+            elif key not in records:
+                unchanged += 1
+            records[key] = grant
+            grants.append(grant)
+
+        removed = sum(1 for key in known if key not in records)
+        snapshot = CatalogSnapshot(
+            catalog=GrantCatalog(dedupe_grants(grants)),
+            version=version,
+            mtime_ns=mtime_ns,
+            size=size,
+            records=records,
+            record_keys=frozenset(records),
+        )
+        return snapshot, CatalogDiff(added=added, removed=removed, unchanged=unchanged)
+
+
+def _compile_catalog(content: bytes, directory: Path, version: str) -> FrozenSet[str]:
+    """Worker process entry point: write ``content`` as snapshot ``version`` and return its record keys."""
+    try:
+        raw_items = json.loads(content)
+        if not isinstance(raw_items, list):
+            raise ValueError("Catalog file must contain a JSON array of grants.")
+        write_snapshot(dedupe_grants(Grant.model_validate(item) for item in raw_items), directory, version)
+    except (ValidationError, json.JSONDecodeError) as exc:
+        # Re-raised as a plain ValueError so it pickles back to the loader.
+        raise ValueError(str(exc)) from None
+    return frozenset(_record_key(item) for item in raw_items)
+
+
+def _prune_versions(directory: Path, keep: set[str]) -> None:
+    """Delete snapshot versions other than ``keep``; mapped files stay readable until unmapped."""
+    for entry in directory.iterdir():
+        if entry.is_dir() and not entry.name.startswith(".") and entry.name not in keep:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _record_key(item: Any) -> str:
+    canonical = json.dumps(item, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _manifest_version(content: bytes) -> str:
+    try:
+        return str(json.loads(content).get("version", ""))
+    except (ValueError, AttributeError):
+        return ""
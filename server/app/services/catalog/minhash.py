@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import itertools
+import string
+import zlib
+from typing import Dict, Sequence
+
+import numpy as np
+
+from app.models.schemas import Grant
+
+NUM_PERMUTATIONS = 64
+# 8 bands of 8 rows put the LSH candidate threshold near a Jaccard of 0.77.
+BANDS = 8
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+# Estimated Jaccard similarity above which two grants count as near-duplicates.
+NEAR_DUPLICATE_THRESHOLD = 0.8
+SHINGLE_WORDS = 3
+
+_PUNCTUATION = str.maketrans({char: " " for char in string.punctuation})
+# Signature row of a grant with no text; such grants are never clustered.
+_EMPTY = np.iinfo(np.uint32).max
+# Grants hashed per block, bounding the (permutations x shingles) scratch array.
+_BLOCK = 512
+
+# Odd multipliers for combining word hashes into a shingle hash.
+_SHINGLE_MULTIPLIERS = np.asarray(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64
+)[:SHINGLE_WORDS]
+# Hash family h(x) = a * x + b (mod 2**32) followed by an xorshift; odd ``a``
+# makes each a permutation of 32-bit shingle hashes. Fixed seeds keep
+# signatures identical across processes.
+_SEEDS = np.random.default_rng(0x6772616E74).integers(
+    0, 2**32, size=(2, NUM_PERMUTATIONS, 1), dtype=np.uint32
+)
+_MULTIPLIERS = _SEEDS[0] | np.uint32(1)
+_OFFSETS = _SEEDS[1]
+
+
+def grant_text(grant: Grant) -> str:
+    """Text a grant is compared on: title, summary and eligibility."""
+    return " ".join(part for part in (grant.title, grant.summary, grant.eligibility) if part)
+
+
+def signatures(texts: Sequence[str]) -> np.ndarray:
+    """
+    Return a ``(len(texts), NUM_PERMUTATIONS)`` uint32 MinHash signature matrix.
+
+    Texts are shingled into runs of ``SHINGLE_WORDS`` words (one run of all
+    words for shorter texts). Words are hashed once with CRC32; shingle
+    hashes, every permutation and the per-text minimum are then computed for
+    a block of texts at a time with NumPy.
+    """
+    result = np.full((len(texts), NUM_PERMUTATIONS), _EMPTY, dtype=np.uint32)
+    for start in range(0, len(texts), _BLOCK):
+        words = [text.lower().translate(_PUNCTUATION).split() for text in texts[start : start + _BLOCK]]
+        counts = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        if not counts.any():
+            continue
+        word_hashes = np.fromiter(
+            map(zlib.crc32, map(str.encode, itertools.chain.from_iterable(words))),
+            dtype=np.uint64,
+            count=int(counts.sum()),
+        )
+        text_ids, shingles = _shingles(word_hashes, counts)
+        present, first = np.unique(text_ids, return_index=True)
+        hashed = _MULTIPLIERS * shingles[None, :]
+        hashed += _OFFSETS
+        hashed ^= hashed >> np.uint32(15)
+        result[start + present] = np.minimum.reduceat(hashed, first, axis=1).T
+    return result
+
+
+def _shingles(word_hashes: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Text id and 32-bit hash of every shingle over the words of consecutive texts."""
+    size = word_hashes.size
+    text_ids = np.repeat(np.arange(counts.size), counts)
+    combined = word_hashes * _SHINGLE_MULTIPLIERS[0]
+    # A shingle starting at word i is valid when all its words belong to the same text.
+    valid = np.ones(size, dtype=bool)
+    for offset in range(1, SHINGLE_WORDS):
+        same_text = np.zeros(size, dtype=bool)
+        same_text[: size - offset] = text_ids[offset:] == text_ids[: size - offset]
+        following = np.zeros(size, dtype=np.uint64)
+        following[: size - offset] = word_hashes[offset:] * _SHINGLE_MULTIPLIERS[offset]
+        combined ^= np.where(same_text, following, np.uint64(0))
+        valid &= same_text
+    # Texts shorter than a shingle keep the one run starting at their first word.
+    starts = np.cumsum(counts) - counts
+    short = (counts > 0) & (counts < SHINGLE_WORDS)
+    valid[starts[short]] = True
+    return text_ids[valid], (combined[valid] >> np.uint64(32)).astype(np.uint32)
+
+
+def cluster_ids(matrix: np.ndarray, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> np.ndarray:
+    """
+    Label each row with the smallest row id of its near-duplicate cluster.
+
+    Rows are bucketed per band on their exact band values (LSH), so only rows
+    sharing a bucket are compared, and each is compared with the first row of
+    its bucket rather than with every member. Pairs whose estimated Jaccard
+    similarity reaches ``threshold`` are joined with a union-find. Rows
+    without text label themselves.
+    """
+    labels = np.arange(len(matrix), dtype=np.int64)
+    candidates = np.flatnonzero((matrix != _EMPTY).any(axis=1))
+    if candidates.size < 2:
+        return labels
+
+    parent: Dict[int, int] = {}
+
+    def find(node: int) -> int:
+        while parent.get(node, node) != node:
+            grandparent = parent.get(parent[node], parent[node])
+            parent[node] = grandparent
+            node = grandparent
+        return node
+
+    for band in range(BANDS):
+        keys = np.ascontiguousarray(matrix[candidates, band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND])
+        # One opaque void value per row, so np.unique buckets rows without a lexsort.
+        rows = keys.view(np.dtype((np.void, keys.dtype.itemsize * ROWS_PER_BAND))).reshape(-1)
+        _, bucket = np.unique(rows, return_inverse=True)
+        order = np.argsort(bucket, kind="stable")
+        sorted_buckets = bucket[order]
+        members = candidates[order]
+        leaders = members[np.searchsorted(sorted_buckets, sorted_buckets, side="left")]
+        pairs = np.flatnonzero(leaders != members)
+        if pairs.size == 0:
+            continue
+        similarity = (matrix[leaders[pairs]] == matrix[members[pairs]]).mean(axis=1)
+        accepted = pairs[similarity >= threshold]
+        for leader, member in zip(leaders[accepted].tolist(), members[accepted].tolist()):
+            root_a, root_b = find(leader), find(member)
+            if root_a != root_b:
+                # The smaller id becomes the root, so labels name the earliest grant.
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    for node in parent:
+        labels[node] = find(node)
+    return labels
+
+
+def near_duplicate_clusters(grants: Sequence[Grant]) -> np.ndarray:
+    """Cluster label per grant; grants sharing a label are near-duplicates."""
+    return cluster_ids(signatures([grant_text(grant) for grant in grants]))
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+@dataclass(frozen=True, slots=True)
+class Province:
+    """A Canadian province or territory and the official hosts that identify it."""
+
+    code: str
+    name: str
+    hosts: Tuple[str, ...]
+    aliases: Tuple[str, ...] = ()
+
+
+# Order is significant: a province's position is its bit in a ProvinceMask.
+PROVINCES: Tuple[Province, ...] = (
+    Province("ab", "alberta", ("alberta.ca",)),
+    Province("bc", "british columbia", ("gov.bc.ca",)),
+    Province("mb", "manitoba", ("gov.mb.ca",)),
+    Province("nb", "new brunswick", ("gnb.ca",)),
+    Province("nl", "newfoundland and labrador", ("gov.nl.ca",), ("newfoundland",)),
+    Province("ns", "nova scotia", ("novascotia.ca", "gov.ns.ca")),
+    Province("nt", "northwest territories", ("gov.nt.ca",), ("nwt",)),
+    Province("nu", "nunavut", ("gov.nu.ca",)),
+    Province("on", "ontario", ("ontario.ca",)),
+    Province("pe", "prince edward island", ("princeedwardisland.ca",), ("pei",)),
+    Province("qc", "quebec", ("quebec.ca",), ("québec",)),
+    Province("sk", "saskatchewan", ("gov.sk.ca", "saskatchewan.ca")),
+    Province("yt", "yukon", ("yukon.ca", "gov.yk.ca")),
+)
+
+ProvinceMask = int
+
+NO_PROVINCES: ProvinceMask = 0
+ALL_PROVINCES: ProvinceMask = (1 << len(PROVINCES)) - 1
+
+_PROVINCE_BITS: Dict[str, ProvinceMask] = {
+    label: 1 << index
+    for index, province in enumerate(PROVINCES)
+    for label in (province.code, province.name, *province.aliases)
+}
+_HOST_BITS: Dict[str, ProvinceMask] = {
+    host: 1 << index for index, province in enumerate(PROVINCES) for host in province.hosts
+}
+
+# Longest names first so "newfoundland and labrador" wins over "newfoundland".
+_NAME_PATTERN = re.compile(
+    r"\b("
+    + "|".join(re.escape(label) for label in sorted(_PROVINCE_BITS, key=len, reverse=True) if len(label) > 2)
+    + r")\b"
+)
+_CODE_SPLIT = re.compile(r"[\s,;/&+()]+")
+# Inside longer text a two-letter code only counts as an upper-case token: "AB/SK"
+# lists provinces, while "on", "ns" or "pe" are far more often ordinary words.
+_CODE_TOKEN = re.compile(r"[A-Z]{2}")
+
+
+def province_bit(value: Optional[str]) -> ProvinceMask:
+    """Resolve a province code, name or alias (any case) to its bit, or 0 when unknown."""
+    if not value:
+        return NO_PROVINCES
+    return _PROVINCE_BITS.get(value.strip().lower(), NO_PROVINCES)
+
+
+def canonical_province(value: Optional[str]) -> Optional[str]:
+    """Return the two-letter code for a known province, else the trimmed lower-cased value."""
+    if not value or not value.strip():
+        return None
+    bit = province_bit(value)
+    if bit:
+        return PROVINCES[bit.bit_length() - 1].code
+    return value.strip().lower()
+
+
+def region_mask(region: Optional[str]) -> ProvinceMask:
+    """
+    Resolve a free-text region into a province mask.
+
+    Missing regions and "National" cover every province. Regions listing several
+    provinces ("Alberta, Saskatchewan", "AB/SK") set one bit per province. A
+    region that is just a code matches in any case, but within longer text
+    codes must be upper-case ("Programs based on PEI" is not Ontario).
+    """
+    original = (region or "").strip()
+    text = original.lower()
+    if not text or text == "national":
+        return ALL_PROVINCES
+
+    mask = _PROVINCE_BITS.get(text, NO_PROVINCES)
+    if mask:
+        return mask
+    for match in _NAME_PATTERN.finditer(text):
+        mask |= _PROVINCE_BITS[match.group(1)]
+    for piece in _CODE_SPLIT.split(original):
+        if _CODE_TOKEN.fullmatch(piece):
+            mask |= _PROVINCE_BITS.get(piece.lower(), NO_PROVINCES)
+    return mask
+
+
+def host_mask(link: object) -> ProvinceMask:
+    """Infer a province from an official provincial host in ``link``."""
+    try:
+        host = (urlparse(str(link)).hostname or "").lower()
+    except Exception:
+        return NO_PROVINCES
+
+    mask = NO_PROVINCES
+    for official_host, bit in _HOST_BITS.items():
+        if host == official_host or host.endswith("." + official_host):
+            mask |= bit
+    return mask
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import heapq
+from typing import List
+
+import numpy as np
+
+
+def top_k(candidate_ids: np.ndarray, scores: np.ndarray, k: int) -> List[int]:
+    """
+    Return the ``k`` best candidates, best first, with ties kept in candidate order.
+
+    Equivalent to a stable descending sort followed by ``[:k]``, in
+    O(m log k) for the m candidates with a positive score. Relevance scores are
+    never negative, so a zero-score candidate can only enter the top k once
+    every positively scored candidate has been placed; those are appended in
+    candidate order and the scan stops as soon as ``k`` slots are filled.
+
+    Args:
+        candidate_ids: Grant ids in tie-break order.
+        scores: Score of each candidate, aligned with ``candidate_ids``.
+        k: Number of results to keep.
+    """
+    if k <= 0 or candidate_ids.size == 0:
+        return []
+
+    positive = np.flatnonzero(scores > 0).tolist()
+    # Bounded heap keyed on (score, earlier position wins).
+    best = heapq.nlargest(k, positive, key=lambda position: (scores[position], -position))
+
+    remaining = k - len(best)
+    if remaining > 0:
+        zero_scored = np.flatnonzero(scores <= 0)[:remaining]
+        best.extend(zero_scored.tolist())
+
+    return candidate_ids[best].tolist()
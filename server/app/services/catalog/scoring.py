@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from app.models.schemas import Grant
+from app.services.catalog.columns import StringTable, pack_strings
+
+TAG_WEIGHT = 3
+TITLE_WEIGHT = 2
+PROGRAM_WEIGHT = 2
+SUMMARY_WEIGHT = 1
+
+# Text fields in the order RelevanceScorer indexes them.
+_FIELD_NAMES = ("title", "summary", "program")
+_FIELD_WEIGHTS = (TITLE_WEIGHT, SUMMARY_WEIGHT, PROGRAM_WEIGHT)
+
+# Vocabulary tokens are joined with a whitespace separator; query terms searched
+# against the joined vocabulary never contain whitespace, so matches stay inside
+# a single token. The blob is UTF-8 bytes so a memory-mapped snapshot can be
+# searched in place; UTF-8 never matches across character boundaries.
+_VOCAB_SEPARATOR = b"\n"
+
+
+class _FieldPostings:
+    """Token -> grant postings for one lower-cased text field, stored as CSR arrays."""
+
+    def __init__(self, texts: Sequence[str], vocabulary: Dict[str, int]):
+        self.texts = texts
+        self.non_empty = np.fromiter((bool(text) for text in texts), dtype=bool, count=len(texts))
+
+        token_ids: List[int] = []
+        grant_ids: List[int] = []
+        for grant_id, text in enumerate(texts):
+            for token in set(text.split()):
+                token_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                grant_ids.append(grant_id)
+
+        tokens = np.asarray(token_ids, dtype=np.int64)
+        order = np.argsort(tokens, kind="stable")
+        self.grant_ids = np.asarray(grant_ids, dtype=np.int64)[order]
+        self._sorted_tokens = tokens[order]
+
+    def finalize(self, vocabulary_size: int) -> None:
+        """Build the token offsets once the shared vocabulary is complete."""
+        self.indptr = np.searchsorted(self._sorted_tokens, np.arange(vocabulary_size + 1))
+        del self._sorted_tokens
+
+    def to_arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        text_blob, text_offsets = pack_strings(self.texts)
+        return {
+            f"{prefix}_text_blob": text_blob,
+            f"{prefix}_text_offsets": text_offsets,
+            f"{prefix}_non_empty": self.non_empty,
+            f"{prefix}_grant_ids": self.grant_ids,
+            f"{prefix}_indptr": self.indptr,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray], prefix: str) -> "_FieldPostings":
+        field = cls.__new__(cls)
+        field.texts = StringTable(arrays[f"{prefix}_text_blob"], arrays[f"{prefix}_text_offsets"])
+        field.non_empty = arrays[f"{prefix}_non_empty"]
+        field.grant_ids = arrays[f"{prefix}_grant_ids"]
+        field.indptr = arrays[f"{prefix}_indptr"]
+        return field
+
+    def grants_with_tokens(self, token_ids: np.ndarray) -> np.ndarray:
+        """Concatenate the postings of ``token_ids``; a grant may appear more than once."""
+        if token_ids.size == 0:
+            return np.empty(0, dtype=np.int64)
+        starts = self.indptr[token_ids]
+        lengths = self.indptr[token_ids + 1] - starts
+        # Expand each [start, end) range into positions without a Python loop.
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return self.grant_ids[positions]
+
+
+class RelevanceScorer:
+    """
+    Precomputed term matrices for sector-relevance scoring.
+
+    Title, summary and program are lower-cased and tokenized once at catalog
+    load into token -> grant postings. A sector tag without whitespace occurs in
+    a text exactly when it is a substring of one of the text's tokens, so a
+    query only needs to find matching vocabulary tokens and gather their
+    postings. Tags containing whitespace use the postings of their longest
+    piece as candidates and are verified against the stored text. Per-grant
+    scores are accumulated with NumPy and match the original weights:
+    3 per (sector tag, grant tag) containment pair, 2 for title or program,
+    1 for summary.
+    """
+
+    def __init__(self, grants: Sequence[Grant], tag_postings: Mapping[str, Sequence[int]]):
+        self.size = len(grants)
+
+        # Grant tags: one COO entry per tag occurrence, so repeated tags count twice.
+        self._tag_vocabulary: List[str] = list(tag_postings)
+        self._tag_entry_terms = np.concatenate(
+            [np.full(len(ids), term, dtype=np.int64) for term, ids in enumerate(tag_postings.values())]
+            or [np.empty(0, dtype=np.int64)]
+        )
+        self._tag_entry_grants = np.concatenate(
+            [np.asarray(ids, dtype=np.int64) for ids in tag_postings.values()]
+            or [np.empty(0, dtype=np.int64)]
+        )
+
+        vocabulary: Dict[str, int] = {}
+        self._fields = [
+            (TITLE_WEIGHT, _FieldPostings([(grant.title or "").lower() for grant in grants], vocabulary)),
+            (SUMMARY_WEIGHT, _FieldPostings([(grant.summary or "").lower() for grant in grants], vocabulary)),
+            (PROGRAM_WEIGHT, _FieldPostings([(grant.program or "").lower() for grant in grants], vocabulary)),
+        ]
+        for _, field in self._fields:
+            field.finalize(len(vocabulary))
+
+        tokens = [token.encode("utf-8") for token in sorted(vocabulary, key=vocabulary.__getitem__)]
+        self._vocabulary_blob: bytes | np.ndarray = _VOCAB_SEPARATOR.join(tokens)
+        self._token_offsets = np.cumsum([0] + [len(token) + 1 for token in tokens[:-1]], dtype=np.int64)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Scoring state as flat NumPy columns for a compiled catalog snapshot."""
+        tag_blob, tag_offsets = pack_strings(self._tag_vocabulary)
+        arrays = {
+            "size": np.asarray([self.size], dtype=np.int64),
+            "tag_vocabulary_blob": tag_blob,
+            "tag_vocabulary_offsets": tag_offsets,
+            "tag_entry_terms": self._tag_entry_terms,
+            "tag_entry_grants": self._tag_entry_grants,
+            "vocabulary_blob": np.frombuffer(self._vocabulary_blob, dtype=np.uint8),
+            "token_offsets": self._token_offsets,
+        }
+        for name, (_, field) in zip(_FIELD_NAMES, self._fields):
+            arrays.update(field.to_arrays(name))
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> "RelevanceScorer":
+        """Rebuild a scorer from ``to_arrays`` output without copying the columns."""
+        scorer = cls.__new__(cls)
+        scorer.size = int(arrays["size"][0])
+        scorer._tag_vocabulary = list(
+            StringTable(arrays["tag_vocabulary_blob"], arrays["tag_vocabulary_offsets"])
+        )
+        scorer._tag_entry_terms = arrays["tag_entry_terms"]
+        scorer._tag_entry_grants = arrays["tag_entry_grants"]
+        scorer._fields = [
+            (weight, _FieldPostings.from_arrays(arrays, name))
+            for name, weight in zip(_FIELD_NAMES, _FIELD_WEIGHTS)
+        ]
+        scorer._vocabulary_blob = arrays["vocabulary_blob"]
+        scorer._token_offsets = arrays["token_offsets"]
+        return scorer
+
+    def score(self, sector_tags: Sequence[str]) -> np.ndarray:
+        """Return an int64 array with the relevance score of every grant."""
+        scores = np.zeros(self.size, dtype=np.int64)
+        sector_tags_lower = [tag.lower() for tag in sector_tags]
+        if not sector_tags_lower or self.size == 0:
+            return scores
+
+        term_weights = np.zeros(len(self._tag_vocabulary), dtype=np.int64)
+        for sector_tag in sector_tags_lower:
+            for term, grant_tag in enumerate(self._tag_vocabulary):
+                if sector_tag in grant_tag or grant_tag in sector_tag:
+                    term_weights[term] += TAG_WEIGHT
+        if term_weights.any():
+            scores += np.bincount(
+                self._tag_entry_grants,
+                weights=term_weights[self._tag_entry_terms],
+                minlength=self.size,
+            ).astype(np.int64)
+
+        for sector_tag in sector_tags_lower:
+            token_ids = self._tokens_containing(sector_tag)
+            for weight, field in self._fields:
+                matched = self._field_matches(field, sector_tag, token_ids)
+                scores += weight * matched
+
+        return scores
+
+    def _field_matches(self, field: _FieldPostings, sector_tag: str, token_ids: np.ndarray) -> np.ndarray:
+        """Boolean mask of grants whose field text contains ``sector_tag``."""
+        if not sector_tag:
+            # The empty string is contained in every non-empty text.
+            return field.non_empty
+
+        matched = np.zeros(self.size, dtype=bool)
+        matched[field.grants_with_tokens(token_ids)] = True
+        if sector_tag.split() == [sector_tag]:
+            return matched
+
+        # Whitespace inside the tag: postings only give candidates.
+        candidates = np.flatnonzero(matched) if sector_tag.strip() else np.flatnonzero(field.non_empty)
+        verified = np.zeros(self.size, dtype=bool)
+        for grant_id in candidates:
+            if sector_tag in field.texts[grant_id]:
+                verified[grant_id] = True
+        return verified
+
+    def _tokens_containing(self, sector_tag: str) -> np.ndarray:
+        """Vocabulary ids of tokens containing the tag (or its longest piece)."""
+        pieces = sector_tag.split()
+        if not pieces:
+            return np.empty(0, dtype=np.int64)
+        needle = max(pieces, key=len)
+        pattern = re.escape(needle.encode("utf-8"))
+        starts = [match.start() for match in re.finditer(pattern, self._vocabulary_blob)]
+        if not starts:
+            return np.empty(0, dtype=np.int64)
+        token_ids = np.searchsorted(self._token_offsets, np.asarray(starts, dtype=np.int64), side="right") - 1
+        return np.unique(token_ids)
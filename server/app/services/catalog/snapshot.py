@@ -0,0 +1,206 @@
+"""
+Compiled, memory-mapped catalog snapshots.
+
+A snapshot is a directory holding ``manifest.json`` and one subdirectory of
+``.npy`` columns per catalog version::
+
+    snapshot/
+        manifest.json          {"format": 3, "version": "<sha256>", ...}
+        <sha256>/title.npy ...
+
+Grant fields are stored column-wise: dates and amounts as fixed-width
+integers, strings as ids into one interned string table, and lists as CSR
+offsets. The catalog indexes are stored alongside, so opening a snapshot
+only maps files; pages are shared by every worker mapping the same version,
+and ``Grant`` models are built only for the ids a search materializes.
+
+Build a snapshot with::
+
+    python -m app.services.catalog.snapshot app/data/samples/grants_sample.json .cache/catalog
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.models.schemas import Grant
+from app.services.catalog.columns import StringTable, pack_postings, pack_strings
+from app.services.catalog.index import GrantCatalog
+from app.services.parsing.dedup import dedupe_grants
+
+SNAPSHOT_FORMAT = 3
+MANIFEST_NAME = "manifest.json"
+
+_STRING_FIELDS = ("title", "link", "summary", "eligibility", "currency", "sponsor", "program", "region")
+_INTEGER_FIELDS = ("amount_min", "amount_max")
+_LIST_FIELDS = ("tags", "source_citations")
+# Marks a missing string id, integer or date ordinal.
+_MISSING_ID = -1
+_MISSING_VALUE = np.iinfo(np.int64).min
+
+
+def encode_grants(grants: Sequence[Grant]) -> Dict[str, np.ndarray]:
+    """Encode grants as fixed-width columns over one interned string table."""
+    interned: Dict[str, int] = {}
+
+    def intern(value: Any) -> int:
+        if value is None:
+            return _MISSING_ID
+        return interned.setdefault(str(value), len(interned))
+
+    columns: Dict[str, np.ndarray] = {}
+    for name in _STRING_FIELDS:
+        columns[name] = np.fromiter(
+            (intern(getattr(grant, name)) for grant in grants), dtype=np.int32, count=len(grants)
+        )
+    for name in _INTEGER_FIELDS:
+        columns[name] = np.fromiter(
+            (_MISSING_VALUE if getattr(grant, name) is None else getattr(grant, name) for grant in grants),
+            dtype=np.int64,
+            count=len(grants),
+        )
+    columns["deadline"] = np.fromiter(
+        (_MISSING_VALUE if grant.deadline is None else grant.deadline.toordinal() for grant in grants),
+        dtype=np.int64,
+        count=len(grants),
+    )
+    for name in _LIST_FIELDS:
+        values = [getattr(grant, name) for grant in grants]
+        indptr, ids = pack_postings([intern(item) for item in value or ()] for value in values)
+        columns[f"{name}_present"] = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+        columns[f"{name}_indptr"] = indptr
+        columns[f"{name}_ids"] = ids
+
+    columns["strings_blob"], columns["strings_offsets"] = pack_strings(interned)
+    return columns
+
+
+class StoredGrants(Sequence[Grant]):
+    """Sequence view over encoded grant columns that builds a ``Grant`` per access."""
+
+    def __init__(self, columns: Mapping[str, np.ndarray]):
+        self._columns = columns
+        self._strings = StringTable(columns["strings_blob"], columns["strings_offsets"])
+
+    def __len__(self) -> int:
+        return len(self._columns["title"])
+
+    def __getitem__(self, index):  # type: ignore[no-untyped-def]
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        columns = self._columns
+        record: Dict[str, Any] = {}
+        for name in _STRING_FIELDS:
+            string_id = int(columns[name][index])
+            record[name] = None if string_id == _MISSING_ID else self._strings[string_id]
+        for name in _INTEGER_FIELDS:
+            value = int(columns[name][index])
+            record[name] = None if value == _MISSING_VALUE else value
+        ordinal = int(columns["deadline"][index])
+        record["deadline"] = None if ordinal == _MISSING_VALUE else date.fromordinal(ordinal)
+        for name in _LIST_FIELDS:
+            if not columns[f"{name}_present"][index]:
+                record[name] = None
+                continue
+            indptr = columns[f"{name}_indptr"]
+            ids = columns[f"{name}_ids"][indptr[index] : indptr[index + 1]]
+            record[name] = [self._strings[int(string_id)] for string_id in ids]
+        return Grant.model_validate(record)
+
+
+def write_snapshot(grants: Sequence[Grant], directory: Path, version: str) -> None:
+    """
+    Index ``grants`` and publish them as snapshot ``version`` under ``directory``.
+
+    Columns are written to a fresh subdirectory and the manifest is replaced
+    atomically last, so processes that mapped an earlier version keep
+    reading consistent files.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    columns_dir = directory / version
+    catalog = GrantCatalog(grants)
+    arrays = {f"grant_{name}": array for name, array in encode_grants(catalog.grants).items()}
+    arrays.update(catalog.to_arrays())
+
+    if not columns_dir.exists():
+        staging = directory / f".{version}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+        staging.rename(columns_dir)
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "count": len(catalog),
+        "columns": sorted(arrays),
+    }
+    pending = directory / f"{MANIFEST_NAME}.tmp"
+    pending.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(pending, directory / MANIFEST_NAME)
+
+
+def open_snapshot(directory: Path) -> tuple[GrantCatalog, str]:
+    """
+    Memory-map the snapshot version named by ``directory``'s manifest.
+
+    Returns:
+        The catalog and its version.
+
+    Raises:
+        FileNotFoundError: If the manifest or one of its columns is missing.
+        ValueError: If the manifest has an unsupported format.
+    """
+    manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported catalog snapshot format: {manifest.get('format')!r}")
+
+    version = manifest["version"]
+    columns_dir = directory / version
+    arrays = {
+        name: np.load(columns_dir / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+        for name in manifest["columns"]
+    }
+    grant_columns = {
+        name[len("grant_"):]: array for name, array in arrays.items() if name.startswith("grant_")
+    }
+    index_columns = {name: array for name, array in arrays.items() if not name.startswith("grant_")}
+    return GrantCatalog.from_arrays(StoredGrants(grant_columns), index_columns), version
+
+
+def compile_snapshot(source: Path, directory: Path) -> str:
+    """Validate and de-duplicate a JSON grants file, write it as a snapshot, and return the version."""
+    content = source.read_bytes()
+    version = hashlib.sha256(content).hexdigest()
+    grants = dedupe_grants(Grant.model_validate(item) for item in json.loads(content))
+    write_snapshot(grants, directory, version)
+    return version
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile a grants JSON file into a catalog snapshot.")
+    parser.add_argument("source", type=Path, help="JSON array of grant records")
+    parser.add_argument("directory", type=Path, help="snapshot directory to publish into")
+    args = parser.parse_args(argv)
+
+    version = compile_snapshot(args.source, args.directory)
+    print(f"Published catalog snapshot {version} to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
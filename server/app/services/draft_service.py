@@ -7,10 +7,10 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 import google.generativeai as genai
-import httpx
 from pypdf import PdfReader
 
 from app.core.config import settings
+from app.core.http_clients import get_http_clients
 
 
 class DraftGenerationError(RuntimeError):
@@ -25,11 +25,10 @@ class DraftGenerationResult:
 
 
 async def _download_pdf(pdf_url: str) -> bytes:
-    timeout = settings.http_timeout_seconds
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(pdf_url)
-        response.raise_for_status()
-        return response.content
+    client = get_http_clients().get("downloads")
+    response = await client.get(pdf_url, timeout=settings.http_timeout_seconds)
+    response.raise_for_status()
+    return response.content
 
 
 def _extract_pdf_text(pdf_bytes: bytes, max_chars: int = 15000) -> str:
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import Settings
+from app.services.grant_finder_service import (
+    ALBERTA_PROGRAM_SEEDS,
+    APPLY_TERMS,
+    get_catalog_loader,
+)
+from app.services.parsing.enrichment import enrich_grant
+from app.services.parsing.grants_parser import parse_grants_by_key
+from app.services.parsing.urls import canonical_url
+from app.services.perplexity_client import PerplexityClient, partition_queries
+
+logger = logging.getLogger(__name__)
+
+# Results requested per crawl query (the Search API maximum).
+CRAWL_MAX_RESULTS = 20
+# Pages no crawl has returned for this long drop out of the published catalog.
+CRAWL_RETENTION_SECONDS = 30 * 86_400
+# Result fields whose change means the page changed.
+_FINGERPRINT_FIELDS = ("title", "snippet", "text", "date", "last_updated")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    grant_json TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class CrawlStats:
+    fetched: int
+    added: int
+    changed: int
+    unchanged: int
+    failed_batches: int
+    published: bool
+
+
+class CrawlStore:
+    """
+    On-disk crawl state: one row per canonical page URL.
+
+    Each row holds the page's content fingerprint and, when the page parsed
+    into a grant, that grant's JSON, so unchanged pages are never parsed or
+    validated again. Kept in SQLite so it survives restarts.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+
+    def fingerprints(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Return the stored fingerprint of each known URL in ``urls``."""
+        wanted = list(urls)
+        found: Dict[str, str] = {}
+        with self._connect() as connection:
+            # Stay well under SQLite's bound-parameter limit.
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start : start + 500]
+                rows = connection.execute(
+                    f"SELECT url, fingerprint FROM pages WHERE url IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def upsert(self, pages: Sequence[Tuple[str, str, Optional[str]]], now: float) -> None:
+        """Store ``(url, fingerprint, grant_json)`` rows, keeping each page's first-seen time."""
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO pages (url, fingerprint, grant_json, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                "grant_json = excluded.grant_json, last_seen = excluded.last_seen",
+                [(url, fingerprint, grant_json, now, now) for url, fingerprint, grant_json in pages],
+            )
+
+    def touch(self, urls: Iterable[str], now: float) -> None:
+        """Mark unchanged pages as seen by this crawl."""
+        with self._connect() as connection:
+            connection.executemany("UPDATE pages SET last_seen = ? WHERE url = ?", [(now, url) for url in urls])
+
+    def grant_documents(self, seen_since: float) -> List[str]:
+        """Grant JSON of pages seen since ``seen_since``, oldest pages first."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT grant_json FROM pages WHERE grant_json IS NOT NULL AND last_seen >= ? "
+                "ORDER BY first_seen, rowid",
+                (seen_since,),
+            ).fetchall()
+        return [grant_json for (grant_json,) in rows]
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=5)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+class GrantCrawler:
+    """
+    Background worker that keeps a local grant catalog in sync with Perplexity.
+
+    Each crawl runs the Alberta program seeds used by live search plus the
+    configured ``crawl_seed_queries`` and fingerprints every returned page.
+    Only new or changed pages are parsed and enriched with the deadline and
+    amounts found in their text; the grants are upserted into the crawl
+    store and published as a catalog JSON file that live searches read
+    through a ``CatalogLoader``, whose indexes filter on those columns.
+    External calls therefore scale with the crawl schedule rather than with
+    user traffic.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        store: Optional[CrawlStore] = None,
+        client: Optional[PerplexityClient] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.settings = settings
+        self.catalog_path = Path(settings.crawl_catalog_path)
+        self.store = store if store is not None else CrawlStore(Path(settings.crawl_state_path))
+        self.client = client
+        self._clock = clock
+
+    def seed_batches(self) -> List[Tuple[List[str], Optional[List[str]]]]:
+        """Crawl queries grouped per Search API call, each with its domain filter."""
+        alberta = [f"{seed} {APPLY_TERMS}" for seed in ALBERTA_PROGRAM_SEEDS]
+        batches: List[Tuple[List[str], Optional[List[str]]]] = [
+            (batch, ["alberta.ca"]) for batch in partition_queries(alberta)
+        ]
+        batches.extend((batch, None) for batch in partition_queries(self.settings.crawl_seed_queries))
+        return batches
+
+    async def run(self, interval_seconds: float) -> None:
+        """Crawl immediately and then every ``interval_seconds`` until cancelled."""
+        while True:
+            try:
+                stats = await self.crawl_once()
+                logger.info(
+                    "Grant crawl: %d pages, %d new, %d changed, %d unchanged, %d failed batches.",
+                    stats.fetched,
+                    stats.added,
+                    stats.changed,
+                    stats.unchanged,
+                    stats.failed_batches,
+                )
+            except Exception:
+                logger.exception("Grant crawl failed.")
+            await asyncio.sleep(interval_seconds)
+
+    async def crawl_once(self) -> CrawlStats:
+        """Fetch every seed batch, then apply and publish the changes."""
+        # The crawler is what keeps pages fresh, so it bypasses the response store.
+        client = self.client or PerplexityClient(self.settings.model_copy(update={"perplexity_cache_path": None}))
+        batches = self.seed_batches()
+        pages: Dict[str, Dict[str, Any]] = {}
+        failures = 0
+        for queries, domain_filter in batches:
+            try:
+                # Full responses, not streamed projections: enrichment reads the page text.
+                response = await client.search(
+                    query=queries,
+                    max_results=CRAWL_MAX_RESULTS,
+                    search_domain_filter=domain_filter,
+                    max_tokens_per_page=2048,
+                )
+            except Exception as exc:
+                logger.warning("Crawl batch %s failed: %s", queries, exc)
+                failures += 1
+                continue
+            for item in response.get("results") or []:
+                url = (item.get("url") or item.get("link")) if isinstance(item, dict) else None
+                if url:
+                    pages.setdefault(canonical_url(str(url)), item)
+
+        if batches and failures == len(batches):
+            # Nothing was fetched; leave the catalog and every last-seen time alone.
+            return CrawlStats(0, 0, 0, 0, failures, published=False)
+        return await asyncio.to_thread(self._apply, pages, failures)
+
+    def _apply(self, pages: Dict[str, Dict[str, Any]], failures: int) -> CrawlStats:
+        now = self._clock()
+        known = self.store.fingerprints(pages)
+        fingerprints = {url: _fingerprint(item) for url, item in pages.items()}
+        changed = [url for url in pages if known.get(url) != fingerprints[url]]
+
+        # Keyed by page URL as fetched: validation percent-encodes Grant.link.
+        grants_by_url = parse_grants_by_key({url: pages[url] for url in changed})
+        today = date.fromtimestamp(now)
+        for url, grant in grants_by_url.items():
+            # Runs once per new or changed page, so searches filter on stored columns.
+            grants_by_url[url] = enrich_grant(grant, _page_text(pages[url]), today)
+        self.store.upsert(
+            [
+                (
+                    url,
+                    fingerprints[url],
+                    grants_by_url[url].model_dump_json() if url in grants_by_url else None,
+                )
+                for url in changed
+            ],
+            now,
+        )
+        changed_urls = set(changed)
+        self.store.touch((url for url in pages if url not in changed_urls), now)
+
+        added = sum(1 for url in changed if url not in known)
+        return CrawlStats(
+            fetched=len(pages),
+            added=added,
+            changed=len(changed) - added,
+            unchanged=len(pages) - len(changed),
+            failed_batches=failures,
+            published=self._publish(now - CRAWL_RETENTION_SECONDS),
+        )
+
+    def _publish(self, seen_since: float) -> bool:
+        """Write the catalog file if its content changed and reload it; True when written."""
+        content = ("[" + ",".join(self.store.grant_documents(seen_since)) + "]").encode("utf-8")
+        if self.catalog_path.exists() and self.catalog_path.read_bytes() == content:
+            return False
+
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        pending = self.catalog_path.with_name(f"{self.catalog_path.name}.tmp")
+        pending.write_bytes(content)
+        os.replace(pending, self.catalog_path)
+        # Swap the new catalog in now rather than on the next watcher poll.
+        get_catalog_loader(self.settings.crawl_catalog_path).refresh()
+        return True
+
+
+def _page_text(item: Dict[str, Any]) -> str:
+    return "\n".join(str(item.get(name) or "") for name in ("title", "snippet", "text"))
+
+
+def _fingerprint(item: Dict[str, Any]) -> str:
+    content = {name: item.get(name) for name in _FINGERPRINT_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
@@ -1,16 +1,46 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
-from datetime import date
+import logging
+from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional
-from urllib.parse import urlparse
-
-from app.core.config import Settings
-from app.models.schemas import Grant, GrantFilters, OrganizationInfo
-from app.services.parsing.grants_parser import parse_grants_from_search
-from app.services.perplexity_client import PerplexityClient
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Union
+
+from app.core.config import Settings, settings
+from app.models.schemas import Grant, GrantFilters, GrantsSearchFrame, OrganizationInfo
+from app.services.caching.singleflight import SingleFlight
+from app.services.caching.ttl_cache import TTLCache
+from app.services.catalog.bm25 import build_query
+from app.services.catalog.index import GrantCatalog
+from app.services.catalog.loader import CatalogLoader
+from app.services.catalog.provinces import canonical_province
+from app.services.parsing.enrichment import enrich_grants
+from app.services.parsing.grants_parser import parse_grants_from_results, parse_grants_from_search
+from app.services.parsing.urls import canonical_url
+from app.services.perplexity_client import PerplexityClient, partition_queries
+
+logger = logging.getLogger(__name__)
+
+# Shared by every service instance so concurrent requests coalesce.
+search_flights: SingleFlight[tuple[Grant, ...]] = SingleFlight()
+
+APPLY_TERMS = '("apply" OR "application" OR "how to apply" OR "application form" OR "apply now")'
+
+# Alberta program sub-pages targeted directly to avoid generic hub pages.
+ALBERTA_PROGRAM_SEEDS: List[str] = [
+    # CFEP program pages
+    "site:alberta.ca/community-facility-enhancement-program-small",
+    "site:alberta.ca/community-facility-enhancement-program-large",
+    # CIP program pages
+    "site:alberta.ca/cip-project-based-grant",
+    "site:alberta.ca/cip-operating-grant",
+    # Cultural Heritage and Other Initiatives
+    "site:alberta.ca/cultural-heritage-initiatives-program",
+    "site:alberta.ca/other-initiatives-program",
+]
 
 SAMPLES_PATH = (
     Path(__file__).resolve().parent.parent / "data" / "samples" / "grants_sample.json"
@@ -20,8 +50,17 @@ SAMPLES_PATH = (
 class GrantFinderService:
     """Orchestrates grant discovery across mock and live Perplexity-backed modes."""
 
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        cache: Optional[TTLCache[str, tuple[Grant, ...]]] = None,
+    ):
         self.settings = settings
+        self.cache = cache if cache is not None else get_search_cache(
+            settings.search_cache_max_entries, settings.search_cache_ttl_seconds
+        )
+        # "hit", "miss" or "coalesced" for the most recent find_grants call; surfaced as a response header.
+        self.last_cache_status: Optional[str] = None
 
     async def find_grants(
         self, organization: OrganizationInfo, filters: Optional[GrantFilters] = None
@@ -29,23 +68,167 @@ class GrantFinderService:
         """
         Entry point used by the router.
 
+        Results are cached per normalized profile and filters. Entries expire
+        after the configured TTL or at the earliest deadline among the cached
+        grants, whichever comes first. Concurrent identical searches share one
+        in-flight lookup.
+
         Args:
             organization: Profile of the nonprofit we are assisting.
             filters: Optional numeric and geographic constraints.
         """
+        cache_key = self._cache_key(organization, filters)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.last_cache_status = "hit"
+            return list(cached)
+
+        # Identical searches already running are awaited instead of repeated.
+        self.last_cache_status = "coalesced" if cache_key in search_flights else "miss"
+        grants = await search_flights.do(
+            cache_key, lambda: self._find_and_cache(cache_key, organization, filters)
+        )
+        return list(grants)
+
+    async def stream_grants(
+        self, organization: OrganizationInfo, filters: Optional[GrantFilters] = None
+    ) -> AsyncIterator[GrantsSearchFrame]:
+        """
+        Yield provisionally ranked results as each source batch lands, then a final frame.
+
+        Cached searches and mock mode yield only the final frame. In live mode a
+        provisional frame follows every successful Perplexity batch, ranked over
+        everything received so far. The final frame carries the same results
+        find_grants would return and is written to the result cache.
+        """
+        cache_key = self._cache_key(organization, filters)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.last_cache_status = "hit"
+            yield self._frame("final", cached)
+            return
+
+        self.last_cache_status = "miss"
+        if self.settings.is_mock_mode:
+            grants = self._find_grants_mock(organization, filters)
+        elif self._local_catalog_loader() is not None:
+            grants = await self._find_grants_live(organization, filters)
+        else:
+            grants = []
+            async for grants in self._stream_grants_live(organization, filters):
+                yield self._frame("provisional", grants)
+
+        results = tuple(grants)
+        self.cache.set(cache_key, results, ttl_seconds=_seconds_until_earliest_deadline(results))
+        yield self._frame("final", results)
+
+    async def _stream_grants_live(
+        self, organization: OrganizationInfo, filters: Optional[GrantFilters]
+    ) -> AsyncIterator[List[Grant]]:
+        """
+        Yield the ranked grants found so far each time a Perplexity batch completes.
+
+        Batches finish in any order, but every frame merges the completed
+        batches in query order, so the last frame matches what
+        ``_iter_search_batches`` gives find_grants for the same search.
+        """
+        client = PerplexityClient(self.settings)
+        max_results = filters.max_results if filters and filters.max_results else 10
+        queries = self._build_multi_queries_for_alberta(organization, filters, max_results)
+        batches = partition_queries(queries)
+
+        async def collect(index: int, batch: List[str]) -> tuple[int, List[Any]]:
+            results = client.iter_results(
+                query=batch,
+                max_results=max_results,
+                search_domain_filter=["alberta.ca"],
+                max_tokens_per_page=2048,
+            )
+            return index, [item async for item in results]
+
+        tasks = [asyncio.ensure_future(collect(index, batch)) for index, batch in enumerate(batches)]
+        completed: List[Optional[List[Any]]] = [None] * len(batches)
+        failures: List[BaseException] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    index, items = await next_done
+                except Exception as exc:
+                    logger.warning("Perplexity batch failed while streaming: %s", exc)
+                    failures.append(exc)
+                    continue
+                completed[index] = items
+                merged: List[Dict[str, Any]] = []
+                seen_urls: set[str] = set()
+                for batch_items in completed:
+                    if batch_items is not None:
+                        _merge_search_results({"results": batch_items}, merged, seen_urls)
+                grants = enrich_grants(parse_grants_from_search({"results": merged}))
+                yield self._apply_filters(grants, filters, organization, limit=max_results)
+        finally:
+            # Stop outstanding batches when the client disconnects mid-stream.
+            for task in tasks:
+                task.cancel()
+
+        if tasks and len(failures) == len(tasks):
+            raise failures[0]
+
+    def _frame(self, frame_type: str, grants: Iterable[Grant]) -> GrantsSearchFrame:
+        results = list(grants)
+        return GrantsSearchFrame(
+            type=frame_type,
+            mode=self.settings.mode,
+            count=len(results),
+            results=results,
+            generated_at=datetime.utcnow(),
+        )
+
+    def _cache_key(self, organization: OrganizationInfo, filters: Optional[GrantFilters]) -> str:
+        loader = self._local_catalog_loader()
+        catalog_version = loader.current().version if loader is not None else None
+        return _search_cache_key(
+            self.settings.mode,
+            organization,
+            filters,
+            catalog_version,
+            self.settings.search_ranker,
+            self.settings.search_collapse_near_duplicates,
+        )
+
+    def _local_catalog_loader(self) -> Optional[CatalogLoader]:
+        """
+        Loader of the on-disk catalog searches are answered from, if any.
+
+        Mock mode reads the mock catalog. Live mode reads the catalog kept by
+        the background crawler once one has been published, and otherwise
+        calls Perplexity for every search.
+        """
         if self.settings.is_mock_mode:
-            return self._find_grants_mock(organization, filters)
+            return get_catalog_loader(self.settings.mock_catalog_path)
+        if self.settings.crawl_interval_seconds > 0 and Path(self.settings.crawl_catalog_path).exists():
+            return get_catalog_loader(self.settings.crawl_catalog_path)
+        return None
+
+    async def _find_and_cache(
+        self, cache_key: str, organization: OrganizationInfo, filters: Optional[GrantFilters]
+    ) -> tuple[Grant, ...]:
+        if self.settings.is_mock_mode:
+            grants = self._find_grants_mock(organization, filters)
+        else:
+            grants = await self._find_grants_live(organization, filters)
 
-        return await self._find_grants_live(organization, filters)
+        results = tuple(grants)
+        self.cache.set(cache_key, results, ttl_seconds=_seconds_until_earliest_deadline(results))
+        return results
 
     def _find_grants_mock(
         self, organization: OrganizationInfo, filters: Optional[GrantFilters]
     ) -> list[Grant]:
         """Return mock data stored on disk for quick iteration."""
-        grants = list(_load_mock_grants())
-        
+        catalog = _load_mock_catalog(self.settings.mock_catalog_path)
+
         print(f"\n=== MOCK MODE GRANT MATCHING ===")
-        print(f"Total grants loaded: {len(grants)}")
+        print(f"Total grants loaded: {len(catalog)}")
         print(f"Organization profile:")
         print(f"  - Legal name: {organization.legal_name}")
         print(f"  - Structure: {organization.org_structure}")
@@ -59,74 +242,120 @@ class GrantFinderService:
         else:
             print(f"  - No filters applied")
         
-        grants = self._apply_filters(grants, filters, organization)
-        
-        print(f"After filtering: {len(grants)} grants")
+        max_results = filters.max_results if filters and filters.max_results else 10
+        grants = self._apply_filters(catalog, filters, organization, limit=max_results)
+
+        print(f"Top matches: {len(grants)} grants")
         for i, grant in enumerate(grants[:5]):
             print(f"  {i+1}. {grant.title} (tags: {grant.tags})")
         print(f"=================================\n")
 
-        max_results = filters.max_results if filters and filters.max_results else 10
-        return grants[:max_results]
+        return grants
 
     async def _find_grants_live(
         self, organization: OrganizationInfo, filters: Optional[GrantFilters]
     ) -> List[Grant]:
         """
         Call the Perplexity Search API and map the results to our schema.
+
+        When the background crawler maintains a local catalog, searches are
+        answered from it instead and never wait on Perplexity.
         """
-        client = PerplexityClient(self.settings)
         max_results = filters.max_results if filters and filters.max_results else 10
+        loader = self._local_catalog_loader()
+        if loader is not None:
+            return self._apply_filters(loader.current().catalog, filters, organization, limit=max_results)
+
+        client = PerplexityClient(self.settings)
         # Prefer multi-query to target specific Alberta program pages and avoid hubs
         queries = self._build_multi_queries_for_alberta(organization, filters, max_results)
         domain_filter = ["alberta.ca"]
-        response = await client.search(
-            query=queries,
-            max_results=max_results,
-            search_domain_filter=domain_filter,
-            max_tokens_per_page=2048,
+        # Results stream into the parser as each batch's response body downloads.
+        grants = await parse_grants_from_results(
+            self._iter_search_batches(
+                client,
+                queries,
+                max_results=max_results,
+                search_domain_filter=domain_filter,
+                max_tokens_per_page=2048,
+            )
         )
-        print("Perplexity search response:", response)
-        grants = parse_grants_from_search(response)
-        grants = self._apply_filters(grants, filters, organization)
+        print(f"Perplexity search returned {len(grants)} candidate grants")
+        # Deadline and amount filters need the columns the crawler would otherwise fill.
+        grants = enrich_grants(grants)
+        return self._apply_filters(grants, filters, organization, limit=max_results)
 
-        return grants[:max_results]
+    async def _iter_search_batches(
+        self,
+        client: PerplexityClient,
+        queries: List[str],
+        **search_kwargs: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run ``queries`` as concurrent Perplexity calls that respect the per-call query limit.
+
+        Every batch streams concurrently, but results are yielded in query
+        order (later batches buffer until earlier ones finish) and are
+        de-duplicated by canonical URL. A failing batch is logged and
+        skipped; the first error is re-raised only when every batch fails.
+        """
+        batches = partition_queries(queries)
+        queues: List[asyncio.Queue[Any]] = [asyncio.Queue() for _ in batches]
+
+        async def drain(batch: List[str], queue: asyncio.Queue[Any]) -> None:
+            try:
+                async for item in client.iter_results(query=batch, **search_kwargs):
+                    queue.put_nowait(item)
+            finally:
+                queue.put_nowait(_BATCH_DONE)
+
+        tasks = [asyncio.ensure_future(drain(batch, queue)) for batch, queue in zip(batches, queues)]
+        seen_urls: set[str] = set()
+        failures: List[BaseException] = []
+        try:
+            for batch, queue, task in zip(batches, queues, tasks):
+                while (item := await queue.get()) is not _BATCH_DONE:
+                    if _is_new_result(item, seen_urls):
+                        yield item
+                try:
+                    await task
+                except Exception as exc:
+                    logger.warning("Perplexity batch %s failed: %s", batch, exc)
+                    failures.append(exc)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if failures and len(failures) == len(tasks):
+            raise failures[0]
 
     def _apply_filters(
         self,
-        grants: Iterable[Grant],
+        grants: Union[GrantCatalog, Iterable[Grant]],
         filters: Optional[GrantFilters],
         organization: OrganizationInfo,
+        limit: Optional[int] = None,
     ) -> list[Grant]:
         """
         Apply filtering based on filters and organization profile.
         Matches grants to organization's sector and location.
+
+        Accepts a prebuilt GrantCatalog (mock mode) or a plain iterable of
+        grants, which is indexed on the fly (live mode). When ``limit`` is set
+        only the top ``limit`` matches are ranked and returned.
         """
-        filtered: list[Grant] = []
-        for grant in grants:
-            # Apply geographic filters
-            if filters and filters.province and not _matches_province(grant, filters.province):
-                continue
-
-            # Apply deadline filters
-            if filters and filters.deadline_before and not _before_deadline(
-                grant, filters.deadline_before
-            ):
-                continue
-
-            # Apply minimum amount filters
-            if filters and filters.min_amount is not None and not _meets_min_amount(
-                grant, filters.min_amount
-            ):
-                continue
-
-            filtered.append(grant)
-
-        # Sort by relevance to organization's sector (best matches first)
-        if organization.sector_tags:
-            filtered = _sort_by_sector_relevance(filtered, organization.sector_tags)
+        catalog = grants if isinstance(grants, GrantCatalog) else GrantCatalog(grants)
+        grant_ids = catalog.filter_ids(filters)
+
+        # Sort by relevance to the organization (best matches first),
+        # keeping one grant per near-duplicate cluster unless that is turned off.
+        distinct = self.settings.search_collapse_near_duplicates
+        if self.settings.search_ranker == "bm25":
+            grant_ids = _sort_by_bm25(catalog, grant_ids, organization, limit, distinct)
+        else:
+            grant_ids = _sort_by_sector_relevance(catalog, grant_ids, organization.sector_tags, limit, distinct)
 
-        return filtered
+        return catalog.materialize(grant_ids[:limit])
 
     def _build_search_query(
         self,
@@ -197,24 +426,9 @@ class GrantFinderService:
             else (filters.province if filters else None)
         )
 
-        apply_terms = '("apply" OR "application" OR "how to apply" OR "application form" OR "apply now")'
-        common_suffix = f'{apply_terms}'
-
-        seeds: List[str] = [
-            # CFEP program pages
-            "site:alberta.ca/community-facility-enhancement-program-small",
-            "site:alberta.ca/community-facility-enhancement-program-large",
-            # CIP program pages
-            "site:alberta.ca/cip-project-based-grant",
-            "site:alberta.ca/cip-operating-grant",
-            # Cultural Heritage and Other Initiatives
-            "site:alberta.ca/cultural-heritage-initiatives-program",
-            "site:alberta.ca/other-initiatives-program",
-        ]
-
         queries: List[str] = []
-        for base in seeds:
-            parts: List[str] = [base, common_suffix]
+        for base in ALBERTA_PROGRAM_SEEDS:
+            parts: List[str] = [base, APPLY_TERMS]
             if organization.sector_tags:
                 parts.append(" ".join(organization.sector_tags))
             # Province hint (should already be Alberta, but include if provided)
@@ -223,159 +437,146 @@ class GrantFinderService:
             # Keep it concise; NAICS or legal name can be too specific and miss pages
             queries.append(" ".join(p for p in parts if p))
 
-        # Perplexity API has a hard limit of 5 queries maximum
-        # Return at most 5 queries (we have 6 program seeds)
-        return queries[:5]
+        # Perplexity accepts at most 5 queries per call; _iter_search_batches splits them.
+        return queries
 
 
-@lru_cache(maxsize=1)
-def _load_mock_grants() -> tuple[Grant, ...]:
-    """Load and cache mock grants from JSON."""
-    if not SAMPLES_PATH.exists():
-        raise FileNotFoundError(
-            f"Could not find mock grants data at {SAMPLES_PATH}. "
-            "Add the sample file or switch to live mode."
-        )
+# Marks the end of one batch's results on its queue.
+_BATCH_DONE = object()
 
-    with SAMPLES_PATH.open("r", encoding="utf-8") as file:
-        raw_data = json.load(file)
 
-    return tuple(Grant.model_validate(item) for item in raw_data)
+def _merge_search_results(
+    response: Dict[str, Any], merged: List[Dict[str, Any]], seen_urls: set[str]
+) -> None:
+    """Append a response's results to ``merged``, skipping URLs already seen."""
+    merged.extend(item for item in response.get("results") or [] if _is_new_result(item, seen_urls))
 
 
-def _matches_province(grant: Grant, province: str) -> bool:
-    """
-    Return True if the grant appears applicable to the requested province.
-    - Treat missing region or 'National' as applicable everywhere.
-    - Consider common province code/name aliases (e.g., 'AB' <-> 'Alberta').
-    - If the source link is on an official provincial domain (e.g., alberta.ca),
-      infer the province from the domain.
-    """
-    if not province:
+def _is_new_result(item: Any, seen_urls: set[str]) -> bool:
+    """Record ``item``'s canonical URL; False when an earlier result had the same one."""
+    url = (item.get("url") or item.get("link")) if isinstance(item, dict) else None
+    if not url:
         return True
+    key = canonical_url(str(url))
+    if key in seen_urls:
+        return False
+    seen_urls.add(key)
+    return True
 
-    if not grant.region or (isinstance(grant.region, str) and grant.region.strip().lower() == "national"):
-        return True
 
-    province_aliases = {
-        "ab": "alberta",
-        "bc": "british columbia",
-        "mb": "manitoba",
-        "nb": "new brunswick",
-        "nl": "newfoundland and labrador",
-        "ns": "nova scotia",
-        "nt": "northwest territories",
-        "nu": "nunavut",
-        "on": "ontario",
-        "pe": "prince edward island",
-        "qc": "quebec",
-        "sk": "saskatchewan",
-        "yt": "yukon",
+@lru_cache(maxsize=1)
+def get_search_cache(max_entries: int, ttl_seconds: int) -> TTLCache[str, tuple[Grant, ...]]:
+    """Process-wide search result cache shared by every GrantFinderService."""
+    return TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+
+def _search_cache_key(
+    mode: str,
+    organization: OrganizationInfo,
+    filters: Optional[GrantFilters],
+    catalog_version: Optional[str] = None,
+    ranker: str = "sector",
+    distinct: bool = True,
+) -> str:
+    """
+    Hash the parts of a search that affect its results.
+
+    Sector tags are lower-cased and sorted (relevance scores are order
+    independent), provinces are reduced to their two-letter code, and missing
+    filters are treated like the default GrantFilters. ``catalog_version``
+    ties mock results to the catalog they were computed from, so an edited
+    catalog is never answered from stale cache entries. The BM25 ranker also
+    reads the organization's names, so they are part of its keys.
+    """
+    filters = filters or GrantFilters()
+    province = organization.address.province if organization.address else None
+    payload = {
+        "mode": mode,
+        "catalog_version": catalog_version,
+        "ranker": ranker,
+        "distinct": distinct,
+        "names": (
+            [(name or "").strip().lower() for name in (organization.legal_name, organization.operating_name)]
+            if ranker == "bm25"
+            else None
+        ),
+        "sector_tags": sorted(tag.lower() for tag in organization.sector_tags or []),
+        "province": canonical_province(province),
+        "naics_code": (organization.naics_code or "").strip() or None,
+        "filters": {
+            **filters.model_dump(mode="json"),
+            "province": canonical_province(filters.province),
+        },
     }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
 
-    requested = province.strip().lower()
-    requested_name = province_aliases.get(requested, requested)
 
-    region = (grant.region or "").strip().lower()
-    if region == requested or region == requested_name:
-        return True
-
-    # Infer province via domain when possible
-    try:
-        host = urlparse(str(grant.link)).hostname or ""
-    except Exception:
-        host = ""
-    host = host.lower()
-    if requested in ("ab", "alberta") and "alberta.ca" in host:
-        return True
-    if requested in ("on", "ontario") and ("ontario.ca" in host):
-        return True
-    if requested in ("bc", "british columbia") and ("gov.bc.ca" in host):
-        return True
-    if requested in ("mb", "manitoba") and ("gov.mb.ca" in host):
-        return True
-    if requested in ("sk", "saskatchewan") and ("gov.sk.ca" in host):
-        return True
-    if requested in ("ns", "nova scotia") and ("novascotia.ca" in host or "gov.ns.ca" in host):
-        return True
-    if requested in ("nl", "newfoundland and labrador") and ("gov.nl.ca" in host):
-        return True
-    if requested in ("qc", "quebec") and ("quebec.ca" in host):
-        return True
-    if requested in ("pe", "prince edward island") and ("princeedwardisland.ca" in host):
-        return True
-    if requested in ("yt", "yukon") and ("gov.yk.ca" in host):
-        return True
-    if requested in ("nt", "northwest territories") and ("gov.nt.ca" in host):
-        return True
-    if requested in ("nu", "nunavut") and ("gov.nu.ca" in host):
-        return True
-
-    return False
+def _seconds_until_earliest_deadline(grants: Iterable[Grant]) -> Optional[float]:
+    """
+    Seconds until the earliest upcoming grant deadline starts, or None when none is upcoming.
 
+    Deadlines already passed are ignored: they cannot change the results any
+    more, and a non-positive TTL would keep the result set out of the cache.
+    """
+    now = datetime.now()
+    remaining = [
+        (datetime.combine(grant.deadline, datetime.min.time()) - now).total_seconds()
+        for grant in grants
+        if grant.deadline is not None
+    ]
+    upcoming = [seconds for seconds in remaining if seconds > 0]
+    return min(upcoming) if upcoming else None
+
+
+@lru_cache(maxsize=None)
+def get_catalog_loader(path: Optional[str] = None) -> CatalogLoader:
+    """
+    Process-wide loader for a local grant catalog.
 
-def _before_deadline(grant: Grant, deadline_before: date) -> bool:
-    """True if the grant deadline is earlier than the cutoff."""
-    if grant.deadline is None:
-        return True
-    return grant.deadline < deadline_before
+    ``path`` is a grants JSON file or a compiled snapshot directory; the
+    bundled sample file (the mock catalog) is used when it is not set.
+    Reloads of a JSON file are compiled under ``CATALOG_BUILD_PATH``.
+    """
+    source = Path(path) if path else SAMPLES_PATH
+    build_root = settings.catalog_build_path
+    return CatalogLoader(source, build_directory=Path(build_root) / source.stem if build_root else None)
 
 
-def _meets_min_amount(grant: Grant, min_amount: int) -> bool:
-    """True if the grant offers at least the desired minimum funding."""
-    amount_fields = [grant.amount_max, grant.amount_min]
-    available_amounts = [amt for amt in amount_fields if isinstance(amt, int)]
-    if not available_amounts:
-        return True
-    return max(available_amounts) >= min_amount
+def _load_mock_catalog(path: Optional[str] = None) -> GrantCatalog:
+    """Return the current indexed mock catalog, loading it on first use."""
+    return get_catalog_loader(path).current().catalog
 
 
-def _sort_by_sector_relevance(grants: list[Grant], sector_tags: list[str]) -> list[Grant]:
+def _sort_by_sector_relevance(
+    catalog: GrantCatalog,
+    grant_ids: Sequence[int],
+    sector_tags: list[str],
+    limit: Optional[int] = None,
+    distinct: bool = True,
+) -> list[int]:
     """
     Sort grants by relevance to organization's sector tags.
-    Grants with matching tags appear first.
+    Grants with matching tags appear first; ``limit`` keeps only the top matches.
+    With ``distinct``, near-duplicates of a higher-ranked grant are dropped.
     """
-    if not sector_tags:
-        return grants
-    
-    sector_tags_lower = [tag.lower() for tag in sector_tags]
-    
-    def relevance_score(grant: Grant) -> int:
-        """Calculate relevance score based on matching sectors/tags."""
-        score = 0
-        
-        # Check grant tags
-        if grant.tags:
-            grant_tags_lower = [tag.lower() for tag in grant.tags]
-            for sector_tag in sector_tags_lower:
-                for grant_tag in grant_tags_lower:
-                    if sector_tag in grant_tag or grant_tag in sector_tag:
-                        score += 3
-        
-        # Check grant title
-        if grant.title:
-            title_lower = grant.title.lower()
-            for sector_tag in sector_tags_lower:
-                if sector_tag in title_lower:
-                    score += 2
-        
-        # Check grant summary
-        if grant.summary:
-            summary_lower = grant.summary.lower()
-            for sector_tag in sector_tags_lower:
-                if sector_tag in summary_lower:
-                    score += 1
-        
-        # Check grant program
-        if grant.program:
-            program_lower = grant.program.lower()
-            for sector_tag in sector_tags_lower:
-                if sector_tag in program_lower:
-                    score += 2
-        
-        return score
-    
-    # Sort by relevance score (descending)
-    return sorted(grants, key=relevance_score, reverse=True)
+    return catalog.sort_by_relevance(grant_ids, sector_tags or [], limit, distinct=distinct)
 
 
+def _sort_by_bm25(
+    catalog: GrantCatalog,
+    grant_ids: Sequence[int],
+    organization: OrganizationInfo,
+    limit: Optional[int] = None,
+    distinct: bool = True,
+) -> list[int]:
+    """
+    Rank grants with BM25F against the organization's sector tags, NAICS
+    sector and names; the alternative to ``_sort_by_sector_relevance``.
+    """
+    query = build_query(
+        organization.sector_tags or [],
+        organization.naics_code,
+        (organization.legal_name, organization.operating_name),
+    )
+    return catalog.sort_by_bm25(grant_ids, query, limit, distinct=distinct)
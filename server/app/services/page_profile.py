@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+from app.core.config import Settings
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Request, Response
+
+logger = logging.getLogger(__name__)
+
+
+# File extensions that identify each blockable resource type by URL alone.
+RESOURCE_TYPE_EXTENSIONS: Dict[str, Tuple[str, ...]] = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "media": ("mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a", "mov"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "stylesheet": ("css",),
+}
+# Failure Chromium reports for a request matched by Network.setBlockedURLs.
+BLOCKED_FAILURE = "net::ERR_BLOCKED_BY_CLIENT"
+
+
+@dataclass(frozen=True, slots=True)
+class PageProfile:
+    """
+    What a PDF-discovery page loads and when navigation counts as done.
+
+    Requests of ``blocked_resource_types`` (recognised by file extension,
+    see ``RESOURCE_TYPE_EXTENSIONS``) or to ``blocked_hosts`` (and their
+    subdomains) are blocked; ``wait_until`` is the load state ``page.goto``
+    waits for.
+    """
+
+    blocked_resource_types: FrozenSet[str]
+    blocked_hosts: Tuple[str, ...]
+    wait_until: str
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "PageProfile":
+        if not settings.pdf_link_block_requests:
+            return cls(frozenset(), (), settings.pdf_link_wait_until)
+        unknown = set(settings.pdf_link_blocked_resource_types) - set(RESOURCE_TYPE_EXTENSIONS)
+        if unknown:
+            logger.warning("Resource types %s cannot be told apart by URL and are not blocked.", sorted(unknown))
+        return cls(
+            blocked_resource_types=frozenset(settings.pdf_link_blocked_resource_types) - unknown,
+            blocked_hosts=tuple(host.lower().lstrip(".") for host in settings.pdf_link_blocked_hosts),
+            wait_until=settings.pdf_link_wait_until,
+        )
+
+    @property
+    def blocks_requests(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_hosts)
+
+    def blocked_url_patterns(self) -> List[str]:
+        """Wildcard URL patterns for Chromium's ``Network.setBlockedURLs``."""
+        patterns: List[str] = []
+        for host in self.blocked_hosts:
+            patterns.extend((f"*://{host}/*", f"*://*.{host}/*"))
+        for resource_type in sorted(self.blocked_resource_types):
+            for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+                patterns.extend((f"*.{extension}", f"*.{extension}?*"))
+        return patterns
+
+
+class PageTraffic:
+    """
+    Applies a ``PageProfile`` to one page and measures what the page downloaded.
+
+    Blocking goes through the page's CDP session rather than ``page.route``:
+    any route makes Playwright intercept every request, which disables the
+    browser cache and adds a round trip per request. Bytes come from each
+    response's ``Content-Length`` as its headers arrive, so measuring costs
+    no protocol calls (responses without one count as 0).
+    """
+
+    def __init__(self, profile: PageProfile):
+        self.profile = profile
+        self.requests_blocked = 0
+        self.bytes_transferred = 0
+
+    async def attach(self, page: "Page") -> None:
+        page.on("response", self._on_response)
+        if self.profile.blocks_requests:
+            page.on("requestfailed", self._on_request_failed)
+            session = await page.context.new_cdp_session(page)
+            await session.send("Network.enable")
+            await session.send("Network.setBlockedURLs", {"urls": self.profile.blocked_url_patterns()})
+
+    def _on_response(self, response: "Response") -> None:
+        length = response.headers.get("content-length", "")
+        if length.isdigit():
+            self.bytes_transferred += int(length)
+
+    def _on_request_failed(self, request: "Request") -> None:
+        if request.failure == BLOCKED_FAILURE:
+            self.requests_blocked += 1
+
+
+class NavigationStats:
+    """Running totals of browser PDF lookups: bytes transferred, blocked requests, time to locator."""
+
+    def __init__(self) -> None:
+        self.lookups = 0
+        self.located = 0
+        self.bytes_transferred = 0
+        self.requests_blocked = 0
+        self.locator_seconds_total = 0.0
+
+    def record(self, bytes_transferred: int, requests_blocked: int, locator_seconds: Optional[float]) -> None:
+        self.lookups += 1
+        self.bytes_transferred += bytes_transferred
+        self.requests_blocked += requests_blocked
+        if locator_seconds is not None:
+            self.located += 1
+            self.locator_seconds_total += locator_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "bytes_transferred_total": self.bytes_transferred,
+            "bytes_per_lookup": round(self.bytes_transferred / self.lookups) if self.lookups else 0,
+            "requests_blocked_total": self.requests_blocked,
+            "time_to_locator_ms_avg": (
+                round(self.locator_seconds_total / self.located * 1000, 1) if self.located else None
+            ),
+        }
+
+
+navigation_stats = NavigationStats()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+from app.models.schemas import Grant
+from app.services.parsing.urls import canonical_url
+
+
+def dedupe_grants(grants: Iterable[Grant]) -> List[Grant]:
+    """
+    Collapse grants whose links share a canonical URL into one grant each.
+
+    The first occurrence keeps its position and fields. Later duplicates add
+    their source citations (unioned by canonical URL) and tags, replace the
+    summary when theirs is longer, and fill any field the first one left
+    empty.
+    """
+    merged: Dict[str, Grant] = {}
+    for grant in grants:
+        key = canonical_url(str(grant.link))
+        existing = merged.get(key)
+        merged[key] = grant if existing is None else _merge(existing, grant)
+    return list(merged.values())
+
+
+def _merge(primary: Grant, duplicate: Grant) -> Grant:
+    update: Dict[str, Any] = {}
+    if duplicate.summary and len(duplicate.summary) > len(primary.summary or ""):
+        update["summary"] = duplicate.summary
+
+    for name in ("eligibility", "deadline", "amount_min", "amount_max", "program", "region"):
+        if getattr(primary, name) is None and getattr(duplicate, name) is not None:
+            update[name] = getattr(duplicate, name)
+
+    if duplicate.tags:
+        tags = list(primary.tags or [])
+        seen_tags = {tag.lower() for tag in tags}
+        for tag in duplicate.tags:
+            if tag.lower() not in seen_tags:
+                seen_tags.add(tag.lower())
+                tags.append(tag)
+        if tags != (primary.tags or []):
+            update["tags"] = tags
+
+    citations = list(primary.source_citations or [])
+    # The link itself is never a citation of its own duplicate.
+    seen_citations = {canonical_url(str(url)) for url in [primary.link, *citations]}
+    for url in duplicate.source_citations or []:
+        key = canonical_url(str(url))
+        if key not in seen_citations:
+            seen_citations.add(key)
+            citations.append(url)
+    if citations != (primary.source_citations or []):
+        update["source_citations"] = citations
+
+    return primary.model_copy(update=update) if update else primary
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.schemas import Grant
+
+_MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+_MONTH = (
+    r"(?P<month>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_DAY = r"(?P<day>[0-3]?\d)(?:st|nd|rd|th)?"
+_YEAR = r"(?P<year>20\d\d)"
+
+# Date phrases, tried in order at each position after a deadline cue.
+DATE_PATTERNS: Tuple[re.Pattern[str], ...] = (
+    # March 1, 2025 / Mar. 1st 2025 / March 1
+    re.compile(rf"\b{_MONTH}\s+{_DAY}\b(?:,?\s+{_YEAR})?", re.IGNORECASE),
+    # 1 March 2025 / 1st of March
+    re.compile(rf"\b{_DAY}\s+(?:of\s+)?{_MONTH}(?:,?\s+{_YEAR})?", re.IGNORECASE),
+    # 2025-03-01
+    re.compile(r"\b(?P<year>20\d\d)-(?P<month_number>[01]?\d)-(?P<day>[0-3]?\d)\b"),
+)
+# Words that introduce an application deadline; the date must follow within a short window.
+DEADLINE_CUE = re.compile(
+    r"\b(?:deadlines?|closing date|close[sd]?|closing|due(?: date)?|apply by|submit(?:ted)? by"
+    r"|no later than|received by|intake (?:period )?ends?)\b",
+    re.IGNORECASE,
+)
+_DEADLINE_WINDOW = 60
+
+# A dollar figure: $25,000 / $1.5 million / CAD 10,000 / $75K. US dollars are skipped.
+AMOUNT_PATTERN = re.compile(
+    r"(?<![\w$])(?:C\$|CAD\s?\$?|\$)\s?(?P<value>\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)"
+    r"(?:\s?(?P<scale>k|thousand|m|million)\b)?",
+    re.IGNORECASE,
+)
+# "$5,000 to $25,000", "$5,000 - $25,000", "between $5,000 and $25,000".
+_RANGE_JOINER = re.compile(r"\s*(?:-|–|—|to|and)\s*$", re.IGNORECASE)
+# Funding cues count only when at most two words sit between them and the figure, so
+# fees, budgets and past totals ("an application fee of $50", "raised funding from $2M")
+# are not read as award amounts.
+_MIN_CUE = re.compile(
+    r"\b(?:minimum|min\.|at least|starting at|no less than)(?:\s+[a-z]+){0,2}\s*$", re.IGNORECASE
+)
+_MAX_CUE = re.compile(
+    r"\b(?:up to|maximum|max\.|as much as|not to exceed|no more than"
+    r"|(?:grants?|awards?|funding|contributions?) of)(?:\s+[a-z]+){0,2}\s*$",
+    re.IGNORECASE,
+)
+_CUE_WINDOW = 24
+_SCALES = {"k": 1_000, "thousand": 1_000, "m": 1_000_000, "million": 1_000_000}
+
+
+def extract_amounts(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Return ``(amount_min, amount_max)`` in whole dollars from funding phrases in ``text``.
+
+    Ranges set both ends, figures after "up to"/"maximum"/"grants of" the
+    ceiling and figures after "minimum"/"at least" the floor. Figures without
+    a funding cue are ignored. Either end is None when no matching phrase is
+    found.
+    """
+    matches = list(AMOUNT_PATTERN.finditer(text))
+    minimums: List[int] = []
+    maximums: List[int] = []
+    for index, match in enumerate(matches):
+        value = _amount_value(match)
+        before = text[max(0, match.start() - _CUE_WINDOW) : match.start()]
+        previous = matches[index - 1] if index > 0 else None
+        if previous is not None and _RANGE_JOINER.match(text, previous.end(), match.start()):
+            # Second half of a range: the previous figure was its floor.
+            minimums.append(_amount_value(previous))
+            maximums.append(value)
+        elif _MIN_CUE.search(before):
+            minimums.append(value)
+        elif _MAX_CUE.search(before):
+            maximums.append(value)
+
+    amount_max = max(maximums) if maximums else None
+    amount_min = min(minimums) if minimums else None
+    if amount_min is not None and amount_max is not None and amount_min > amount_max:
+        amount_min = None
+    return amount_min, amount_max
+
+
+def extract_deadline(text: str, today: Optional[date] = None) -> Optional[date]:
+    """
+    Return the first date that follows a deadline cue (e.g. "apply by") in ``text``.
+
+    Dates without a year resolve to their next occurrence on or after ``today``.
+    """
+    today = today or date.today()
+    for cue in DEADLINE_CUE.finditer(text):
+        window_end = min(len(text), cue.end() + _DEADLINE_WINDOW)
+        for pattern in DATE_PATTERNS:
+            match = pattern.search(text, cue.end(), window_end)
+            if match is not None:
+                parsed = _date_value(match, today)
+                if parsed is not None:
+                    return parsed
+    return None
+
+
+def enrich_grant(grant: Grant, text: str, today: Optional[date] = None) -> Grant:
+    """
+    Fill a grant's missing deadline and amounts from its page text.
+
+    Fields the source already provided are kept as they are.
+    """
+    update: Dict[str, Any] = {}
+    if grant.deadline is None:
+        deadline = extract_deadline(text, today)
+        if deadline is not None:
+            update["deadline"] = deadline
+    if grant.amount_min is None and grant.amount_max is None:
+        amount_min, amount_max = extract_amounts(text)
+        if amount_min is not None:
+            update["amount_min"] = amount_min
+        if amount_max is not None:
+            update["amount_max"] = amount_max
+    return grant.model_copy(update=update) if update else grant
+
+
+def enrich_grants(grants: Iterable[Grant], today: Optional[date] = None) -> List[Grant]:
+    """
+    Enrich grants parsed from search results using their title and summary.
+
+    Used on the live search path, where only the result snippet is at hand.
+    """
+    return [enrich_grant(grant, f"{grant.title}\n{grant.summary or ''}", today) for grant in grants]
+
+
+def _amount_value(match: re.Match[str]) -> int:
+    value = float(match.group("value").replace(",", ""))
+    scale = match.group("scale")
+    if scale:
+        value *= _SCALES[scale.lower()]
+    return int(round(value))
+
+
+def _date_value(match: re.Match[str], today: date) -> Optional[date]:
+    groups = match.groupdict()
+    if groups.get("month_number"):
+        month = int(groups["month_number"])
+    else:
+        month = _MONTHS[groups["month"][:3].lower()]
+    day = int(groups["day"])
+    year = int(groups["year"]) if groups.get("year") else today.year
+    try:
+        parsed = date(year, month, day)
+    except ValueError:
+        return None
+    if not groups.get("year") and parsed < today:
+        try:
+            parsed = parsed.replace(year=year + 1)
+        except ValueError:
+            return None
+    return parsed
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
-from urllib.parse import urlparse
+import logging
+from enum import IntFlag
+from typing import Any, AsyncIterable, Dict, Iterable, List, Mapping, Optional
+from urllib.parse import urlsplit
+
+from pydantic import TypeAdapter, ValidationError
 
 from app.models.schemas import Grant
+from app.services.parsing.dedup import dedupe_grants
+from app.services.parsing.phrases import PhraseSearchPlan
+
+logger = logging.getLogger(__name__)
 
 ALLOWED_DOMAINS: Iterable[str] = ()
 CANADA_TEXT_HINTS: Iterable[str] = (
@@ -67,6 +75,59 @@ GRANT_KEYWORDS: Iterable[str] = (
     "contribution",
     "funding opportunity",
 )
+# Search result fields read by the parser; everything else is dropped when streaming.
+SEARCH_RESULT_FIELDS: tuple[str, ...] = (
+    "url",
+    "link",
+    "title",
+    "snippet",
+    "text",
+    "program",
+    "tags",
+    "extracted_eligibility",
+)
+# Program headings on the Alberta funding hub, in priority order.
+ALBERTA_PROGRAM_KEYWORDS: tuple[tuple[str, str], ...] = (
+    ("cfep small", "Community Facility Enhancement Program (CFEP) Small"),
+    ("cfep large", "Community Facility Enhancement Program (CFEP) Large"),
+    ("project-based grant", "Community Initiatives Program (CIP) Project-Based"),
+    ("operating grant", "Community Initiatives Program (CIP) Operating"),
+    ("cultural heritage initiatives program", "Cultural Heritage Initiatives Program"),
+    ("other initiatives program", "Other Initiatives Program"),
+    ("major sport event grant", "Major Sport Event Grant Program"),
+)
+
+
+class TextFeature(IntFlag):
+    """Phrase groups detected in a search result's text."""
+
+    NEGATIVE_STATUS = 1 << 0
+    POSITIVE_APPLICATION = 1 << 1
+    NEGATIVE_AUDIENCE = 1 << 2
+    POSITIVE_ORG = 1 << 3
+    GRANT_KEYWORD = 1 << 4
+    CANADA_HINT = 1 << 5
+
+
+# Bits above the TextFeature flags mark Alberta program keywords seen in the snippet.
+_PROGRAM_BIT_OFFSET = 8
+
+_TEXT_PHRASES = PhraseSearchPlan(
+    {
+        TextFeature.NEGATIVE_STATUS: NEGATIVE_STATUS_PHRASES,
+        TextFeature.POSITIVE_APPLICATION: POSITIVE_APPLICATION_HINTS,
+        TextFeature.NEGATIVE_AUDIENCE: NEGATIVE_AUDIENCE_PHRASES,
+        TextFeature.POSITIVE_ORG: POSITIVE_ORG_HINTS,
+        TextFeature.GRANT_KEYWORD: GRANT_KEYWORDS,
+        TextFeature.CANADA_HINT: CANADA_TEXT_HINTS,
+    },
+    prefix_phrases={
+        1 << (_PROGRAM_BIT_OFFSET + index): (keyword,)
+        for index, (keyword, _) in enumerate(ALBERTA_PROGRAM_KEYWORDS)
+    },
+)
+
+_GRANT_LIST_ADAPTER: TypeAdapter[List[Grant]] = TypeAdapter(List[Grant])
 
 
 def parse_grants_from_search(response: Dict[str, Any]) -> List[Grant]:
@@ -74,54 +135,127 @@ def parse_grants_from_search(response: Dict[str, Any]) -> List[Grant]:
     Normalize a Perplexity Search API response into Grant models.
 
     The Search API returns a list of ranked web documents. We keep high-signal
-    grant pages and convert the minimal metadata into our Grant schema.
+    grant pages and convert the minimal metadata into our Grant schema. The
+    host is split out of each URL once for filtering, sponsor and region, and
+    the kept records are validated together in one batch. Hits on URL
+    variants of the same page are merged by ``dedupe_grants``.
     """
     results = response.get("results")
     if not isinstance(results, list):
         raise ValueError("Perplexity response did not contain search results.")
 
-    grants: List[Grant] = []
-    for item in results:
-        if not isinstance(item, dict):
-            continue
-
-        url = _get_url(item)
-        if not url:
-            continue
-
-        # Minimal filtering: accept Canadian hosts (hostname contains .ca or 'canada')
-        host = (urlparse(url).hostname or "").lower()
-        if ".ca" not in host and "canada" not in host:
-            continue
-
-        # Attempt to infer a specific program section when the page is the general hub.
-        program_name = item.get("program") or item.get("title")
-        if url.rstrip("/") == "https://www.alberta.ca/funding-for-non-profits":
-            program_name = _infer_program_from_snippet(item.get("snippet") or "")
-
-        sponsor = "Government of Alberta" if "alberta.ca" in url else "Government of Canada"
-        region = "Alberta" if "alberta.ca" in url else "National"
-
-        # Build a dictionary compatible with the Grant Pydantic model.
-        grant_data: Dict[str, Any] = {
-            "title": program_name or item.get("title") or "Unnamed Program",
-            "link": url,
-            "summary": item.get("snippet") or item.get("text"),
-            "eligibility": item.get("extracted_eligibility"),
-            "deadline": None,
-            "amount_min": None,
-            "amount_max": None,
-            "currency": "CAD",
-            "sponsor": sponsor,
-            "program": item.get("program") or item.get("title"),
-            "region": region,
-            "tags": item.get("tags"),
-            "source_citations": [url],
-        }
-
-        grants.append(Grant.model_validate(grant_data))
-
-    return grants
+    records = [record for record in map(_grant_record, results) if record is not None]
+    # One pass through the compiled list validator instead of a call per record.
+    return dedupe_grants(_GRANT_LIST_ADAPTER.validate_python(records))
+
+
+async def parse_grants_from_results(results: AsyncIterable[Any]) -> List[Grant]:
+    """
+    Streaming counterpart of ``parse_grants_from_search``.
+
+    Consumes search results as they arrive (e.g. from
+    ``PerplexityClient.iter_results``), so filtering overlaps with the network
+    transfer and only the kept records are held until the final batch
+    validation.
+    """
+    records: List[Dict[str, Any]] = []
+    async for item in results:
+        record = _grant_record(item)
+        if record is not None:
+            records.append(record)
+    return dedupe_grants(_GRANT_LIST_ADAPTER.validate_python(records))
+
+
+def parse_grants_by_key(results: Mapping[str, Any]) -> Dict[str, Grant]:
+    """
+    Keyed counterpart of ``parse_grants_from_search``.
+
+    Each grant is returned under the key of the result it came from, so
+    callers that track results by their own key (e.g. canonical URL) never
+    re-derive it from ``Grant.link``, which validation may percent-encode.
+    Skipped results have no entry, and nothing is de-duplicated. If the batch
+    fails validation, records are validated one by one and each invalid one
+    is logged and left out rather than failing the rest.
+    """
+    keyed = [(key, _grant_record(item)) for key, item in results.items()]
+    kept = [(key, record) for key, record in keyed if record is not None]
+    try:
+        grants = _GRANT_LIST_ADAPTER.validate_python([record for _, record in kept])
+    except ValidationError:
+        pass
+    else:
+        return {key: grant for (key, _), grant in zip(kept, grants)}
+
+    parsed: Dict[str, Grant] = {}
+    for key, record in kept:
+        try:
+            parsed[key] = Grant.model_validate(record)
+        except ValidationError as exc:
+            logger.warning("Search result %s does not validate as a grant: %s", key, exc)
+    return parsed
+
+
+def project_search_result(item: Any) -> Any:
+    """
+    Keep only the fields of a search result that the parser reads.
+
+    Page text is kept only when there is no snippet to summarize from.
+    """
+    if not isinstance(item, dict):
+        return item
+    projected = {name: item[name] for name in SEARCH_RESULT_FIELDS if name in item}
+    if projected.get("snippet"):
+        projected.pop("text", None)
+    return projected
+
+
+def _grant_record(item: Any) -> Optional[Dict[str, Any]]:
+    """Map one search result to Grant fields, or None when it should be skipped."""
+    if not isinstance(item, dict):
+        return None
+
+    url = _get_url(item)
+    if not url:
+        return None
+
+    # Minimal filtering: accept Canadian hosts (hostname contains .ca or 'canada')
+    host = _hostname(url)
+    if ".ca" not in host and "canada" not in host:
+        return None
+
+    # Attempt to infer a specific program section when the page is the general hub.
+    program_name = item.get("program") or item.get("title")
+    if url.rstrip("/") == "https://www.alberta.ca/funding-for-non-profits":
+        program_name = _program_from_features(_text_features(item))
+
+    is_alberta = "alberta.ca" in host
+    sponsor = "Government of Alberta" if is_alberta else "Government of Canada"
+    region = "Alberta" if is_alberta else "National"
+
+    # Build a dictionary compatible with the Grant Pydantic model.
+    return {
+        "title": program_name or item.get("title") or "Unnamed Program",
+        "link": url,
+        "summary": item.get("snippet") or item.get("text"),
+        "eligibility": item.get("extracted_eligibility"),
+        "deadline": None,
+        "amount_min": None,
+        "amount_max": None,
+        "currency": "CAD",
+        "sponsor": sponsor,
+        "program": item.get("program") or item.get("title"),
+        "region": region,
+        "tags": item.get("tags"),
+        "source_citations": [url],
+    }
+
+
+def _hostname(url: str) -> str:
+    """Lower-cased host of ``url``, or an empty string when it has none."""
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
 
 
 def _get_url(item: Dict[str, Any]) -> str | None:
@@ -135,61 +269,57 @@ def _is_allowed_domain(url: str) -> bool:
     return any(domain in url for domain in ALLOWED_DOMAINS)
 
 
-def _mentions_grant(item: Dict[str, Any]) -> bool:
+def _text_features(item: Dict[str, Any]) -> int:
+    """
+    Search a result's text for every phrase group and return its feature bitset.
+
+    The snippet, page text and title are lowered and joined in that order;
+    snippet-only features (program keywords) are bounded by the snippet's
+    length.
+    """
+    snippet = str(item.get("snippet") or "").lower()
+    combined = " ".join((snippet, str(item.get("text") or "").lower(), str(item.get("title") or "").lower()))
+    return _TEXT_PHRASES.match(combined, prefix_length=len(snippet))
+
+
+def _mentions_grant(item: Dict[str, Any], features: Optional[int] = None) -> bool:
     """True when the text references a grant, funding, or contribution."""
-    text_candidates = [
-        str(item.get("title") or ""),
-        str(item.get("snippet") or ""),
-        str(item.get("text") or ""),
-    ]
-    combined = " ".join(text_candidates).lower()
-    return any(keyword in combined for keyword in GRANT_KEYWORDS)
+    if features is None:
+        features = _text_features(item)
+    return bool(features & TextFeature.GRANT_KEYWORD)
 
 
-def _looks_canadian(url: str, item: Dict[str, Any]) -> bool:
+def _looks_canadian(url: str, item: Dict[str, Any], features: Optional[int] = None) -> bool:
     """Return True when the source or description clearly indicates a Canadian scope."""
     domain = url.lower()
     if domain.endswith(".ca") or "canada" in domain:
         return True
 
-    text_candidates = [
-        str(item.get("title") or ""),
-        str(item.get("snippet") or ""),
-        str(item.get("text") or ""),
-    ]
-    combined = " ".join(text_candidates).lower()
-
-    return any(hint in combined for hint in CANADA_TEXT_HINTS)
+    if features is None:
+        features = _text_features(item)
+    return bool(features & TextFeature.CANADA_HINT)
 
 
 def _infer_program_from_snippet(snippet: str) -> str | None:
     """Extract the first Alberta program heading from the main funding page snippet."""
-    lowered = snippet.lower()
-    for keyword, program in [
-        ("cfep small", "Community Facility Enhancement Program (CFEP) Small"),
-        ("cfep large", "Community Facility Enhancement Program (CFEP) Large"),
-        ("project-based grant", "Community Initiatives Program (CIP) Project-Based"),
-        ("operating grant", "Community Initiatives Program (CIP) Operating"),
-        ("cultural heritage initiatives program", "Cultural Heritage Initiatives Program"),
-        ("other initiatives program", "Other Initiatives Program"),
-        ("major sport event grant", "Major Sport Event Grant Program"),
-    ]:
-        if keyword in lowered:
+    return _program_from_features(_text_features({"snippet": snippet}))
+
+
+def _program_from_features(features: int) -> str | None:
+    """Return the highest-priority Alberta program whose keyword the snippet contains."""
+    for index, (_, program) in enumerate(ALBERTA_PROGRAM_KEYWORDS):
+        if features & (1 << (_PROGRAM_BIT_OFFSET + index)):
             return program
     return None
 
 
-def _looks_active(item: Dict[str, Any]) -> bool:
+def _looks_active(item: Dict[str, Any], features: Optional[int] = None) -> bool:
     """Heuristically determine whether the result refers to an active program."""
-    text_candidates = [
-        str(item.get("snippet") or ""),
-        str(item.get("text") or ""),
-        str(item.get("title") or ""),
-    ]
-    combined = " ".join(text_candidates).lower()
+    if features is None:
+        features = _text_features(item)
 
     # Skip signals that the call for applications has ended.
-    if any(phrase in combined for phrase in NEGATIVE_STATUS_PHRASES):
+    if features & TextFeature.NEGATIVE_STATUS:
         return False
 
     # Accept Alberta government pages by default since they're pre-filtered
@@ -198,25 +328,20 @@ def _looks_active(item: Dict[str, Any]) -> bool:
         return True
 
     # For other sources, require at least one sign that the page discusses applying.
-    return any(hint in combined for hint in POSITIVE_APPLICATION_HINTS)
+    return bool(features & TextFeature.POSITIVE_APPLICATION)
 
 
-def _is_org_focused(item: Dict[str, Any]) -> bool:
+def _is_org_focused(item: Dict[str, Any], features: Optional[int] = None) -> bool:
     """Return True when the text emphasises organizational eligibility."""
-    text_candidates = [
-        str(item.get("snippet") or ""),
-        str(item.get("text") or ""),
-        str(item.get("title") or ""),
-    ]
-    combined = " ".join(text_candidates).lower()
+    if features is None:
+        features = _text_features(item)
 
     # Accept Alberta government pages by default since they're pre-filtered
     url = _get_url(item) or ""
     if "alberta.ca" in url:
         return True
 
-    if any(phrase in combined for phrase in NEGATIVE_AUDIENCE_PHRASES):
+    if features & TextFeature.NEGATIVE_AUDIENCE:
         return False
 
-    return any(hint in combined for hint in POSITIVE_ORG_HINTS)
-
+    return bool(features & TextFeature.POSITIVE_ORG)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+class _StreamReader:
+    """Incrementally decoded text buffer over an async stream of byte chunks."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self, min_chars: int = 1) -> bool:
+        """Append up to ``min_chars`` more characters; False when nothing was left to read."""
+        if self.eof:
+            return False
+        # Drop consumed text so the buffer only ever holds the value being decoded.
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        start = len(self.buffer)
+        while len(self.buffer) < start + min_chars:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self.buffer += self._decoder.decode(b"", final=True)
+                self.eof = True
+                break
+            self.buffer += self._decoder.decode(chunk)
+        return len(self.buffer) > start
+
+    async def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ("" at the end)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def take(self, *expected: str) -> str:
+        char = await self.peek()
+        if char not in expected:
+            raise ValueError(f"Expected one of {expected!r} in JSON stream, found {char or 'end of input'!r}.")
+        self.pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        await self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value: at least double the pending text so retries stay linear overall.
+                if not await self.fill(max(len(self.buffer) - self.pos, 1)):
+                    raise
+                continue
+            if end == len(self.buffer) and not isinstance(value, (dict, list, str)):
+                # A number or literal at the end of the buffer may continue in the next chunk.
+                if await self.fill():
+                    continue
+            self.pos = end
+            return value
+
+
+async def iter_json_array_items(chunks: AsyncIterable[bytes], key: str) -> AsyncIterator[Any]:
+    """
+    Yield the items of the array under ``key`` in a top-level JSON object.
+
+    The body is decoded as chunks arrive and each item is yielded as soon as
+    it is complete, so at most one item (or one skipped sibling value) is
+    buffered at a time instead of the whole document.
+
+    Raises:
+        ValueError: If the document is malformed, is not an object, or has
+            no array under ``key``.
+    """
+    reader = _StreamReader(chunks)
+    await reader.take("{")
+    if await reader.peek() == "}":
+        raise ValueError(f"JSON stream has no {key!r} array.")
+
+    while True:
+        name = await reader.value()
+        await reader.take(":")
+        if name != key:
+            await reader.value()
+        else:
+            await reader.take("[")
+            if await reader.peek() == "]":
+                return
+            while True:
+                yield await reader.value()
+                if await reader.take(",", "]") == "]":
+                    return
+        if await reader.take(",", "}") == "}":
+            raise ValueError(f"JSON stream has no {key!r} array.")
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import List, Optional
+from urllib.parse import urljoin
+
+# Accessible name of the sample application link on Alberta program pages.
+PDF_LINK_NAME = re.compile("CFEP Small Sample Application", re.IGNORECASE)
+# Hrefs worth checking when the named link does not point straight at a PDF.
+PDF_HREF_HINT = re.compile("cfep|sample|community", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class Anchor:
+    href: str
+    name: str
+
+
+class _AnchorParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.anchors: List[Anchor] = []
+        self._open: Optional[Anchor] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[tuple[str, Optional[str]]]) -> None:
+        if tag == "a":
+            values = dict(attrs)
+            href = values.get("href")
+            self._close()
+            if href:
+                # aria-label takes precedence over the text, as it does for the accessible name.
+                self._open = Anchor(href=href.strip(), name=values.get("aria-label") or "")
+                self._text = []
+        elif tag == "img" and self._open is not None:
+            self._text.append(dict(attrs).get("alt") or "")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "a":
+            self._close()
+
+    def handle_data(self, data: str) -> None:
+        if self._open is not None:
+            self._text.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._close()
+
+    def _close(self) -> None:
+        if self._open is not None:
+            if not self._open.name:
+                self._open.name = " ".join(" ".join(self._text).split())
+            self.anchors.append(self._open)
+        self._open = None
+
+
+def extract_anchors(html: str) -> List[Anchor]:
+    """Return every ``<a href>`` in ``html`` with its accessible name."""
+    parser = _AnchorParser()
+    parser.feed(html)
+    parser.close()
+    return parser.anchors
+
+
+def find_pdf_link(html: str, page_url: str) -> Optional[str]:
+    """
+    Resolve the grant's PDF link from a page's static HTML.
+
+    Mirrors the browser lookup: prefer the link named like the sample
+    application, else the first ``.pdf`` anchor; if that link's href is not a
+    PDF, fall back to any PDF href hinting at CFEP, a sample or community.
+    Returns None when the HTML holds no such link (e.g. it is rendered by
+    script), leaving the page to the browser.
+    """
+    anchors = extract_anchors(html)
+    located = next((anchor for anchor in anchors if PDF_LINK_NAME.search(anchor.name)), None)
+    if located is None:
+        located = next((anchor for anchor in anchors if anchor.href.endswith(".pdf")), None)
+    if located is None:
+        return None
+
+    resolved = urljoin(page_url, located.href)
+    if resolved.lower().endswith(".pdf"):
+        return resolved
+    for anchor in anchors:
+        if PDF_HREF_HINT.search(anchor.href):
+            resolved = urljoin(page_url, anchor.href)
+            if resolved.lower().endswith(".pdf"):
+                return resolved
+    return None
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.core.http_clients import get_http_clients
+from app.services.browserbase_service import get_pdf_link_from_grant_page, open_live_view
+from app.services.caching.pdf_link_store import ResolvedPdfLink, get_pdf_link_store
+from app.services.parsing.pdf_links import find_pdf_link
+
+logger = logging.getLogger(__name__)
+
+# The static pass must stay far cheaper than the browser it is trying to avoid.
+STATIC_FETCH_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass(slots=True)
+class _DomainCounts:
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    # Served from the link cache after revalidation; not counted in the hit rate.
+    cached: int = 0
+
+
+class StaticPathStats:
+    """Per-domain outcomes of the static-HTML pass and the link cache, for judging where they pay off."""
+
+    def __init__(self) -> None:
+        self._domains: Dict[str, _DomainCounts] = {}
+
+    def record(self, url: str, outcome: str) -> None:
+        counts = self._domains.setdefault(_domain(url), _DomainCounts())
+        setattr(counts, outcome, getattr(counts, outcome) + 1)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        report: Dict[str, Dict[str, Any]] = {}
+        for domain, counts in sorted(self._domains.items()):
+            total = counts.hits + counts.misses + counts.errors
+            report[domain] = {
+                "hits": counts.hits,
+                "misses": counts.misses,
+                "errors": counts.errors,
+                "cached": counts.cached,
+                "hit_rate": round(counts.hits / total, 4) if total else 0.0,
+            }
+        return report
+
+
+static_path_stats = StaticPathStats()
+
+
+async def resolve_pdf_link(grant_url: str, live_view: bool = False) -> Dict[str, Optional[str]]:
+    """
+    Resolve a grant page's PDF link, using a browser only when nothing cheaper works.
+
+    A link resolved before is revalidated with a conditional GET (ETag,
+    Last-Modified, or failing those a hash of the body) and reused while the
+    page is unchanged. Otherwise the fetched page's anchors are matched with
+    the browser lookup's heuristics, and only when that finds nothing is a
+    pooled Browserbase session leased. Every resolved link is stored with
+    the page's validators.
+
+    With ``live_view`` the caller also gets a Browserbase session of their
+    own showing the grant page: it only navigates when the link is already
+    known, and runs the browser lookup itself otherwise.
+    """
+    started = time.perf_counter()
+    store = get_pdf_link_store(settings.pdf_link_cache_path) if settings.pdf_link_cache_path else None
+    cached = await asyncio.to_thread(store.get, grant_url) if store is not None else None
+    page: Optional[httpx.Response] = None
+    if store is not None or settings.pdf_link_static_enabled:
+        page = await _fetch_page(grant_url, cached)
+
+    if cached is not None and (page is None or _unchanged(page, cached)):
+        # Unchanged, or unreachable right now: the link resolved last time still stands.
+        static_path_stats.record(grant_url, "cached")
+        return await _known_link_result(grant_url, cached.pdf_link, live_view)
+
+    pdf_link = _static_pdf_link(grant_url, page) if settings.pdf_link_static_enabled else None
+    if pdf_link is not None:
+        logger.debug(
+            "Resolved PDF link for %s from static HTML in %.0f ms.",
+            grant_url,
+            (time.perf_counter() - started) * 1000,
+        )
+        result = await _known_link_result(grant_url, pdf_link, live_view)
+    else:
+        result = await get_pdf_link_from_grant_page(grant_url, live_view=live_view)
+
+    if store is not None and page is not None and result.get("pdf_link"):
+        await asyncio.to_thread(
+            store.put,
+            grant_url,
+            str(result["pdf_link"]),
+            page.headers.get("etag"),
+            page.headers.get("last-modified"),
+            _content_hash(page),
+        )
+    return result
+
+
+async def _known_link_result(grant_url: str, pdf_link: str, live_view: bool) -> Dict[str, Optional[str]]:
+    if live_view:
+        return await open_live_view(grant_url, pdf_link)
+    return {"session_id": None, "live_view_url": None, "pdf_link": pdf_link}
+
+
+async def _fetch_page(grant_url: str, cached: Optional[ResolvedPdfLink]) -> Optional[httpx.Response]:
+    """GET the page, conditionally when a cached link has validators; None when it cannot be fetched."""
+    headers: Dict[str, str] = {}
+    if cached is not None and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached is not None and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    client = get_http_clients().get("pages")
+    try:
+        response = await client.get(
+            grant_url, headers=headers, follow_redirects=True, timeout=STATIC_FETCH_TIMEOUT_SECONDS
+        )
+        if response.status_code != 304:
+            response.raise_for_status()
+    except httpx.HTTPError as exc:
+        logger.debug("Fetch of %s failed: %s", grant_url, exc)
+        return None
+    return response
+
+
+def _unchanged(page: httpx.Response, cached: ResolvedPdfLink) -> bool:
+    if page.status_code == 304:
+        return True
+    if cached.etag and page.headers.get("etag") == cached.etag:
+        return True
+    return cached.content_hash is not None and _content_hash(page) == cached.content_hash
+
+
+def _static_pdf_link(grant_url: str, page: Optional[httpx.Response]) -> Optional[str]:
+    if page is None:
+        static_path_stats.record(grant_url, "errors")
+        return None
+    content_type = page.headers.get("content-type", "")
+    # Base URL is the final one, so relative hrefs survive redirects.
+    pdf_link = find_pdf_link(page.text, str(page.url)) if "html" in content_type else None
+    static_path_stats.record(grant_url, "hits" if pdf_link else "misses")
+    return pdf_link
+
+
+def _content_hash(page: httpx.Response) -> str:
+    return hashlib.sha256(page.content).hexdigest()
+
+
+def _domain(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
@@ -1,25 +1,60 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Union
-
-import httpx
+import asyncio
+import logging
+import math
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Union
 
 from app.core.config import Settings
+from app.core.http_clients import get_http_clients
+from app.services.caching.response_store import ResponseStore, get_response_store
+from app.services.parsing.grants_parser import SEARCH_RESULT_FIELDS, project_search_result
+from app.services.parsing.json_stream import iter_json_array_items
+
+logger = logging.getLogger(__name__)
+
+# Hard limit on the number of queries in a single Perplexity /search call.
+PERPLEXITY_MAX_QUERIES_PER_CALL = 5
+
+# Strong references to background refreshes so they are not garbage collected mid-flight.
+_refresh_tasks: Set[asyncio.Task[None]] = set()
+_refreshing_keys: Set[str] = set()
+
+
+def partition_queries(queries: List[str]) -> List[List[str]]:
+    """Split queries into balanced batches within the per-call query limit."""
+    if not queries:
+        return []
+    batch_count = math.ceil(len(queries) / PERPLEXITY_MAX_QUERIES_PER_CALL)
+    batch_size = math.ceil(len(queries) / batch_count)
+    return [queries[start : start + batch_size] for start in range(0, len(queries), batch_size)]
 
 
 class PerplexityClient:
     """Minimal client for Perplexity's Search API."""
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, store: Optional[ResponseStore] = None):
         """
         Store the shared settings object.
 
+        Args:
+            settings: Shared application settings.
+            store: Optional response store; defaults to the on-disk store at
+                PERPLEXITY_CACHE_PATH (disabled when that path is empty).
+
         Raises:
             ValueError: When the Perplexity API key is missing while live mode is enabled.
         """
         self.settings = settings
         if not self.settings.perplexity_api_key:
             raise ValueError("PERPLEXITY_API_KEY is required for live mode.")
+        if store is None and settings.perplexity_cache_path:
+            store = get_response_store(
+                settings.perplexity_cache_path,
+                settings.perplexity_cache_fresh_seconds,
+                settings.perplexity_cache_stale_seconds,
+            )
+        self.store = store
 
     async def search(
         self,
@@ -40,8 +75,78 @@ class PerplexityClient:
 
         Returns:
             Raw JSON dictionary provided by Perplexity Search API.
+
+        Responses are served from the response store when one is configured.
+        Fresh entries are returned directly; stale entries are returned
+        immediately while a background request refreshes them.
         """
 
+        payload = self._build_payload(query, max_results, search_domain_filter, max_tokens_per_page)
+        if self.store is None:
+            return await self._post_search(payload)
+
+        key = ResponseStore.key_for(payload)
+        cached = await asyncio.to_thread(self.store.get, key)
+        if cached is not None:
+            if not cached.fresh:
+                self._schedule_refresh(key, payload)
+            return cached.body
+
+        body = await self._post_search(payload)
+        await asyncio.to_thread(self.store.put, key, body)
+        return body
+
+    async def iter_results(
+        self,
+        *,
+        query: Union[str, List[str]],
+        max_results: int,
+        search_domain_filter: Optional[List[str]] = None,
+        max_tokens_per_page: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of ``search`` that yields results one at a time.
+
+        The response body is decoded incrementally and each result is trimmed
+        to ``SEARCH_RESULT_FIELDS`` as soon as it is complete, so the full
+        document (and its page text) is never held in memory. Trimmed
+        responses are cached under their own store key, with the same
+        fresh/stale policy as ``search``.
+
+        Args:
+            query: Natural language search string, or a list of strings for multi-query search.
+            max_results: Number of documents to retrieve (1-20 per docs).
+            search_domain_filter: Optional whitelist of allowed host names.
+            max_tokens_per_page: Optional cap on extracted content per result.
+        """
+        payload = self._build_payload(query, max_results, search_domain_filter, max_tokens_per_page)
+        if self.store is None:
+            async for item in self._stream_search(payload):
+                yield item
+            return
+
+        key = ResponseStore.key_for({**payload, "fields": list(SEARCH_RESULT_FIELDS)})
+        cached = await asyncio.to_thread(self.store.get, key)
+        if cached is not None:
+            if not cached.fresh:
+                self._schedule_refresh(key, payload, streamed=True)
+            for item in cached.body.get("results") or []:
+                yield item
+            return
+
+        results: List[Dict[str, Any]] = []
+        async for item in self._stream_search(payload):
+            results.append(item)
+            yield item
+        await asyncio.to_thread(self.store.put, key, {"results": results})
+
+    @staticmethod
+    def _build_payload(
+        query: Union[str, List[str]],
+        max_results: int,
+        search_domain_filter: Optional[List[str]],
+        max_tokens_per_page: Optional[int],
+    ) -> Dict[str, Any]:
         # Build request payload based on official Search API schema.
         payload: Dict[str, Any] = {
             "query": query,
@@ -54,6 +159,9 @@ class PerplexityClient:
         if max_tokens_per_page:
             payload["max_tokens_per_page"] = max_tokens_per_page
 
+        return payload
+
+    def _request_args(self) -> tuple[str, Dict[str, str]]:
         headers = {
             "Authorization": f"Bearer {self.settings.perplexity_api_key}",
             "Content-Type": "application/json",
@@ -61,14 +169,57 @@ class PerplexityClient:
 
         # Ensure callers can override PERPLEXITY_BASE_URL without duplicating slashes.
         base_url = str(self.settings.perplexity_base_url).rstrip("/")
-
-        async with httpx.AsyncClient(timeout=self.settings.http_timeout_seconds) as client:
-            # POST /search returns ranked documents relevant to the query.
-            response = await client.post(
-                f"{base_url}/search",
-                headers=headers,
-                json=payload,
-            )
-            response.raise_for_status()
-            return response.json()
-
+        return f"{base_url}/search", headers
+
+    async def _post_search(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST the payload to /search and return the decoded JSON body."""
+        url, headers = self._request_args()
+        client = get_http_clients().get("perplexity")
+        # POST /search returns ranked documents relevant to the query.
+        response = await client.post(
+            url,
+            headers=headers,
+            json=payload,
+            timeout=self.settings.http_timeout_seconds,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _stream_search(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """POST the payload to /search and yield trimmed results while the body downloads."""
+        url, headers = self._request_args()
+        client = get_http_clients().get("perplexity")
+        async with client.stream(
+            "POST",
+            url,
+            headers=headers,
+            json=payload,
+            timeout=self.settings.http_timeout_seconds,
+        ) as response:
+            if response.is_error:
+                # Error bodies are small; read them so HTTPStatusError handlers can report the text.
+                await response.aread()
+                response.raise_for_status()
+            async for item in iter_json_array_items(response.aiter_bytes(), "results"):
+                yield project_search_result(item)
+
+    def _schedule_refresh(self, key: str, payload: Dict[str, Any], streamed: bool = False) -> None:
+        """Refresh a stale entry in the background, at most once per key at a time."""
+        if key in _refreshing_keys:
+            return
+        _refreshing_keys.add(key)
+        task = asyncio.create_task(self._refresh(key, payload, streamed))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+
+    async def _refresh(self, key: str, payload: Dict[str, Any], streamed: bool = False) -> None:
+        try:
+            if streamed:
+                body = {"results": [item async for item in self._stream_search(payload)]}
+            else:
+                body = await self._post_search(payload)
+            await asyncio.to_thread(self.store.put, key, body)
+        except Exception:
+            logger.warning("Background refresh of cached Perplexity response failed.", exc_info=True)
+        finally:
+            _refreshing_keys.discard(key)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from playwright.async_api import Browser, Playwright, async_playwright
+
+from app.services.caching.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+async def _start_playwright() -> Playwright:
+    return await async_playwright().start()
+
+
+class PlaywrightDriver:
+    """
+    Process-wide Playwright driver with long-lived CDP connections.
+
+    The driver subprocess is started once (by the FastAPI lifespan, or on
+    first use) and each remote browser, keyed by its Browserbase session id,
+    keeps one CDP connection that successive requests share; requests isolate
+    themselves by opening their own pages. A connection that drops is
+    forgotten and re-established on the next ``connect``. Like the pooled
+    HTTP clients, the driver is bound to the event loop that started it.
+    """
+
+    def __init__(self, start: Callable[[], Awaitable[Playwright]] = _start_playwright):
+        self._start = start
+        self._playwright: Optional[Playwright] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._starting: SingleFlight[Playwright] = SingleFlight()
+        self._connecting: SingleFlight[Browser] = SingleFlight()
+        self._browsers: Dict[str, Browser] = {}
+        # Lifetime counters.
+        self.connections_opened = 0
+
+    @property
+    def connected(self) -> int:
+        return len(self._browsers)
+
+    async def start(self) -> Playwright:
+        """Start the driver subprocess unless it already runs on this event loop."""
+        loop = asyncio.get_running_loop()
+        if self._playwright is not None and self._loop is loop:
+            return self._playwright
+        if self._loop is not loop:
+            # A driver started on another loop cannot be used (or stopped) from this one.
+            self._playwright = None
+            self._browsers.clear()
+        return await self._starting.do("driver", self._start_once)
+
+    async def connect(self, key: str, connect_url: str) -> Browser:
+        """Return the live CDP connection for ``key``, connecting on first use."""
+        playwright = await self.start()
+        browser = self._browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+        self._browsers.pop(key, None)
+        return await self._connecting.do(key, lambda: self._connect(playwright, key, connect_url))
+
+    async def disconnect(self, key: str) -> None:
+        """Drop the connection for ``key``; the remote browser itself keeps running."""
+        browser = self._browsers.pop(key, None)
+        if browser is None:
+            return
+        try:
+            await browser.close()
+        except Exception:
+            logger.debug("Failed to disconnect from browser %s cleanly.", key, exc_info=True)
+
+    async def aclose(self) -> None:
+        """Disconnect every browser and stop the driver subprocess."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        for key in list(self._browsers):
+            await self.disconnect(key)
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                logger.debug("Failed to stop the Playwright driver cleanly.", exc_info=True)
+
+    async def _start_once(self) -> Playwright:
+        playwright = await self._start()
+        self._playwright = playwright
+        self._loop = asyncio.get_running_loop()
+        return playwright
+
+    async def _connect(self, playwright: Playwright, key: str, connect_url: str) -> Browser:
+        browser = await playwright.chromium.connect_over_cdp(connect_url)
+        self.connections_opened += 1
+        self._browsers[key] = browser
+
+        def _forget(_: Any) -> None:
+            if self._browsers.get(key) is browser:
+                del self._browsers[key]
+
+        browser.on("disconnected", _forget)
+        return browser
+
+
+@lru_cache(maxsize=1)
+def get_playwright_driver() -> PlaywrightDriver:
+    """Return the process-wide driver, creating it on first use."""
+    return PlaywrightDriver()
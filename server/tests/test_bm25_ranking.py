@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from app.core.config import Settings
+from app.models.schemas import Grant, OrganizationInfo
+from app.services.catalog.bm25 import B, FIELD_WEIGHTS, K1, BM25Index, build_query, tokenize
+from app.services.catalog.index import GrantCatalog
+from app.services.catalog.snapshot import open_snapshot, write_snapshot
+from app.services.grant_finder_service import GrantFinderService
+
+_WORDS = ["youth", "arts", "sport", "seniors", "housing", "rural", "health", "heritage", "water", "capital"]
+
+
+def _synthetic_grants(count: int, seed: int = 3) -> List[Grant]:
+    rng = random.Random(seed)
+
+    def text(length: int) -> str:
+        return " ".join(rng.choice(_WORDS + ["the", "program", "funding"]) for _ in range(length))
+
+    return [
+        Grant.model_validate(
+            {
+                "title": text(rng.randint(1, 4)),
+                "link": f"https://example.ca/grant-{index}",
+                "summary": text(rng.randint(0, 20)) or None,
+                "eligibility": text(rng.randint(0, 8)) or None,
+                "program": text(rng.randint(0, 3)) or None,
+            }
+        )
+        for index in range(count)
+    ]
+
+
+def _reference_scores(grants: List[Grant], query: Dict[str, float]) -> List[float]:
+    """Straightforward BM25F: weighted, length-normalized tf summed over fields, then saturated."""
+    fields: Dict[str, List[List[str]]] = {
+        name: [(getattr(grant, name) or "").lower().split() for grant in grants] for name in FIELD_WEIGHTS
+    }
+    averages = {name: (sum(map(len, docs)) / len(docs)) or 1.0 for name, docs in fields.items()}
+    scores = []
+    for grant_id in range(len(grants)):
+        total = 0.0
+        for term, weight in query.items():
+            tf = 0.0
+            for name, field_weight in FIELD_WEIGHTS.items():
+                tokens = fields[name][grant_id]
+                if tokens:
+                    tf += Counter(tokens)[term] * field_weight / (1 - B + B * len(tokens) / averages[name])
+            if tf == 0:
+                continue
+            df = sum(
+                1
+                for other in range(len(grants))
+                if any(term in fields[name][other] for name in FIELD_WEIGHTS)
+            )
+            idf = math.log(1 + (len(grants) - df + 0.5) / (df + 0.5))
+            total += weight * idf * tf * (K1 + 1) / (tf + K1)
+        scores.append(total)
+    return scores
+
+
+def test_scores_match_reference_bm25f() -> None:
+    grants = _synthetic_grants(120)
+    index = BM25Index(grants)
+    query = {"youth": 1.0, "arts": 0.5, "heritage": 0.3, "unknown": 1.0}
+
+    scores = index.score(query, np.arange(len(grants)))
+
+    assert scores == pytest.approx(_reference_scores(grants, query), rel=1e-5)
+    # Candidates are scored in the order given; unmatched ones stay zero.
+    subset = np.asarray([7, 3, 99, 42])
+    assert index.score(query, subset) == pytest.approx(scores[subset], rel=1e-6)
+    assert not index.score({"the": 1.0, "unknown": 1.0}, subset).any()
+
+
+def test_query_combines_tags_naics_and_names() -> None:
+    query = build_query(["Arts", "youth arts"], "711190", ["Calgary Arts Society", None])
+
+    # Two sector tags, the NAICS arts sector and the name all add up.
+    assert query["arts"] == pytest.approx(2.8)
+    assert query["youth"] == 1.0
+    assert query["heritage"] == 0.5
+    assert query["calgary"] == 0.3
+    assert "the" not in tokenize("The arts of the city")
+
+
+def test_bm25_ranking_round_trips_through_snapshot(tmp_path: Path) -> None:
+    grants = _synthetic_grants(300, seed=9)
+    catalog = GrantCatalog(grants)
+    write_snapshot(grants, tmp_path, "v1")
+    compiled, _ = open_snapshot(tmp_path)
+    query = build_query(["rural housing"], "62")
+    candidate_ids = list(range(0, len(grants), 2))
+
+    expected = catalog.sort_by_bm25(candidate_ids, query)
+    assert compiled.sort_by_bm25(candidate_ids, query) == expected
+    for limit in (1, 5, 40):
+        assert catalog.sort_by_bm25(candidate_ids, query, limit=limit) == expected[:limit]
+
+
+def _grant(title: str, **fields: Any) -> Grant:
+    return Grant.model_validate({"title": title, "link": f"https://example.ca/{title.lower().replace(' ', '-')}", **fields})
+
+
+def test_bm25_ranker_is_selectable_and_reads_the_whole_profile() -> None:
+    grants = [
+        _grant("Community Capital Fund", summary="Capital projects for community halls."),
+        _grant("Sport Equipment Grant", summary="Equipment for amateur sport clubs."),
+        _grant("Library Grant", eligibility="Public libraries and literacy societies."),
+    ]
+    organization = OrganizationInfo(legal_name="Prairie Literacy Society", naics_code="611", sector_tags=["literacy"])
+
+    sector = GrantFinderService(Settings(mode="mock"))._apply_filters(grants, None, organization, limit=3)
+    bm25 = GrantFinderService(Settings(mode="mock", search_ranker="bm25"))._apply_filters(
+        grants, None, organization, limit=3
+    )
+
+    # Sector scoring never reads eligibility, so nothing matches and source order is kept.
+    assert [grant.title for grant in sector] == ["Community Capital Fund", "Sport Equipment Grant", "Library Grant"]
+    assert [grant.title for grant in bm25] == ["Library Grant", "Community Capital Fund", "Sport Equipment Grant"]
@@ -1,56 +1,65 @@
 from __future__ import annotations
 
+from typing import Dict, List, Optional
+
 import pytest
-from httpx import AsyncClient
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
 
-from app.main import app as fastapi_app
+from app.routers import grants
 from app.services.browserbase_service import PdfLinkNotFoundError
 
+GRANT_URL = "https://www.alberta.ca/community-facility-enhancement-program-small"
+
+
+def _app() -> FastAPI:
+    # Only the grants router: the full app needs Supabase credentials at import.
+    app = FastAPI()
+    app.include_router(grants.router, prefix="/api/grants")
+    return app
+
+
+async def _post(payload: Dict[str, object]) -> tuple[int, object]:
+    async with AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as client:
+        response = await client.post("/api/grants/pdf-link", json=payload)
+    return response.status_code, response.json()
+
 
 @pytest.mark.asyncio
 async def test_fetch_pdf_link_success(monkeypatch: pytest.MonkeyPatch) -> None:
-    async def _fake_get_pdf_link(grant_url: str) -> dict[str, str]:
+    calls: List[bool] = []
+
+    async def _fake_resolve(grant_url: str, live_view: bool = False) -> Dict[str, Optional[str]]:
+        calls.append(live_view)
         return {
-            "session_id": "session-123",
-            "live_view_url": "https://browserbase.com/sessions/session-123",
+            "session_id": "session-123" if live_view else None,
+            "live_view_url": "https://browserbase.com/sessions/session-123" if live_view else None,
             "pdf_link": "https://www.alberta.ca/cfep-small-sample.pdf",
         }
 
-    monkeypatch.setattr(
-        "app.services.browserbase_service.get_pdf_link_from_grant_page",
-        _fake_get_pdf_link,
-    )
-
-    async with AsyncClient(app=fastapi_app, base_url="http://test") as client:
-        response = await client.post(
-            "/api/grants/pdf-link",
-            json={"grant_url": "https://www.alberta.ca/community-facility-enhancement-program-small"},
-        )
+    monkeypatch.setattr(grants, "resolve_pdf_link", _fake_resolve)
 
-    assert response.status_code == 200
-    assert response.json() == {
+    status, body = await _post({"grant_url": GRANT_URL})
+    assert status == 200
+    assert body == {
         "session_id": "session-123",
         "live_view_url": "https://browserbase.com/sessions/session-123",
         "pdf_link": "https://www.alberta.ca/cfep-small-sample.pdf",
     }
 
+    status, body = await _post({"grant_url": GRANT_URL, "live_view": False})
+    assert status == 200
+    assert body == {"session_id": None, "live_view_url": None, "pdf_link": "https://www.alberta.ca/cfep-small-sample.pdf"}
+    assert calls == [True, False]
+
 
 @pytest.mark.asyncio
 async def test_fetch_pdf_link_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
-    async def _fake_get_pdf_link(_: str) -> dict[str, str]:
+    async def _fake_resolve(grant_url: str, live_view: bool = False) -> Dict[str, Optional[str]]:
         raise PdfLinkNotFoundError("missing")
 
-    monkeypatch.setattr(
-        "app.services.browserbase_service.get_pdf_link_from_grant_page",
-        _fake_get_pdf_link,
-    )
-
-    async with AsyncClient(app=fastapi_app, base_url="http://test") as client:
-        response = await client.post(
-            "/api/grants/pdf-link",
-            json={"grant_url": "https://www.alberta.ca/community-facility-enhancement-program-small"},
-        )
-
-    assert response.status_code == 404
-    assert response.json() == {"detail": "PDF link not found"}
+    monkeypatch.setattr(grants, "resolve_pdf_link", _fake_resolve)
 
+    status, body = await _post({"grant_url": GRANT_URL})
+    assert status == 404
+    assert body == {"detail": "PDF link not found"}
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List, Set
+
+import pytest
+
+from app.core.config import Settings
+from app.services import browserbase_service
+from app.services.browserbase_pool import BrowserbaseSessionPool
+from app.services.browserbase_service import BrowserbaseSession
+
+
+class _FakeBrowserbase:
+    def __init__(self) -> None:
+        self.created: List[str] = []
+        self.released: List[str] = []
+        self.checked: List[str] = []
+        self.dead: Set[str] = set()
+        self.create_delay = 0.0
+
+    async def create(self) -> BrowserbaseSession:
+        await asyncio.sleep(self.create_delay)
+        session_id = f"session-{len(self.created)}"
+        self.created.append(session_id)
+        return BrowserbaseSession(id=session_id, connect_url=f"wss://connect/{session_id}", live_view_url="https://x")
+
+    async def release(self, session: BrowserbaseSession) -> None:
+        self.released.append(session.id)
+
+    async def check(self, session: BrowserbaseSession) -> bool:
+        self.checked.append(session.id)
+        return session.id not in self.dead
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pool(fake: _FakeBrowserbase, clock: _Clock, **overrides: Any) -> BrowserbaseSessionPool:
+    settings = Settings(
+        browserbase_pool_min_size=overrides.pop("min_size", 1),
+        browserbase_pool_max_size=overrides.pop("max_size", 3),
+        browserbase_pool_idle_seconds=60,
+        browserbase_pool_health_check_seconds=10,
+    )
+    return BrowserbaseSessionPool(settings, fake.create, fake.release, fake.check, clock)
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_serves_steady_traffic_without_creating_sessions() -> None:
+    fake = _FakeBrowserbase()
+    pool = _pool(fake, _Clock())
+    await pool.maintain()
+    assert fake.created == ["session-0"] and pool.idle == 1
+
+    for _ in range(5):
+        async with pool.lease() as session:
+            assert session.id in ("session-0", "session-1")
+            await asyncio.sleep(0.01)
+        await pool.maintain()
+
+    # One spare beyond the leased session, then every lease is served from the pool.
+    assert fake.created == ["session-0", "session-1"]
+    assert pool.reused == 5 and fake.checked == []
+
+
+@pytest.mark.asyncio
+async def test_pool_grows_with_queue_depth_and_caps_at_max_size() -> None:
+    fake = _FakeBrowserbase()
+    fake.create_delay = 0.01
+    pool = _pool(fake, _Clock(), min_size=0, max_size=3)
+    active = 0
+    peak = 0
+
+    async def resolve() -> None:
+        nonlocal active, peak
+        async with pool.lease():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    await asyncio.gather(*(resolve() for _ in range(8)))
+
+    assert peak == 3
+    assert len(fake.created) == 3
+    assert pool.size == 3 and pool.idle == 3
+
+
+@pytest.mark.asyncio
+async def test_idle_eviction_health_checks_and_shutdown_release() -> None:
+    fake = _FakeBrowserbase()
+    clock = _Clock()
+    pool = _pool(fake, clock, min_size=1, max_size=3)
+
+    async def hold() -> None:
+        async with pool.lease():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(hold(), hold(), hold())
+    assert pool.idle == 3
+
+    clock.now += 61
+    await pool.maintain()
+    # Idle sessions above the one warm spare are released.
+    assert pool.idle == 1 and len(fake.released) == 2
+    (survivor,) = [session for session in fake.created if session not in fake.released]
+
+    # A dead session is found by its health check and replaced before being leased.
+    fake.dead.add(survivor)
+    clock.now += 11
+    async with pool.lease() as session:
+        assert session.id != survivor
+    assert survivor in fake.checked and survivor in fake.released
+
+    # An error during a lease makes the session suspect until checked again.
+    with pytest.raises(RuntimeError):
+        async with pool.lease() as session:
+            failed = session.id
+            raise RuntimeError("page crashed")
+    checks = len(fake.checked)
+    async with pool.lease() as session:
+        assert session.id == failed
+    assert len(fake.checked) == checks + 1
+
+    await pool.aclose()
+    assert set(fake.released) == set(fake.created)
+    with pytest.raises(RuntimeError):
+        async with pool.lease():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_pooled_lookups_share_no_live_view(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _FakeBrowserbase()
+    pool = _pool(fake, _Clock())
+    leased: List[str] = []
+
+    async def find_pdf_link(session: BrowserbaseSession, grant_url: str, keep_pages: bool = False) -> str:
+        leased.append(session.id)
+        return f"{grant_url}/form.pdf"
+
+    monkeypatch.setattr(browserbase_service, "get_browserbase_pool", lambda: pool)
+    monkeypatch.setattr(browserbase_service, "_find_pdf_link", find_pdf_link)
+
+    result = await browserbase_service.get_pdf_link_from_grant_page("https://www.alberta.ca/cfep")
+
+    # The session is back in the pool for the next lookup, so neither its id nor its Live View leaks.
+    assert result == {"session_id": None, "live_view_url": None, "pdf_link": "https://www.alberta.ca/cfep/form.pdf"}
+    assert leased == ["session-0"] and pool.idle == 1
+
+
+@pytest.mark.asyncio
+async def test_live_view_lookups_get_a_dedicated_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _FakeBrowserbase()
+    pool = _pool(fake, _Clock())
+    disconnected: List[str] = []
+
+    class _Driver:
+        async def disconnect(self, key: str) -> None:
+            disconnected.append(key)
+
+    async def find_pdf_link(session: BrowserbaseSession, grant_url: str, keep_pages: bool = False) -> str:
+        assert keep_pages
+        if grant_url.endswith("missing"):
+            raise browserbase_service.PdfLinkNotFoundError("missing")
+        return f"{grant_url}/form.pdf"
+
+    monkeypatch.setattr(browserbase_service, "get_browserbase_pool", lambda: pool)
+    monkeypatch.setattr(browserbase_service, "create_session", fake.create)
+    monkeypatch.setattr(browserbase_service, "release_session", fake.release)
+    monkeypatch.setattr(browserbase_service, "get_playwright_driver", _Driver)
+    monkeypatch.setattr(browserbase_service, "_find_pdf_link", find_pdf_link)
+
+    result = await browserbase_service.get_pdf_link_from_grant_page("https://www.alberta.ca/cfep", live_view=True)
+
+    # The user's session stays running for its Live View and never enters the pool.
+    assert result == {
+        "session_id": "session-0",
+        "live_view_url": "https://x",
+        "pdf_link": "https://www.alberta.ca/cfep/form.pdf",
+    }
+    assert disconnected == ["session-0"] and fake.released == [] and pool.idle == 0
+
+    with pytest.raises(browserbase_service.PdfLinkNotFoundError):
+        await browserbase_service.get_pdf_link_from_grant_page("https://www.alberta.ca/missing", live_view=True)
+    assert fake.released == ["session-1"]
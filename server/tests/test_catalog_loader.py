@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from app.services.catalog.loader import CatalogLoader
+from app.services.catalog.snapshot import StoredGrants
+
+
+def _record(title: str, **overrides: Any) -> dict[str, Any]:
+    return {"title": title, "link": f"https://example.ca/{title.lower().replace(' ', '-')}", **overrides}
+
+
+def _write(path: Path, records: List[dict[str, Any]]) -> None:
+    path.write_text(json.dumps(records), encoding="utf-8")
+    # Force a visible mtime change even on filesystems with coarse timestamps.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_refresh_applies_diffs_and_reuses_unchanged_grants(tmp_path: Path) -> None:
+    path = tmp_path / "grants.json"
+    _write(path, [_record("Arts Fund"), _record("Youth Fund"), _record("Old Fund")])
+    loader = CatalogLoader(path)
+    first = loader.current()
+
+    _write(path, [_record("Arts Fund"), _record("Youth Fund", amount_max=5_000), _record("New Fund")])
+    diff = loader.refresh()
+    second = loader.current()
+
+    assert diff is not None and (diff.added, diff.removed, diff.unchanged) == (2, 2, 1)
+    assert [grant.title for grant in second.catalog.grants] == ["Arts Fund", "Youth Fund", "New Fund"]
+    assert second.catalog.grants[0] is first.catalog.grants[0]
+    assert second.catalog.grants[1].amount_max == 5_000
+    assert second.version != first.version
+    # The earlier snapshot is untouched for searches still holding it.
+    assert [grant.title for grant in first.catalog.grants] == ["Arts Fund", "Youth Fund", "Old Fund"]
+
+
+def test_touch_without_edit_and_invalid_updates_keep_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "grants.json"
+    _write(path, [_record("Arts Fund")])
+    loader = CatalogLoader(path)
+    catalog = loader.current().catalog
+
+    _write(path, [_record("Arts Fund")])
+    assert loader.refresh() is None
+    assert loader.current().catalog is catalog
+
+    path.write_text("[{", encoding="utf-8")
+    assert loader.refresh() is None
+    assert loader.current().catalog is catalog
+
+
+def test_missing_file_fails_first_load(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        CatalogLoader(tmp_path / "missing.json").current()
+
+
+def test_reloads_are_compiled_by_a_worker_and_memory_mapped(tmp_path: Path) -> None:
+    path = tmp_path / "grants.json"
+    builds = tmp_path / "builds"
+    _write(path, [_record("Arts Fund"), _record("Old Fund")])
+    loader = CatalogLoader(path, build_directory=builds)
+    first = loader.current()
+
+    _write(path, [_record("Arts Fund"), _record("New Fund")])
+    diff = loader.refresh()
+    second = loader.current()
+
+    assert diff is not None and (diff.added, diff.removed, diff.unchanged) == (1, 1, 1)
+    assert [grant.title for grant in second.catalog.grants] == ["Arts Fund", "New Fund"]
+    assert isinstance(second.catalog.grants, StoredGrants)
+    assert (builds / second.version).is_dir()
+    assert [grant.title for grant in first.catalog.grants] == ["Arts Fund", "Old Fund"]
+
+    _write(path, [_record("New Fund")])
+    loader.refresh()
+    third = loader.current()
+    _write(path, [_record("Youth Fund")])
+    loader.refresh()
+    # Only the active version and the one in-flight searches may still hold are kept.
+    assert {entry.name for entry in builds.iterdir() if entry.is_dir()} == {third.version, loader.current().version}
+
+    _write(path, [{"link": "https://example.ca/untitled"}])
+    assert loader.refresh() is None
+    assert [grant.title for grant in loader.current().catalog.grants] == ["Youth Fund"]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from app.models.schemas import Grant, GrantFilters
+from app.services.catalog.index import GrantCatalog
+from app.services.catalog.loader import CatalogLoader
+from app.services.catalog.snapshot import compile_snapshot, open_snapshot, write_snapshot
+
+SAMPLES_PATH = Path(__file__).resolve().parent.parent / "app" / "data" / "samples" / "grants_sample.json"
+
+
+def _grants() -> list[Grant]:
+    return [
+        Grant.model_validate(
+            {
+                "title": "Youth Sport Fund",
+                "link": "https://www.alberta.ca/youth-sport",
+                "summary": "Supports youth sport and recreation",
+                "deadline": "2025-03-01",
+                "amount_max": 75_000,
+                "region": "Alberta",
+                "tags": ["youth", "sport"],
+                "source_citations": ["https://www.alberta.ca/youth-sport"],
+            }
+        ),
+        Grant.model_validate(
+            {
+                "title": "Fonds culturel québécois",
+                "link": "https://www.quebec.ca/culture",
+                "summary": None,
+                "currency": None,
+                "region": "Prairies",
+                "tags": [],
+            }
+        ),
+        Grant.model_validate({"title": "Open Fund", "link": "https://example.ca/open", "program": "Youth capacity"}),
+    ]
+
+
+def test_snapshot_round_trips_grants_and_indexes(tmp_path: Path) -> None:
+    grants = _grants()
+    write_snapshot(grants, tmp_path, "v1")
+
+    stored, version = open_snapshot(tmp_path)
+    built = GrantCatalog(grants)
+
+    assert version == "v1"
+    assert list(stored.grants) == grants
+    for filters in (
+        None,
+        GrantFilters(province="AB"),
+        GrantFilters(province="prairies"),
+        GrantFilters(deadline_before=date(2025, 6, 1), min_amount=10_000),
+    ):
+        assert stored.filter_ids(filters) == built.filter_ids(filters)
+    for tags in (["youth"], ["youth sport"], ["québécois"], ["capacity", "arts"]):
+        ids = list(range(len(grants)))
+        assert stored.sort_by_relevance(ids, tags) == built.sort_by_relevance(ids, tags)
+        assert stored.sort_by_relevance(ids, tags, limit=1) == built.sort_by_relevance(ids, tags, limit=1)
+
+
+def test_compiled_sample_catalog_matches_json(tmp_path: Path) -> None:
+    compile_snapshot(SAMPLES_PATH, tmp_path)
+
+    stored, _ = open_snapshot(tmp_path)
+    raw = json.loads(SAMPLES_PATH.read_text(encoding="utf-8"))
+
+    assert stored.materialize(range(len(stored))) == [Grant.model_validate(item) for item in raw]
+
+
+def test_loader_follows_published_snapshot_versions(tmp_path: Path) -> None:
+    grants = _grants()
+    write_snapshot(grants[:1], tmp_path, "v1")
+    loader = CatalogLoader(tmp_path)
+    first = loader.current()
+
+    write_snapshot(grants, tmp_path, "v2")
+    manifest = tmp_path / "manifest.json"
+    stat = manifest.stat()
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    loader.refresh()
+
+    assert (first.version, len(first.catalog)) == ("v1", 1)
+    assert (loader.current().version, len(loader.current().catalog)) == ("v2", 3)
+
+
+def test_snapshot_filters_index_memory_mapped_postings(tmp_path: Path) -> None:
+    regions = ["Alberta", "Ontario", "National", None, "Prairies"]
+    grants = [
+        Grant.model_validate(
+            {
+                "title": f"Grant {index}",
+                "link": f"https://example.ca/grant-{index}",
+                "region": regions[index % len(regions)],
+                "deadline": f"2025-{index % 12 + 1:02d}-01" if index % 3 else None,
+                "amount_max": index * 1_000 if index % 4 else None,
+            }
+        )
+        for index in range(200)
+    ]
+    write_snapshot(grants, tmp_path, "v1")
+    stored, _ = open_snapshot(tmp_path)
+    built = GrantCatalog(grants)
+
+    # Filtering indexes the mapped postings directly instead of copying them into Python sets.
+    assert isinstance(stored._deadline_ids, np.memmap) or isinstance(stored._deadline_ids.base, np.memmap)
+    for province in (None, "AB", "ON", "prairies"):
+        for deadline_before in (None, date(2025, 6, 1)):
+            for min_amount in (None, 50_000):
+                filters = GrantFilters(province=province, deadline_before=deadline_before, min_amount=min_amount)
+                assert stored.filter_ids(filters) == built.filter_ids(filters)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Optional
+
+import pytest
+
+from app.models.schemas import Grant, GrantFilters
+from app.services.catalog.index import GrantCatalog
+from app.services.parsing.enrichment import enrich_grant, enrich_grants, extract_amounts, extract_deadline
+
+TODAY = date(2025, 6, 1)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Grants of up to $125,000 are available.", (None, 125_000)),
+        ("Matching funds between $5,000 and $25,000.", (5_000, 25_000)),
+        ("Awards range from $10,000–$50,000 per project.", (10_000, 50_000)),
+        ("A minimum request of $1,000 and a maximum of $75K.", (1_000, 75_000)),
+        ("Funding of $1.5 million over three years.", (None, 1_500_000)),
+        ("Eligible costs exceed US$ 500; contributions of CAD 2,500.", (None, 2_500)),
+        ("No dollar figures on this page.", (None, None)),
+        ("An application fee of $50 applies to every submission.", (None, None)),
+        ("The program has a total budget of $10 million this year.", (None, None)),
+        ("Open to ventures that raised funding from $250,000 investors.", (None, None)),
+        ("Since 2010 the fund has paid out $4 million. Grants of up to $20,000.", (None, 20_000)),
+    ],
+)
+def test_extract_amounts(text: str, expected: tuple[Optional[int], Optional[int]]) -> None:
+    assert extract_amounts(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Applications close on March 1, 2026.", date(2026, 3, 1)),
+        ("Deadline: 15 September 2025", date(2025, 9, 15)),
+        ("Apply by Jan. 15.", date(2026, 1, 15)),
+        ("The intake closes 2025-10-01 at noon.", date(2025, 10, 1)),
+        ("The deadline is October 31st", date(2025, 10, 31)),
+        ("Founded on May 4, 1999. The deadline has passed.", None),
+        ("Deadline: February 30, 2026", None),
+    ],
+)
+def test_extract_deadline(text: str, expected: Optional[date]) -> None:
+    assert extract_deadline(text, TODAY) == expected
+
+
+def test_enriched_columns_drive_catalog_filters() -> None:
+    text = "Grants of up to $50,000. Applications are due by August 15, 2025."
+    base = Grant.model_validate({"title": "Arts Fund", "link": "https://www.alberta.ca/arts"})
+    enriched = enrich_grant(base, text, TODAY)
+    provided = enrich_grant(base.model_copy(update={"amount_max": 10_000}), text, TODAY)
+
+    assert (enriched.deadline, enriched.amount_min, enriched.amount_max) == (date(2025, 8, 15), None, 50_000)
+    assert (provided.deadline, provided.amount_max) == (date(2025, 8, 15), 10_000)
+
+    catalog = GrantCatalog([enriched])
+    assert catalog.filter_ids(GrantFilters(min_amount=60_000)) == []
+    assert catalog.filter_ids(GrantFilters(deadline_before=date(2025, 8, 1))) == []
+    assert catalog.filter_ids(GrantFilters(min_amount=25_000, deadline_before=date(2025, 9, 1))) == [0]
+
+
+def test_enrich_grants_reads_the_search_snippet() -> None:
+    grant = Grant.model_validate(
+        {
+            "title": "Community Grant",
+            "link": "https://www.alberta.ca/community-grant",
+            "summary": "Grants of up to $75,000. Apply by September 30, 2025.",
+        }
+    )
+    (enriched,) = enrich_grants([grant], TODAY)
+
+    assert (enriched.deadline, enriched.amount_max) == (date(2025, 9, 30), 75_000)
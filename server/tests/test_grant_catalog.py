@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from app.core.config import Settings
+from app.models.schemas import Grant, GrantFilters, OrganizationInfo
+from app.services.catalog.index import GrantCatalog
+from app.services.catalog.provinces import (
+    ALL_PROVINCES,
+    NO_PROVINCES,
+    PROVINCES,
+    host_mask,
+    province_bit,
+    region_mask,
+)
+from app.services.grant_finder_service import GrantFinderService, _load_mock_catalog
+
+
+def _grant(title: str, **overrides: Any) -> Grant:
+    data: dict[str, Any] = {"title": title, "link": f"https://example.ca/{title.lower().replace(' ', '-')}"}
+    data.update(overrides)
+    return Grant.model_validate(data)
+
+
+def _catalog() -> GrantCatalog:
+    return GrantCatalog(
+        [
+            _grant("National Fund", region="National", amount_max=50_000),
+            _grant("Alberta Arts", region="Alberta", deadline=date(2025, 3, 1), amount_min=1_000, amount_max=5_000),
+            _grant("CFEP Small", link="https://www.alberta.ca/cfep-small", region="Prairies", amount_max=125_000),
+            _grant("Ontario Trillium", region="ON", deadline=date(2025, 9, 1)),
+            _grant("Regionless", tags=["youth"]),
+        ]
+    )
+
+
+def test_province_filter_uses_region_aliases_and_hosts() -> None:
+    catalog = _catalog()
+
+    titles = [grant.title for grant in catalog.filter(GrantFilters(province="AB"))]
+
+    assert titles == ["National Fund", "Alberta Arts", "CFEP Small", "Regionless"]
+
+
+def test_province_filter_resolves_codes_and_names_alike() -> None:
+    catalog = _catalog()
+
+    for province in ("on", "Ontario", " ONTARIO "):
+        titles = [grant.title for grant in catalog.filter(GrantFilters(province=province))]
+        assert titles == ["National Fund", "Ontario Trillium", "Regionless"]
+
+
+def test_unknown_region_labels_match_by_text() -> None:
+    catalog = _catalog()
+
+    titles = [grant.title for grant in catalog.filter(GrantFilters(province="prairies"))]
+
+    assert titles == ["National Fund", "CFEP Small", "Regionless"]
+
+
+def test_region_mask_covers_multi_province_regions() -> None:
+    assert region_mask("Alberta, Saskatchewan") == province_bit("AB") | province_bit("sk")
+    assert region_mask("NL / PEI") == province_bit("nl") | province_bit("pe")
+    assert region_mask("Newfoundland and Labrador") == province_bit("NL")
+    assert region_mask("National") == region_mask(None) == ALL_PROVINCES
+    assert region_mask("ab") == region_mask("AB / SK") & province_bit("ab")
+
+
+def test_region_mask_ignores_lower_case_words_that_spell_codes() -> None:
+    assert region_mask("Programs based on PEI") == province_bit("pe")
+    assert region_mask("Rural communities on the coast") == NO_PROVINCES
+    assert region_mask("Communities in ns and pe") == NO_PROVINCES
+    assert region_mask("Based in ON") == province_bit("on")
+
+
+def test_every_province_resolves_from_its_official_host() -> None:
+    for province in PROVINCES:
+        link = f"https://www.{province.hosts[0]}/funding"
+        assert host_mask(link) == province_bit(province.code) == province_bit(province.name)
+    assert host_mask("https://notalberta.ca/funding") == NO_PROVINCES
+
+
+def test_deadline_and_amount_filters_intersect() -> None:
+    catalog = _catalog()
+    filters = GrantFilters(deadline_before=date(2025, 6, 1), min_amount=10_000)
+
+    titles = [grant.title for grant in catalog.filter(filters)]
+
+    # Undated grants pass deadline filters and grants without amounts pass amount filters.
+    assert titles == ["National Fund", "CFEP Small", "Regionless"]
+
+
+def test_relevance_sort_is_stable_and_weighted() -> None:
+    catalog = GrantCatalog(
+        [
+            _grant("General Fund"),
+            _grant("Youth Sport", summary="Youth sport programs", tags=["Youth", "sport"]),
+            _grant("Capacity", program="Youth capacity"),
+            _grant("Other General Fund"),
+        ]
+    )
+
+    ordered = catalog.sort_by_relevance(range(len(catalog)), ["youth"])
+
+    assert [catalog.grants[grant_id].title for grant_id in ordered] == [
+        "Youth Sport",
+        "Capacity",
+        "General Fund",
+        "Other General Fund",
+    ]
+
+
+def test_mock_search_reads_from_cached_catalog() -> None:
+    service = GrantFinderService(Settings(mode="mock"))
+    organization = OrganizationInfo(legal_name="Seniors Society", sector_tags=["seniors"])
+
+    grants = service._find_grants_mock(organization, GrantFilters(province="AB", max_results=2))
+
+    assert _load_mock_catalog() is _load_mock_catalog()
+    assert len(grants) == 2
+    assert grants[0].title == "New Horizons for Seniors Program"
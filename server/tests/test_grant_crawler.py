@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.models.schemas import OrganizationInfo
+from app.services.grant_crawler import CRAWL_RETENTION_SECONDS, CrawlStore, GrantCrawler
+from app.services.grant_finder_service import ALBERTA_PROGRAM_SEEDS, GrantFinderService, get_catalog_loader
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.results: List[Dict[str, Any]] = [
+            {"url": "https://www.alberta.ca/cfep-small", "title": "CFEP Small", "snippet": "Facility grants."},
+            {"url": "https://www.alberta.ca/cip-operating-grant", "title": "CIP Operating", "snippet": "Operating."},
+            {"url": "https://example.com/blog", "title": "Not a grant"},
+        ]
+        self.calls: List[Dict[str, Any]] = []
+        self.fail = False
+
+    async def search(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls.append(kwargs)
+        if self.fail:
+            raise httpx.ConnectError("down")
+        return {"results": [dict(item) for item in self.results]}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _settings(tmp_path: Path, **overrides: Any) -> Settings:
+    return Settings(
+        mode="live",
+        perplexity_api_key="key",
+        crawl_interval_seconds=3600,
+        crawl_catalog_path=str(tmp_path / "crawled.json"),
+        crawl_state_path=str(tmp_path / "state.sqlite3"),
+        **overrides,
+    )
+
+
+def _crawler(tmp_path: Path, client: _FakeClient, clock: _Clock, **overrides: Any) -> GrantCrawler:
+    settings = _settings(tmp_path, **overrides)
+    return GrantCrawler(settings, CrawlStore(Path(settings.crawl_state_path)), client, clock)  # type: ignore[arg-type]
+
+
+def test_seed_batches_cover_alberta_and_configured_seeds(tmp_path: Path) -> None:
+    crawler = _crawler(tmp_path, _FakeClient(), _Clock(), crawl_seed_queries=["site:gov.bc.ca grants"])
+
+    batches = crawler.seed_batches()
+
+    alberta = [query for queries, domains in batches if domains == ["alberta.ca"] for query in queries]
+    assert [query.split()[0] for query in alberta] == ALBERTA_PROGRAM_SEEDS
+    assert batches[-1] == (["site:gov.bc.ca grants"], None)
+
+
+@pytest.mark.asyncio
+async def test_only_new_or_changed_pages_are_reparsed(tmp_path: Path) -> None:
+    client = _FakeClient()
+    clock = _Clock()
+    crawler = _crawler(tmp_path, client, clock)
+
+    first = await crawler.crawl_once()
+    assert (first.fetched, first.added, first.changed, first.unchanged, first.published) == (3, 3, 0, 0, True)
+    catalog = get_catalog_loader(crawler.settings.crawl_catalog_path).current().catalog
+    assert [grant.title for grant in catalog.grants] == ["CFEP Small", "CIP Operating"]
+
+    clock.now += 60
+    second = await crawler.crawl_once()
+    assert (second.added, second.changed, second.unchanged, second.published) == (0, 0, 3, False)
+
+    client.results[0]["snippet"] = "Facility grants of up to $125,000."
+    client.results.append({"url": "https://www.alberta.ca/other-initiatives-program", "title": "Other Initiatives"})
+    clock.now += 60
+    third = await crawler.crawl_once()
+    assert (third.added, third.changed, third.unchanged, third.published) == (1, 1, 2, True)
+    catalog = get_catalog_loader(crawler.settings.crawl_catalog_path).current().catalog
+    assert [grant.summary for grant in catalog.grants][0] == "Facility grants of up to $125,000."
+    assert catalog.grants[0].amount_max == 125_000
+    assert len(catalog) == 3
+
+
+@pytest.mark.asyncio
+async def test_pages_whose_urls_need_percent_encoding_are_stored(tmp_path: Path) -> None:
+    client = _FakeClient()
+    client.results = [
+        {
+            "url": "https://www.alberta.ca/québec grant",
+            "title": "Québec Partnership Grant",
+            "snippet": "Grants of up to $5,000.",
+        }
+    ]
+    crawler = _crawler(tmp_path, client, _Clock())
+
+    stats = await crawler.crawl_once()
+
+    assert (stats.fetched, stats.added, stats.published) == (1, 1, True)
+    catalog = get_catalog_loader(crawler.settings.crawl_catalog_path).current().catalog
+    assert [grant.title for grant in catalog.grants] == ["Québec Partnership Grant"]
+    assert catalog.grants[0].amount_max == 5_000
+
+
+@pytest.mark.asyncio
+async def test_a_page_that_fails_validation_is_logged_without_losing_the_rest(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    client = _FakeClient()
+    client.results.append({"url": "https://alberta.ca:99999/broken", "title": "Broken Grant"})
+    crawler = _crawler(tmp_path, client, _Clock())
+
+    with caplog.at_level(logging.WARNING):
+        stats = await crawler.crawl_once()
+
+    assert (stats.fetched, stats.added, stats.published) == (4, 4, True)
+    catalog = get_catalog_loader(crawler.settings.crawl_catalog_path).current().catalog
+    assert [grant.title for grant in catalog.grants] == ["CFEP Small", "CIP Operating"]
+    assert "https://alberta.ca:99999/broken" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_failed_crawl_and_retention(tmp_path: Path) -> None:
+    client = _FakeClient()
+    clock = _Clock()
+    crawler = _crawler(tmp_path, client, clock)
+    await crawler.crawl_once()
+
+    client.fail = True
+    failed = await crawler.crawl_once()
+    assert failed.published is False and failed.failed_batches == len(crawler.seed_batches())
+
+    client.fail = False
+    client.results = client.results[1:]
+    clock.now += CRAWL_RETENTION_SECONDS + 1
+    stats = await crawler.crawl_once()
+    assert stats.published is True
+    catalog = get_catalog_loader(crawler.settings.crawl_catalog_path).current().catalog
+    assert [grant.title for grant in catalog.grants] == ["CIP Operating"]
+
+
+@pytest.mark.asyncio
+async def test_live_search_reads_crawled_catalog(tmp_path: Path) -> None:
+    client = _FakeClient()
+    crawler = _crawler(tmp_path, client, _Clock())
+    service = GrantFinderService(crawler.settings)
+    assert service._local_catalog_loader() is None
+
+    await crawler.crawl_once()
+    calls = len(client.calls)
+    grants = await service.find_grants(OrganizationInfo(legal_name="Hall Society", sector_tags=["facility"]))
+
+    assert grants[0].title == "CFEP Small"
+    assert len(client.calls) == calls
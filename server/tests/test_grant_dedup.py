@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.models.schemas import Grant
+from app.services.catalog.loader import CatalogLoader
+from app.services.parsing.dedup import dedupe_grants
+from app.services.parsing.grants_parser import parse_grants_from_search
+from app.services.parsing.urls import canonical_url
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "https://www.alberta.ca/cfep",
+        "http://alberta.ca/cfep/",
+        "https://ALBERTA.ca:443/cfep#apply",
+        "https://www.alberta.ca/cfep?utm_source=news&utm_medium=email",
+        "https://alberta.ca/cfep?fbclid=abc123",
+    ],
+)
+def test_canonical_url_collapses_variants(variant: str) -> None:
+    assert canonical_url(variant) == "https://alberta.ca/cfep"
+
+
+def test_canonical_url_keeps_content_query_sorted() -> None:
+    assert canonical_url("https://alberta.ca/search?q=arts&page=2&utm_campaign=x") == "https://alberta.ca/search?page=2&q=arts"
+    assert canonical_url("https://alberta.ca:8443/cfep") == "https://alberta.ca:8443/cfep"
+
+
+def _grant(link: str, **fields: object) -> Grant:
+    return Grant.model_validate({"title": "CFEP", "link": link, "source_citations": [link], **fields})
+
+
+def test_dedupe_merges_citations_and_keeps_richest_fields() -> None:
+    grants = [
+        _grant("https://www.alberta.ca/cfep", summary="Short.", tags=["capacity"]),
+        _grant("https://example.org/other"),
+        _grant(
+            "http://alberta.ca/cfep/?utm_source=x",
+            summary="A much longer description of the program.",
+            amount_max=75000,
+            tags=["Capacity", "facilities"],
+            source_citations=["https://alberta.ca/cfep", "https://www.canada.ca/cfep-news"],
+        ),
+    ]
+
+    merged = dedupe_grants(grants)
+
+    assert [str(grant.link) for grant in merged] == ["https://www.alberta.ca/cfep", "https://example.org/other"]
+    first = merged[0]
+    assert first.summary == "A much longer description of the program."
+    assert first.amount_max == 75000
+    assert first.tags == ["capacity", "facilities"]
+    assert [str(url) for url in first.source_citations or []] == [
+        "https://www.alberta.ca/cfep",
+        "https://www.canada.ca/cfep-news",
+    ]
+    assert merged[1] is grants[1]
+
+
+def test_parser_collapses_url_variants() -> None:
+    response = {
+        "results": [
+            {"url": "https://www.alberta.ca/cfep", "title": "CFEP", "snippet": "Apply"},
+            {"url": "https://www.alberta.ca/cfep/#eligibility", "title": "CFEP", "snippet": "Apply by the deadline"},
+        ]
+    }
+
+    grants = parse_grants_from_search(response)
+
+    assert len(grants) == 1
+    assert grants[0].summary == "Apply by the deadline"
+
+
+def test_catalog_loader_collapses_duplicate_records(tmp_path: Path) -> None:
+    path = tmp_path / "grants.json"
+    records = [
+        {"title": "CFEP", "link": "https://www.alberta.ca/cfep"},
+        {"title": "CFEP", "link": "https://alberta.ca/cfep?utm_source=feed", "summary": "Community facilities."},
+    ]
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+    catalog = CatalogLoader(path).current().catalog
+
+    assert len(catalog) == 1
+    assert catalog.grants[0].summary == "Community facilities."
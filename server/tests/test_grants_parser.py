@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import Grant
+from app.services.parsing.grants_parser import parse_grants_from_search
+
+
+def test_batch_parse_matches_per_record_validation() -> None:
+    response = {
+        "results": [
+            {"url": "https://www.alberta.ca/cfep", "title": "CFEP", "snippet": "Apply now", "tags": ["capacity"]},
+            {"link": "https://www.canada.ca/en/new-horizons", "title": "New Horizons", "text": "Seniors"},
+            {"url": "https://example.com/grant", "title": "Not Canadian"},
+            {"url": "https://www.ALBERTA.ca/hub", "program": "Hub Program", "extracted_eligibility": "Non-profits"},
+            "not a result",
+            {"title": "No URL"},
+        ]
+    }
+
+    grants = parse_grants_from_search(response)
+
+    assert grants == [
+        Grant.model_validate(
+            {
+                "title": "CFEP",
+                "link": "https://www.alberta.ca/cfep",
+                "summary": "Apply now",
+                "eligibility": None,
+                "deadline": None,
+                "amount_min": None,
+                "amount_max": None,
+                "currency": "CAD",
+                "sponsor": "Government of Alberta",
+                "program": "CFEP",
+                "region": "Alberta",
+                "tags": ["capacity"],
+                "source_citations": ["https://www.alberta.ca/cfep"],
+            }
+        ),
+        Grant.model_validate(
+            {
+                "title": "New Horizons",
+                "link": "https://www.canada.ca/en/new-horizons",
+                "summary": "Seniors",
+                "eligibility": None,
+                "deadline": None,
+                "amount_min": None,
+                "amount_max": None,
+                "currency": "CAD",
+                "sponsor": "Government of Canada",
+                "program": "New Horizons",
+                "region": "National",
+                "tags": None,
+                "source_citations": ["https://www.canada.ca/en/new-horizons"],
+            }
+        ),
+        Grant.model_validate(
+            {
+                "title": "Hub Program",
+                "link": "https://www.ALBERTA.ca/hub",
+                "summary": None,
+                "eligibility": "Non-profits",
+                "deadline": None,
+                "amount_min": None,
+                "amount_max": None,
+                "currency": "CAD",
+                "sponsor": "Government of Alberta",
+                "program": "Hub Program",
+                "region": "Alberta",
+                "tags": None,
+                "source_citations": ["https://www.ALBERTA.ca/hub"],
+            }
+        ),
+    ]
+
+
+def test_malformed_records_still_fail_validation() -> None:
+    with pytest.raises(ValidationError):
+        parse_grants_from_search({"results": [{"url": "https://www.alberta.ca/x", "title": "X", "tags": "youth"}]})
+
+    with pytest.raises(ValueError):
+        parse_grants_from_search({"results": None})
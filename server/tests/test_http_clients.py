@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.core.http_clients import HttpClientRegistry
+
+
+@pytest.mark.asyncio
+async def test_named_clients_are_shared_until_closed() -> None:
+    registry = HttpClientRegistry(Settings(http_max_connections_per_client=4))
+
+    perplexity = registry.get("perplexity")
+    assert registry.get("perplexity") is perplexity
+    assert registry.get("downloads") is not perplexity
+
+    await registry.aclose()
+
+    assert perplexity.is_closed
+    assert registry.get("perplexity") is not perplexity
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_from_a_closed_loop_is_closed_when_replaced() -> None:
+    registry = HttpClientRegistry(Settings())
+
+    async def borrow() -> httpx.AsyncClient:
+        return registry.get("pages")
+
+    stale = await asyncio.to_thread(asyncio.run, borrow())
+    fresh = registry.get("pages")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert fresh is not stale
+    assert stale.is_closed
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_from_a_running_loop_is_closed_on_that_loop() -> None:
+    registry = HttpClientRegistry(Settings())
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+
+        async def borrow() -> httpx.AsyncClient:
+            return registry.get("pages")
+
+        stale = asyncio.run_coroutine_threadsafe(borrow(), other_loop).result(timeout=5)
+        fresh = registry.get("pages")
+        # Anything queued on the other loop after the close has run once it completes.
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop))
+
+        assert fresh is not stale
+        assert stale.is_closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(timeout=5)
+        other_loop.close()
+    await registry.aclose()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.models.schemas import OrganizationInfo
+from app.services.grant_finder_service import GrantFinderService
+from app.services.perplexity_client import PERPLEXITY_MAX_QUERIES_PER_CALL
+
+
+class _FakeClient:
+    def __init__(self, failing_query: str | None = None) -> None:
+        self.calls: List[List[str]] = []
+        self.failing_query = failing_query
+
+    async def iter_results(self, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        for item in (await self.search(**kwargs))["results"]:
+            yield item
+
+    async def search(self, *, query: List[str], **_: Any) -> Dict[str, Any]:
+        self.calls.append(query)
+        if self.failing_query in query:
+            raise httpx.ConnectError("boom")
+        return {
+            "results": [
+                {"url": f"https://www.alberta.ca/{seed.split('/')[-1].split()[0]}/", "title": seed}
+                for seed in query
+            ]
+            + [{"url": "https://alberta.ca/shared-page?utm_source=x", "title": "Shared"}]
+        }
+
+
+def _service() -> GrantFinderService:
+    return GrantFinderService(Settings(mode="live", perplexity_api_key="key"))
+
+
+async def _collect(
+    service: GrantFinderService, client: _FakeClient, queries: List[str], **search_kwargs: Any
+) -> List[Dict[str, Any]]:
+    return [item async for item in service._iter_search_batches(client, queries, **search_kwargs)]  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_all_seeds_are_sent_in_batches_within_limit() -> None:
+    service = _service()
+    queries = service._build_multi_queries_for_alberta(OrganizationInfo(legal_name="Org"), None, 10)
+    client = _FakeClient()
+
+    results = await _collect(service, client, queries, max_results=10)
+
+    assert sorted(query for batch in client.calls for query in batch) == sorted(queries)
+    assert all(len(batch) <= PERPLEXITY_MAX_QUERIES_PER_CALL for batch in client.calls)
+    urls = [item["url"] for item in results]
+    assert len(urls) == len(queries) + 1  # the shared page is kept once
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_tolerated_unless_all_fail() -> None:
+    service = _service()
+    queries = [f"site:alberta.ca/program-{index}" for index in range(6)]
+
+    results = await _collect(service, _FakeClient(failing_query=queries[0]), queries)
+    assert {item["title"] for item in results} == set(queries[3:]) | {"Shared"}
+
+    class _AlwaysFails(_FakeClient):
+        async def search(self, *, query: List[str], **_: Any) -> Dict[str, Any]:
+            raise httpx.ConnectError("down")
+
+    with pytest.raises(httpx.ConnectError):
+        await _collect(service, _AlwaysFails(), queries)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.core.config import Settings
+from app.models.schemas import Grant, OrganizationInfo
+from app.services.catalog.index import GrantCatalog
+from app.services.catalog.minhash import cluster_ids, signatures
+from app.services.catalog.snapshot import open_snapshot, write_snapshot
+from app.services.grant_finder_service import GrantFinderService
+
+_CFEP_SUMMARY = (
+    "The Community Facility Enhancement Program provides matching grants to non-profit organizations "
+    "and municipalities to build, purchase, repair, renovate or upgrade public-use community facilities "
+    "across Alberta, including halls, arenas, playgrounds, libraries and museums."
+)
+
+
+def _grant(title: str, slug: str, **overrides: Any) -> Grant:
+    data: dict[str, Any] = {"title": title, "link": f"https://example.ca/{slug}"}
+    data.update(overrides)
+    return Grant.model_validate(data)
+
+
+def _grants() -> list[Grant]:
+    return [
+        _grant("CFEP Small", "cfep-small", summary=_CFEP_SUMMARY, tags=["facilities"]),
+        _grant("Youth Sport Fund", "youth", summary="Grants for youth sport and recreation programs.", tags=["youth"]),
+        _grant("CFEP Small", "cfep-small-mirror", summary=_CFEP_SUMMARY + " Apply online.", tags=["facilities"]),
+        _grant("CFEP Large", "cfep-large", summary="Large capital projects over $125,000 for facilities.", tags=["facilities"]),
+        _grant("Untitled", "untitled"),
+    ]
+
+
+def test_signature_agreement_estimates_jaccard_similarity() -> None:
+    rng = random.Random(7)
+    words = [f"word{index}" for index in range(2_000)]
+    base = [rng.choice(words) for _ in range(80)]
+    edited = list(base)
+    for position in range(0, 80, 8):
+        edited[position] = rng.choice(words)
+
+    matrix = signatures([" ".join(base), " ".join(base), " ".join(edited), "", "completely different text here"])
+
+    assert (matrix[0] == matrix[1]).all()
+    assert 0.3 < (matrix[0] == matrix[2]).mean() < 0.9
+    assert (matrix[0] == matrix[4]).mean() < 0.2
+    assert cluster_ids(matrix).tolist() == [0, 0, 2, 3, 4]
+
+
+def test_catalog_clusters_near_duplicate_pages() -> None:
+    catalog = GrantCatalog(_grants())
+
+    assert catalog.clusters.tolist() == [0, 1, 0, 3, 4]
+    assert catalog.collapse_near_duplicates([2, 1, 0, 3]) == [2, 1, 3]
+    assert catalog.collapse_near_duplicates([0, 2, 1, 3], limit=2) == [0, 1]
+
+
+def test_distinct_ranking_widens_to_fill_limit() -> None:
+    grants = _grants()
+    catalog = GrantCatalog(grants)
+    candidate_ids = list(range(len(grants)))
+
+    assert catalog.sort_by_relevance(candidate_ids, ["facilities"], limit=2) == [0, 2]
+    assert catalog.sort_by_relevance(candidate_ids, ["facilities"], limit=2, distinct=True) == [0, 3]
+    assert catalog.sort_by_relevance(candidate_ids, ["facilities"], distinct=True) == [0, 3, 1, 4]
+    assert catalog.sort_by_relevance(candidate_ids, [], limit=3, distinct=True) == [0, 1, 3]
+
+
+def test_search_results_hold_one_grant_per_cluster() -> None:
+    service = GrantFinderService(Settings(mode="mock"))
+    organization = OrganizationInfo(legal_name="Hall Society", sector_tags=["facilities"])
+
+    grants = service._apply_filters(_grants(), None, organization, limit=3)
+
+    assert [grant.link.path for grant in grants] == ["/cfep-small", "/cfep-large", "/youth"]
+
+
+def test_distinct_programs_with_shared_text_survive_when_collapsing_is_off() -> None:
+    # Two real streams of one program whose pages differ only in the title.
+    streams = [
+        _grant("CFEP Small", "cfep-small", summary=_CFEP_SUMMARY, tags=["facilities"]),
+        _grant("CFEP Large", "cfep-large", summary=_CFEP_SUMMARY, tags=["facilities"]),
+    ]
+    organization = OrganizationInfo(legal_name="Hall Society", sector_tags=["facilities"])
+
+    for ranker in ("sector", "bm25"):
+        collapsed = GrantFinderService(Settings(mode="mock", search_ranker=ranker))
+        assert len(collapsed._apply_filters(streams, None, organization, limit=5)) == 1
+
+        kept = GrantFinderService(Settings(mode="mock", search_ranker=ranker, search_collapse_near_duplicates=False))
+        titles = [grant.title for grant in kept._apply_filters(streams, None, organization, limit=5)]
+        assert sorted(titles) == ["CFEP Large", "CFEP Small"]
+
+
+def test_clusters_round_trip_through_snapshot(tmp_path: Path) -> None:
+    write_snapshot(_grants(), tmp_path, "v1")
+
+    catalog, _ = open_snapshot(tmp_path)
+
+    assert np.asarray(catalog.clusters).tolist() == [0, 1, 0, 3, 4]
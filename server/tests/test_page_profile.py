@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+from app.core.config import Settings
+from app.services.page_profile import NavigationStats, PageProfile, PageTraffic
+
+
+def test_profile_blocks_heavy_resources_and_trackers_by_url() -> None:
+    profile = PageProfile.from_settings(Settings())
+
+    assert profile.wait_until == "domcontentloaded"
+    patterns = profile.blocked_url_patterns()
+    assert {"*://googletagmanager.com/*", "*://*.googletagmanager.com/*", "*.jpg", "*.jpg?*", "*.woff2"} <= set(
+        patterns
+    )
+    assert "*.css" not in patterns and "*.js" not in patterns
+
+    disabled = PageProfile.from_settings(Settings(pdf_link_block_requests=False, pdf_link_wait_until="load"))
+    assert not disabled.blocks_requests and disabled.wait_until == "load"
+    assert disabled.blocked_url_patterns() == []
+
+
+def test_resource_types_without_a_url_signature_are_ignored(caplog: pytest.LogCaptureFixture) -> None:
+    settings = Settings(pdf_link_blocked_resource_types=["image", "xhr"], pdf_link_blocked_hosts=[])
+    profile = PageProfile.from_settings(settings)
+
+    assert profile.blocked_resource_types == frozenset({"image"})
+    assert "xhr" in caplog.text
+
+
+class _Request:
+    def __init__(self, failure: Optional[str]) -> None:
+        self.failure = failure
+
+
+class _Response:
+    def __init__(self, headers: Dict[str, str]) -> None:
+        self.headers = headers
+
+
+class _CdpSession:
+    def __init__(self) -> None:
+        self.sent: List[tuple[str, Any]] = []
+
+    async def send(self, method: str, params: Any = None) -> None:
+        self.sent.append((method, params))
+
+
+class _Context:
+    def __init__(self) -> None:
+        self.session = _CdpSession()
+
+    async def new_cdp_session(self, page: Any) -> _CdpSession:
+        return self.session
+
+
+class _Page:
+    def __init__(self) -> None:
+        self.context = _Context()
+        self.listeners: Dict[str, Callable[[Any], None]] = {}
+
+    def on(self, event: str, listener: Callable[[Any], None]) -> None:
+        self.listeners[event] = listener
+
+    async def route(self, pattern: str, handler: Any) -> None:
+        raise AssertionError("routing would disable the browser cache")
+
+
+@pytest.mark.asyncio
+async def test_traffic_blocks_through_cdp_and_sums_content_lengths() -> None:
+    page = _Page()
+    profile = PageProfile.from_settings(Settings())
+    traffic = PageTraffic(profile)
+    await traffic.attach(page)  # type: ignore[arg-type]
+
+    assert page.context.session.sent == [
+        ("Network.enable", None),
+        ("Network.setBlockedURLs", {"urls": profile.blocked_url_patterns()}),
+    ]
+    page.listeners["requestfailed"](_Request("net::ERR_BLOCKED_BY_CLIENT"))
+    page.listeners["requestfailed"](_Request("net::ERR_CONNECTION_RESET"))
+    page.listeners["response"](_Response({"content-length": "5000"}))
+    page.listeners["response"](_Response({"transfer-encoding": "chunked"}))
+    assert (traffic.requests_blocked, traffic.bytes_transferred) == (1, 5_000)
+
+    unblocked = _Page()
+    unprofiled = PageTraffic(PageProfile.from_settings(Settings(pdf_link_block_requests=False)))
+    await unprofiled.attach(unblocked)  # type: ignore[arg-type]
+    assert unblocked.context.session.sent == [] and "requestfailed" not in unblocked.listeners
+
+
+def test_navigation_stats_average_time_to_locator_over_located_lookups() -> None:
+    stats = NavigationStats()
+    assert stats.snapshot()["time_to_locator_ms_avg"] is None
+
+    stats.record(10_000, 4, 0.25)
+    stats.record(30_000, 0, None)
+    stats.record(20_000, 2, 0.75)
+
+    assert stats.snapshot() == {
+        "lookups": 3,
+        "bytes_transferred_total": 60_000,
+        "bytes_per_lookup": 20_000,
+        "requests_blocked_total": 6,
+        "time_to_locator_ms_avg": 500.0,
+    }
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from app.services import pdf_link_service
+from app.services.caching.pdf_link_store import PdfLinkStore
+from app.services.pdf_link_service import StaticPathStats, resolve_pdf_link
+
+CFEP_URL = "https://www.alberta.ca/community-facility-enhancement-program-small"
+RENDERED_URL = "https://www.alberta.ca/rendered-program"
+PLAIN_URL = "https://grants.example.org/program"
+
+
+class _Site:
+    """Grant pages that honour conditional requests like a real server would."""
+
+    def __init__(self) -> None:
+        self.pages: Dict[str, Dict[str, Any]] = {
+            CFEP_URL: {"body": '<a href="/files/cfep-v1.pdf">CFEP Small Sample Application</a>', "etag": '"v1"'},
+            RENDERED_URL: {"body": "<div id='app'></div>", "last_modified": "Wed, 01 Oct 2025 00:00:00 GMT"},
+            PLAIN_URL: {"body": "<script>render()</script>"},
+        }
+        self.requests: List[httpx.Request] = []
+        self.down = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.down:
+            raise httpx.ConnectError("down", request=request)
+        page = self.pages[str(request.url.copy_with(query=None))]
+        if page.get("etag") and request.headers.get("if-none-match") == page["etag"]:
+            return httpx.Response(304)
+        if page.get("last_modified") and request.headers.get("if-modified-since") == page["last_modified"]:
+            return httpx.Response(304)
+        headers = {"content-type": "text/html"}
+        if page.get("etag"):
+            headers["etag"] = page["etag"]
+        if page.get("last_modified"):
+            headers["last-modified"] = page["last_modified"]
+        return httpx.Response(200, text=page["body"], headers=headers)
+
+
+class _Clients:
+    def __init__(self, handler: Any) -> None:
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        return self.client
+
+
+@pytest.fixture
+def site(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> _Site:
+    site = _Site()
+    store = PdfLinkStore(tmp_path / "pdf_links.sqlite3")
+    clients = _Clients(site)
+    monkeypatch.setattr(pdf_link_service, "get_http_clients", lambda: clients)
+    monkeypatch.setattr(pdf_link_service, "get_pdf_link_store", lambda path: store)
+    monkeypatch.setattr(pdf_link_service, "static_path_stats", StaticPathStats())
+    monkeypatch.setattr(pdf_link_service.settings, "pdf_link_cache_path", str(tmp_path / "pdf_links.sqlite3"))
+    return site
+
+
+@pytest.fixture
+def browser(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    calls: List[str] = []
+
+    async def _browser(grant_url: str, live_view: bool = False) -> Dict[str, Optional[str]]:
+        calls.append(grant_url)
+        return {
+            "session_id": f"session-{len(calls)}",
+            "live_view_url": "https://browserbase.com/sessions/x",
+            "pdf_link": f"{grant_url}/form-{len(calls)}.pdf",
+        }
+
+    monkeypatch.setattr(pdf_link_service, "get_pdf_link_from_grant_page", _browser)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_cached_link_is_revalidated_and_replaced_only_when_the_page_changes(
+    site: _Site, browser: List[str]
+) -> None:
+    first = await resolve_pdf_link(CFEP_URL)
+    second = await resolve_pdf_link(CFEP_URL)
+
+    assert first["pdf_link"] == second["pdf_link"] == "https://www.alberta.ca/files/cfep-v1.pdf"
+    assert site.requests[-1].headers["if-none-match"] == '"v1"'
+    # Tracking parameters do not defeat the cache.
+    assert (await resolve_pdf_link(CFEP_URL + "?utm_source=mail"))["pdf_link"] == first["pdf_link"]
+
+    site.pages[CFEP_URL] = {"body": '<a href="/files/cfep-v2.pdf">CFEP Small Sample Application</a>', "etag": '"v2"'}
+    assert (await resolve_pdf_link(CFEP_URL))["pdf_link"] == "https://www.alberta.ca/files/cfep-v2.pdf"
+    assert (await resolve_pdf_link(CFEP_URL))["pdf_link"] == "https://www.alberta.ca/files/cfep-v2.pdf"
+    assert browser == []
+    assert pdf_link_service.static_path_stats.snapshot()["alberta.ca"]["cached"] == 3
+
+
+@pytest.mark.asyncio
+async def test_browser_results_are_reused_until_the_page_changes(site: _Site, browser: List[str]) -> None:
+    first = await resolve_pdf_link(RENDERED_URL)
+    repeat = await resolve_pdf_link(RENDERED_URL)
+
+    assert first["session_id"] == "session-1"
+    assert repeat == {"session_id": None, "live_view_url": None, "pdf_link": first["pdf_link"]}
+    assert site.requests[-1].headers["if-modified-since"] == "Wed, 01 Oct 2025 00:00:00 GMT"
+
+    site.pages[RENDERED_URL] = {
+        "body": "<div id='app' data-v='2'></div>",
+        "last_modified": "Thu, 02 Oct 2025 00:00:00 GMT",
+    }
+    assert (await resolve_pdf_link(RENDERED_URL))["session_id"] == "session-2"
+    assert browser == [RENDERED_URL, RENDERED_URL]
+
+
+@pytest.mark.asyncio
+async def test_pages_without_validators_compare_bodies(site: _Site, browser: List[str]) -> None:
+    first = await resolve_pdf_link(PLAIN_URL)
+    assert (await resolve_pdf_link(PLAIN_URL))["pdf_link"] == first["pdf_link"]
+    assert "if-none-match" not in site.requests[-1].headers
+
+    # An unreachable page keeps serving the last resolved link.
+    site.down = True
+    assert (await resolve_pdf_link(PLAIN_URL))["pdf_link"] == first["pdf_link"]
+
+    site.down = False
+    site.pages[PLAIN_URL]["body"] = "<script>renderAgain()</script>"
+    await resolve_pdf_link(PLAIN_URL)
+    assert len(browser) == 2
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from app.services import pdf_link_service
+from app.services.parsing.pdf_links import extract_anchors, find_pdf_link
+from app.services.pdf_link_service import StaticPathStats, resolve_pdf_link
+
+PAGE_URL = "https://www.alberta.ca/community-facility-enhancement-program-small"
+CFEP_PAGE = """
+<html><body>
+  <a href="/grants">All grants</a>
+  <a href="/media/annual-report.pdf">Annual report</a>
+  <div class="accordion"><h3>Step 4: Apply</h3>
+    <a href="/system/files/cfep-small-sample-application.pdf">CFEP Small Sample Application &ndash; PDF</a>
+  </div>
+</body></html>
+"""
+
+
+def test_named_link_wins_over_earlier_pdf_anchors() -> None:
+    assert find_pdf_link(CFEP_PAGE, PAGE_URL) == "https://www.alberta.ca/system/files/cfep-small-sample-application.pdf"
+
+
+def test_fallbacks_mirror_the_browser_lookup() -> None:
+    # No named link: the first .pdf anchor.
+    assert find_pdf_link('<a href="guide.pdf">Guide</a>', PAGE_URL) == "https://www.alberta.ca/guide.pdf"
+    # Named link to a landing page: a PDF href hinting at the sample form.
+    html = '<a aria-label="CFEP small sample application" href="/form">Open</a><a href="docs/Sample-Form.PDF">x</a>'
+    assert find_pdf_link(html, PAGE_URL) == "https://www.alberta.ca/docs/Sample-Form.PDF"
+    # Script-rendered pages leave nothing for the static pass.
+    assert find_pdf_link("<div id='app'></div><script src='app.js'></script>", PAGE_URL) is None
+    assert [anchor.name for anchor in extract_anchors('<a href="x"><img alt="Sample"> form</a>')] == ["Sample form"]
+
+
+class _Clients:
+    def __init__(self, handler: Any) -> None:
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        return self.client
+
+
+@pytest.mark.asyncio
+async def test_browser_only_runs_when_static_pass_misses(monkeypatch: pytest.MonkeyPatch) -> None:
+    pages = {
+        PAGE_URL: httpx.Response(200, text=CFEP_PAGE, headers={"content-type": "text/html; charset=utf-8"}),
+        "https://www.alberta.ca/rendered": httpx.Response(
+            200, text="<div id='app'></div>", headers={"content-type": "text/html"}
+        ),
+        "https://grants.example.org/down": httpx.Response(503),
+    }
+    browser_calls: List[str] = []
+
+    async def _browser(grant_url: str, live_view: bool = False) -> Dict[str, Optional[str]]:
+        browser_calls.append(grant_url)
+        return {
+            "session_id": "s1",
+            "live_view_url": "https://browserbase.com/sessions/s1",
+            "pdf_link": "https://x/a.pdf",
+        }
+
+    stats = StaticPathStats()
+    monkeypatch.setattr(pdf_link_service, "get_http_clients", lambda: _Clients(lambda request: pages[str(request.url)]))
+    monkeypatch.setattr(pdf_link_service, "get_pdf_link_from_grant_page", _browser)
+    monkeypatch.setattr(pdf_link_service, "static_path_stats", stats)
+    monkeypatch.setattr(pdf_link_service.settings, "pdf_link_cache_path", None)
+
+    static = await resolve_pdf_link(PAGE_URL)
+    assert static == {
+        "session_id": None,
+        "live_view_url": None,
+        "pdf_link": "https://www.alberta.ca/system/files/cfep-small-sample-application.pdf",
+    }
+    assert browser_calls == []
+
+    assert (await resolve_pdf_link("https://www.alberta.ca/rendered"))["session_id"] == "s1"
+    assert (await resolve_pdf_link("https://grants.example.org/down"))["session_id"] == "s1"
+    assert browser_calls == ["https://www.alberta.ca/rendered", "https://grants.example.org/down"]
+    assert stats.snapshot() == {
+        "alberta.ca": {"hits": 1, "misses": 1, "errors": 0, "cached": 0, "hit_rate": 0.5},
+        "grants.example.org": {"hits": 0, "misses": 0, "errors": 1, "cached": 0, "hit_rate": 0.0},
+    }
+
+
+@pytest.mark.asyncio
+async def test_live_view_reuses_a_static_link_and_only_navigates(monkeypatch: pytest.MonkeyPatch) -> None:
+    opened: List[tuple[str, str]] = []
+
+    async def _open_live_view(grant_url: str, pdf_link: str) -> Dict[str, Optional[str]]:
+        opened.append((grant_url, pdf_link))
+        return {"session_id": "own", "live_view_url": "https://browserbase.com/sessions/own", "pdf_link": pdf_link}
+
+    async def _browser(grant_url: str, live_view: bool = False) -> Dict[str, Optional[str]]:
+        raise AssertionError("the static link should have been used")
+
+    page = httpx.Response(200, text=CFEP_PAGE, headers={"content-type": "text/html"})
+    monkeypatch.setattr(pdf_link_service, "get_http_clients", lambda: _Clients(lambda request: page))
+    monkeypatch.setattr(pdf_link_service, "get_pdf_link_from_grant_page", _browser)
+    monkeypatch.setattr(pdf_link_service, "open_live_view", _open_live_view)
+    monkeypatch.setattr(pdf_link_service, "static_path_stats", StaticPathStats())
+    monkeypatch.setattr(pdf_link_service.settings, "pdf_link_cache_path", None)
+
+    result = await resolve_pdf_link(PAGE_URL, live_view=True)
+
+    assert result["session_id"] == "own"
+    assert opened == [(PAGE_URL, "https://www.alberta.ca/system/files/cfep-small-sample-application.pdf")]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from app.core.config import Settings
+from app.services.caching.response_store import ResponseStore
+from app.services.perplexity_client import PerplexityClient, _refresh_tasks
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _client(store: ResponseStore, calls: list[Dict[str, Any]]) -> PerplexityClient:
+    client = PerplexityClient(Settings(mode="live", perplexity_api_key="test-key"), store=store)
+
+    async def _fake_post(payload: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(payload)
+        return {"results": [{"url": "https://www.alberta.ca/cfep", "call": len(calls)}]}
+
+    client._post_search = _fake_post  # type: ignore[method-assign]
+    return client
+
+
+def test_store_survives_reopening(tmp_path: Path) -> None:
+    path = tmp_path / "responses.sqlite3"
+    key = ResponseStore.key_for({"query": ["a"], "max_results": 5})
+    ResponseStore(path, fresh_seconds=60, stale_seconds=120).put(key, {"results": []})
+
+    cached = ResponseStore(path, fresh_seconds=60, stale_seconds=120).get(key)
+
+    assert cached is not None and cached.fresh and cached.body == {"results": []}
+
+
+def test_key_depends_on_every_payload_field() -> None:
+    base = {"query": ["a", "b"], "max_results": 5, "search_domain_filter": ["alberta.ca"], "max_tokens_per_page": 2048}
+
+    assert ResponseStore.key_for(base) == ResponseStore.key_for(dict(reversed(list(base.items()))))
+    for field, value in (("query", ["b", "a"]), ("max_results", 6), ("search_domain_filter", ["gov.bc.ca"]), ("max_tokens_per_page", 1024)):
+        assert ResponseStore.key_for({**base, field: value}) != ResponseStore.key_for(base)
+
+
+@pytest.mark.asyncio
+async def test_search_serves_stale_entries_while_revalidating(tmp_path: Path) -> None:
+    clock = _FakeClock()
+    store = ResponseStore(tmp_path / "responses.sqlite3", fresh_seconds=60, stale_seconds=600, clock=clock)
+    calls: list[Dict[str, Any]] = []
+    client = _client(store, calls)
+
+    first = await client.search(query=["cfep"], max_results=5)
+    cached = await client.search(query=["cfep"], max_results=5)
+    assert first == cached and len(calls) == 1
+
+    clock.now += 120
+    stale = await client.search(query=["cfep"], max_results=5)
+    assert stale == first
+    for task in list(_refresh_tasks):
+        await task
+    assert len(calls) == 2
+
+    refreshed = await client.search(query=["cfep"], max_results=5)
+    assert refreshed["results"][0]["call"] == 2
+
+    clock.now += 10_000
+    await client.search(query=["cfep"], max_results=5)
+    assert len(calls) == 3
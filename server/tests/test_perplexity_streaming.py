@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.services import perplexity_client
+from app.services.caching.response_store import ResponseStore
+from app.services.parsing.grants_parser import parse_grants_from_results, parse_grants_from_search
+from app.services.parsing.json_stream import iter_json_array_items
+from app.services.perplexity_client import PerplexityClient
+
+BODY: Dict[str, Any] = {
+    "id": "search-1",
+    "meta": {"note": "results", "nested": [1, {"results": []}]},
+    "results": [
+        {"url": "https://www.alberta.ca/cfep", "title": "CFEP", "snippet": "Apply now", "text": "é" * 5_000},
+        {"url": "https://www.canada.ca/horizons", "title": "New Horizons", "text": "Seniors ☃", "date": "2025-01-01"},
+        {"url": "https://example.com/other", "title": "Other", "score": 0.25},
+    ],
+    "usage": 12345,
+}
+
+
+async def _chunks(payload: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(payload), size):
+        yield payload[start : start + size]
+
+
+@pytest.mark.asyncio
+async def test_array_items_decode_across_any_chunk_boundary() -> None:
+    payload = json.dumps(BODY, ensure_ascii=False).encode("utf-8")
+
+    for size in (1, 3, 17, 1024, len(payload)):
+        items = [item async for item in iter_json_array_items(_chunks(payload, size), "results")]
+        assert items == BODY["results"]
+
+    with pytest.raises(ValueError):
+        [item async for item in iter_json_array_items(_chunks(b'{"id": 1}', 4), "results")]
+
+
+class _Clients:
+    def __init__(self, handler: Any) -> None:
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        return self.client
+
+
+@pytest.mark.asyncio
+async def test_iter_results_streams_trimmed_results_and_caches_them(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=json.dumps(BODY).encode("utf-8"))
+
+    monkeypatch.setattr(perplexity_client, "get_http_clients", lambda: _Clients(handler))
+    store = ResponseStore(tmp_path / "responses.sqlite3", fresh_seconds=60, stale_seconds=120)
+    client = PerplexityClient(Settings(mode="live", perplexity_api_key="key"), store=store)
+
+    streamed = [item async for item in client.iter_results(query=["cfep"], max_results=5)]
+    cached = [item async for item in client.iter_results(query=["cfep"], max_results=5)]
+
+    assert len(requests) == 1
+    assert streamed == cached == [
+        {"url": "https://www.alberta.ca/cfep", "title": "CFEP", "snippet": "Apply now"},
+        {"url": "https://www.canada.ca/horizons", "title": "New Horizons", "text": "Seniors ☃"},
+        {"url": "https://example.com/other", "title": "Other"},
+    ]
+
+    async def replay() -> AsyncIterator[Dict[str, Any]]:
+        for item in streamed:
+            yield item
+
+    assert await parse_grants_from_results(replay()) == parse_grants_from_search(BODY)
+
+
+@pytest.mark.asyncio
+async def test_iter_results_reports_error_bodies(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        perplexity_client,
+        "get_http_clients",
+        lambda: _Clients(lambda request: httpx.Response(429, text="slow down")),
+    )
+    client = PerplexityClient(Settings(mode="live", perplexity_api_key="key", perplexity_cache_path=None))
+
+    with pytest.raises(httpx.HTTPStatusError) as raised:
+        [item async for item in client.iter_results(query="cfep", max_results=5)]
+
+    assert raised.value.response.text == "slow down"
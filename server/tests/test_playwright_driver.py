@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+from app.services import browserbase_service
+from app.services.browserbase_service import BrowserbaseSession
+from app.services.playwright_driver import PlaywrightDriver
+
+
+class _FakeBrowser:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.connected = True
+        self._handlers: Dict[str, List[Callable[[Any], None]]] = {}
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def on(self, event: str, handler: Callable[[Any], None]) -> None:
+        self._handlers.setdefault(event, []).append(handler)
+
+    async def close(self) -> None:
+        self.drop()
+
+    def drop(self) -> None:
+        self.connected = False
+        for handler in self._handlers.get("disconnected", []):
+            handler(self)
+
+
+class _FakeChromium:
+    def __init__(self) -> None:
+        self.connects: List[str] = []
+
+    async def connect_over_cdp(self, url: str) -> _FakeBrowser:
+        self.connects.append(url)
+        await asyncio.sleep(0.01)
+        return _FakeBrowser(url)
+
+
+class _FakePlaywright:
+    def __init__(self) -> None:
+        self.chromium = _FakeChromium()
+        self.stopped = False
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.mark.asyncio
+async def test_driver_and_connections_outlive_requests() -> None:
+    started: List[_FakePlaywright] = []
+
+    async def start() -> _FakePlaywright:
+        started.append(_FakePlaywright())
+        return started[-1]
+
+    driver = PlaywrightDriver(start)  # type: ignore[arg-type]
+    first, second = await asyncio.gather(driver.connect("s1", "wss://s1"), driver.connect("s1", "wss://s1"))
+    assert first is second
+    assert await driver.connect("s1", "wss://s1") is first
+    other = await driver.connect("s2", "wss://s2")
+    assert other is not first
+    assert len(started) == 1 and started[0].chromium.connects == ["wss://s1", "wss://s2"]
+
+    # A dropped connection is re-established on next use; the driver itself is kept.
+    first.drop()
+    assert driver.connected == 1
+    reconnected = await driver.connect("s1", "wss://s1")
+    assert reconnected is not first and len(started) == 1
+
+    await driver.disconnect("s2")
+    assert not other.is_connected() and driver.connected == 1
+
+    await driver.aclose()
+    assert started[0].stopped and not reconnected.is_connected() and driver.connected == 0
+
+
+class _FakePage:
+    def __init__(self, context: "_FakeContext") -> None:
+        self.context = context
+
+    def on(self, event: str, handler: Callable[[Any], None]) -> None:
+        pass
+
+    async def goto(self, url: str, wait_until: str) -> None:
+        pass
+
+    async def evaluate(self, script: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.context.pages.remove(self)
+
+
+class _FakeContext:
+    def __init__(self) -> None:
+        self.pages: List[_FakePage] = []
+        self.pages.append(_FakePage(self))
+
+    async def new_page(self) -> _FakePage:
+        self.pages.append(_FakePage(self))
+        return self.pages[-1]
+
+    async def new_cdp_session(self, page: _FakePage) -> Any:
+        class _Session:
+            async def send(self, method: str, params: Any = None) -> None:
+                pass
+
+        return _Session()
+
+
+@pytest.mark.asyncio
+async def test_lookup_closes_only_the_tabs_it_opened(monkeypatch: pytest.MonkeyPatch) -> None:
+    context = _FakeContext()
+    blank_tab = context.pages[0]
+    browser = type("Browser", (), {"contexts": [context]})()
+
+    class _Driver:
+        async def connect(self, key: str, connect_url: str) -> Any:
+            return browser
+
+    async def noop(*_: Any) -> None:
+        return None
+
+    async def derive(page: _FakePage, grant_url: str, locator: Any) -> str:
+        return f"{grant_url}/form.pdf"
+
+    async def click(context: _FakeContext, page: _FakePage, locator: Any, fallback: str) -> str:
+        await context.new_page()  # the PDF opens in its own tab
+        return fallback
+
+    monkeypatch.setattr(browserbase_service, "get_playwright_driver", _Driver)
+    monkeypatch.setattr(browserbase_service, "_wait_for_pdf_link", noop)
+    monkeypatch.setattr(browserbase_service, "_ensure_step_four_expanded", noop)
+    monkeypatch.setattr(browserbase_service, "_locate_pdf_link", noop)
+    monkeypatch.setattr(browserbase_service, "_derive_pdf_url", derive)
+    monkeypatch.setattr(browserbase_service, "_click_and_capture_pdf_url", click)
+    session = BrowserbaseSession(id="s1", connect_url="wss://s1", live_view_url="https://live/s1")
+
+    pdf_link = await browserbase_service._find_pdf_link(session, "https://www.alberta.ca/cfep")
+
+    assert pdf_link == "https://www.alberta.ca/cfep/form.pdf"
+    assert context.pages == [blank_tab]
+
+    # A Live View session is the user's own: the lookup runs in its first tab and leaves every tab open.
+    await browserbase_service._find_pdf_link(session, "https://www.alberta.ca/cfep", keep_pages=True)
+    assert len(context.pages) == 2 and context.pages[0] is blank_tab
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+from app.models.schemas import Grant
+from app.services.catalog.index import GrantCatalog
+
+WORDS = (
+    "youth", "sport", "arts", "seniors", "community", "health", "housing", "indigenous",
+    "capacity", "building", "social", "finance", "environment", "education", "food", "rural",
+)
+
+
+def _reference_score(grant: Grant, sector_tags: list[str]) -> int:
+    """The original nested-loop scorer from GrantFinderService."""
+    sector_tags_lower = [tag.lower() for tag in sector_tags]
+    score = 0
+    if grant.tags:
+        grant_tags_lower = [tag.lower() for tag in grant.tags]
+        for sector_tag in sector_tags_lower:
+            for grant_tag in grant_tags_lower:
+                if sector_tag in grant_tag or grant_tag in sector_tag:
+                    score += 3
+    if grant.title:
+        for sector_tag in sector_tags_lower:
+            if sector_tag in grant.title.lower():
+                score += 2
+    if grant.summary:
+        for sector_tag in sector_tags_lower:
+            if sector_tag in grant.summary.lower():
+                score += 1
+    if grant.program:
+        for sector_tag in sector_tags_lower:
+            if sector_tag in grant.program.lower():
+                score += 2
+    return score
+
+
+def _synthetic_grants(count: int, seed: int = 7) -> list[Grant]:
+    rng = random.Random(seed)
+    vocabulary = list(WORDS) + ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=7)) for _ in range(2_000)]
+
+    def text(words: int) -> str:
+        return " ".join(rng.choice(vocabulary).capitalize() if rng.random() < 0.2 else rng.choice(vocabulary) for _ in range(words))
+
+    grants: list[Grant] = []
+    for index in range(count):
+        data: dict[str, Any] = {
+            "title": text(5),
+            "link": f"https://example.ca/grant-{index}",
+            "summary": text(30) if rng.random() < 0.9 else None,
+            "program": text(3) if rng.random() < 0.7 else "",
+            "tags": rng.sample(WORDS, k=rng.randint(0, 3)) + (["Youth"] if rng.random() < 0.05 else []),
+        }
+        grants.append(Grant.model_construct(**data))
+    return grants
+
+
+def test_scores_match_reference_scorer() -> None:
+    grants = _synthetic_grants(2_000)
+    grants.append(Grant.model_construct(title="Social Finance Fund", link="https://example.ca/sf", summary="social\tfinance", tags=["social finance"]))
+    catalog = GrantCatalog(grants)
+    queries = [
+        ["youth"],
+        ["Youth", "SPORT", "youth"],
+        ["social finance", "capacity building"],
+        ["ou", "a"],
+        [""],
+        [" "],
+        ["community organizations"],
+        ["zzzz"],
+    ]
+
+    for sector_tags in queries:
+        scores = catalog.scorer.score(sector_tags)
+        expected = [_reference_score(grant, sector_tags) for grant in grants]
+        assert scores.tolist() == expected, sector_tags
+
+
+def test_sort_matches_reference_ordering() -> None:
+    grants = _synthetic_grants(500, seed=11)
+    catalog = GrantCatalog(grants)
+    sector_tags = ["youth", "arts"]
+
+    ordered = catalog.sort_by_relevance(range(len(grants)), sector_tags)
+
+    expected = sorted(range(len(grants)), key=lambda grant_id: _reference_score(grants[grant_id], sector_tags), reverse=True)
+    assert ordered == expected
+
+
+def test_vectorized_scoring_is_ten_times_faster_on_large_catalog() -> None:
+    grants = _synthetic_grants(100_000)
+    catalog = GrantCatalog(grants)
+    sector_tags = ["youth", "arts", "health"]
+
+    started = time.perf_counter()
+    for grant in grants:
+        _reference_score(grant, sector_tags)
+    reference_seconds = time.perf_counter() - started
+
+    vectorized_seconds = min(_timed(lambda: catalog.scorer.score(sector_tags)) for _ in range(3))
+
+    assert reference_seconds / vectorized_seconds >= 10
+
+
+def _timed(func: Any) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def test_top_k_matches_sorted_prefix() -> None:
+    grants = _synthetic_grants(3_000, seed=5)
+    catalog = GrantCatalog(grants)
+    candidate_ids = list(range(0, len(grants), 3))
+
+    for sector_tags in (["youth"], ["zzzz"], ["arts", "housing", "food"]):
+        full = catalog.sort_by_relevance(candidate_ids, sector_tags)
+        for limit in (1, 10, 50, len(candidate_ids) + 5):
+            assert catalog.sort_by_relevance(candidate_ids, sector_tags, limit=limit) == full[:limit]
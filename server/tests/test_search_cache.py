@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.config import Settings
+from app.models.schemas import Address, Grant, GrantFilters, OrganizationInfo
+from app.services.caching.ttl_cache import TTLCache
+from app.services.grant_finder_service import (
+    GrantFinderService,
+    _search_cache_key,
+    _seconds_until_earliest_deadline,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_and_least_recent_is_evicted() -> None:
+    clock = _FakeClock()
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl_seconds=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=5)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used entry
+
+    assert cache.get("b") is None
+    clock.now = 11
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_key_normalizes_profile_and_filters() -> None:
+    first = OrganizationInfo(
+        legal_name="Youth Sport Society",
+        sector_tags=["Youth", "sport"],
+        address=Address(province="Alberta"),
+    )
+    second = OrganizationInfo(
+        legal_name="Another Name",
+        sector_tags=["sport", "youth"],
+        address=Address(province="AB"),
+    )
+
+    assert _search_cache_key("mock", first, None) == _search_cache_key("mock", second, GrantFilters())
+    assert _search_cache_key("mock", first, None) != _search_cache_key("live", first, None)
+    assert _search_cache_key("mock", first, None) != _search_cache_key("mock", first, GrantFilters(max_results=5))
+    assert _search_cache_key("mock", first, None) != _search_cache_key("mock", first, None, distinct=False)
+
+
+def test_ttl_is_capped_by_earliest_deadline() -> None:
+    soon = Grant.model_construct(title="Soon", link="https://example.ca", deadline=date.today() + timedelta(days=1))
+    later = Grant.model_construct(title="Later", link="https://example.ca", deadline=date.today() + timedelta(days=30))
+
+    remaining = _seconds_until_earliest_deadline([later, soon])
+
+    assert remaining is not None and 0 < remaining <= 86_400
+    assert _seconds_until_earliest_deadline([Grant.model_construct(title="Open", link="https://example.ca")]) is None
+
+
+def test_past_deadlines_do_not_keep_results_out_of_the_cache() -> None:
+    past = Grant.model_construct(title="Closed", link="https://example.ca", deadline=date.today() - timedelta(days=3))
+    later = Grant.model_construct(title="Later", link="https://example.ca", deadline=date.today() + timedelta(days=30))
+
+    remaining = _seconds_until_earliest_deadline([past, later])
+    assert remaining is not None and 29 * 86_400 < remaining <= 30 * 86_400
+    # Only past deadlines: the default TTL applies.
+    assert _seconds_until_earliest_deadline([past]) is None
+
+    cache: TTLCache[str, list[Grant]] = TTLCache(max_entries=8, ttl_seconds=60)
+    cache.set("key", [past], ttl_seconds=_seconds_until_earliest_deadline([past]))
+    assert cache.get("key") == [past]
+
+
+@pytest.mark.asyncio
+async def test_find_grants_reports_hit_and_miss() -> None:
+    service = GrantFinderService(Settings(mode="mock"), cache=TTLCache(max_entries=8, ttl_seconds=60))
+    organization = OrganizationInfo(legal_name="Seniors Society", sector_tags=["seniors"])
+
+    first = await service.find_grants(organization)
+    assert service.last_cache_status == "miss"
+
+    second = await service.find_grants(organization)
+    assert service.last_cache_status == "hit"
+    assert second == first
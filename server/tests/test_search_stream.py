@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from app.core.config import Settings
+from app.models.schemas import OrganizationInfo
+from app.services import grant_finder_service
+from app.services.caching.ttl_cache import TTLCache
+from app.services.grant_finder_service import GrantFinderService
+
+
+class _StaggeredClient:
+    """Answers each batch after a delay so batches complete one at a time."""
+
+    def __init__(self, _settings: Settings) -> None:
+        pass
+
+    async def iter_results(self, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        for item in (await self.search(**kwargs))["results"]:
+            yield item
+
+    async def search(self, *, query: List[str], **_: Any) -> Dict[str, Any]:
+        await asyncio.sleep(0.01 * len(query))
+        return {
+            "results": [
+                {
+                    "url": f"https://www.alberta.ca/grant-{index}-{len(query)}",
+                    "title": f"Community Grant {index}-{len(query)}",
+                    "snippet": "Apply now for community grant funding for non-profit organizations in Alberta.",
+                }
+                for index in range(2)
+            ]
+        }
+
+
+@pytest.mark.asyncio
+async def test_mock_stream_yields_single_final_frame() -> None:
+    service = GrantFinderService(Settings(mode="mock"), cache=TTLCache(max_entries=8, ttl_seconds=60))
+    organization = OrganizationInfo(legal_name="Seniors Society", sector_tags=["seniors"])
+
+    frames = [frame async for frame in service.stream_grants(organization)]
+
+    assert [frame.type for frame in frames] == ["final"]
+    assert frames[0].results == await service.find_grants(organization)
+    assert service.last_cache_status == "hit"
+
+
+@pytest.mark.asyncio
+async def test_live_stream_emits_provisional_frames_then_final(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(grant_finder_service, "PerplexityClient", _StaggeredClient)
+    cache: TTLCache[str, Any] = TTLCache(max_entries=8, ttl_seconds=60)
+    service = GrantFinderService(Settings(mode="live", perplexity_api_key="key"), cache=cache)
+    organization = OrganizationInfo(legal_name="Community Society")
+
+    frames = [frame async for frame in service.stream_grants(organization)]
+
+    assert [frame.type for frame in frames] == ["provisional", "provisional", "final"]
+    assert frames[0].count <= frames[1].count
+    assert frames[-1].results == frames[-2].results
+    assert service.last_cache_status == "miss"
+
+    cached = [frame async for frame in service.stream_grants(organization)]
+    assert [frame.type for frame in cached] == ["final"]
+    assert cached[0].results == frames[-1].results
+
+
+class _ReversedClient(_StaggeredClient):
+    """Answers later batches first; every batch returns the same page under its own title."""
+
+    async def search(self, *, query: List[str], **_: Any) -> Dict[str, Any]:
+        first_seed = query[0]
+        await asyncio.sleep(0.02 if "facility" in first_seed else 0.0)
+        return {
+            "results": [
+                {
+                    "url": "https://www.alberta.ca/shared-grant",
+                    "title": f"Shared Community Grant via {first_seed}",
+                    "snippet": "Apply now for community grant funding for non-profit organizations in Alberta.",
+                }
+            ]
+        }
+
+
+@pytest.mark.asyncio
+async def test_live_stream_final_frame_merges_batches_in_query_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(grant_finder_service, "PerplexityClient", _ReversedClient)
+    settings = Settings(mode="live", perplexity_api_key="key")
+    organization = OrganizationInfo(legal_name="Community Society")
+
+    streamed = [
+        frame
+        async for frame in GrantFinderService(settings, cache=TTLCache(max_entries=8, ttl_seconds=60)).stream_grants(
+            organization
+        )
+    ]
+    found = await GrantFinderService(settings, cache=TTLCache(max_entries=8, ttl_seconds=60)).find_grants(organization)
+
+    # The slow first batch lands last, yet its copy of the shared page wins, as in find_grants.
+    assert streamed[0].type == "provisional" and "facility" not in streamed[0].results[0].title
+    assert streamed[-1].results == found
+    assert "facility" in found[0].title
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Iterable
+
+from app.services.parsing import grants_parser
+from app.services.parsing.grants_parser import (
+    ALBERTA_PROGRAM_KEYWORDS,
+    CANADA_TEXT_HINTS,
+    GRANT_KEYWORDS,
+    NEGATIVE_AUDIENCE_PHRASES,
+    NEGATIVE_STATUS_PHRASES,
+    POSITIVE_APPLICATION_HINTS,
+    POSITIVE_ORG_HINTS,
+    _text_features,
+)
+from app.services.parsing.phrases import PhraseSearchPlan
+
+PHRASES = [
+    *CANADA_TEXT_HINTS,
+    *NEGATIVE_STATUS_PHRASES,
+    *POSITIVE_APPLICATION_HINTS,
+    *NEGATIVE_AUDIENCE_PHRASES,
+    *POSITIVE_ORG_HINTS,
+    *GRANT_KEYWORDS,
+    *(keyword for keyword, _ in ALBERTA_PROGRAM_KEYWORDS),
+]
+FILLER = ("the", "Program", "helps", "Alberta", "groups", "and", "Families", "with", "support")
+
+
+def _contains_any(text: str, phrases: Iterable[str]) -> bool:
+    return any(phrase in text for phrase in phrases)
+
+
+def _random_item(rng: random.Random) -> Dict[str, Any]:
+    def field() -> str:
+        words = [rng.choice(FILLER) for _ in range(rng.randint(0, 12))]
+        for _ in range(rng.randint(0, 2)):
+            phrase = rng.choice(PHRASES)
+            words.insert(rng.randint(0, len(words)), phrase.upper() if rng.random() < 0.3 else phrase)
+        return " ".join(words)
+
+    return {"title": field(), "snippet": field(), "text": field(), "url": "https://example.org/page"}
+
+
+def test_features_match_phrase_scans_on_each_field_order() -> None:
+    rng = random.Random(13)
+    for _ in range(500):
+        item = _random_item(rng)
+        features = _text_features(item)
+        body = " ".join((item["snippet"], item["text"], item["title"])).lower()
+        snippet = item["snippet"].lower()
+
+        assert grants_parser._looks_active(item, features) == (
+            not _contains_any(body, NEGATIVE_STATUS_PHRASES) and _contains_any(body, POSITIVE_APPLICATION_HINTS)
+        )
+        assert grants_parser._is_org_focused(item, features) == (
+            not _contains_any(body, NEGATIVE_AUDIENCE_PHRASES) and _contains_any(body, POSITIVE_ORG_HINTS)
+        )
+        assert grants_parser._mentions_grant(item, features) == _contains_any(body, GRANT_KEYWORDS)
+        assert grants_parser._looks_canadian(item["url"], item, features) == _contains_any(body, CANADA_TEXT_HINTS)
+        expected_program = next(
+            (program for keyword, program in ALBERTA_PROGRAM_KEYWORDS if keyword in snippet), None
+        )
+        assert grants_parser._program_from_features(features) == expected_program
+
+
+def test_program_keywords_only_count_inside_the_snippet() -> None:
+    item = {"snippet": "Apply for the operating grant", "text": "cfep small", "title": "CFEP Large"}
+
+    assert grants_parser._infer_program_from_snippet(item["snippet"]) == "Community Initiatives Program (CIP) Operating"
+    assert grants_parser._program_from_features(_text_features(item)) == (
+        "Community Initiatives Program (CIP) Operating"
+    )
+
+
+def test_matcher_bounds_prefix_phrases_and_merges_bits() -> None:
+    matcher = PhraseSearchPlan({1: ("grant",), 2: ("micro-grant", "funding")}, prefix_phrases={4: ("grant",)})
+
+    assert matcher.match("micro-grant funding") == 7
+    assert matcher.match("a funding call") == 2
+    assert matcher.match("intro text. grant", prefix_length=5) == 1
+    assert matcher.match("grant later", prefix_length=5) == 5